@@ -3,8 +3,8 @@ BYVFX Tools - A collection of Houdini tools for VFX production
 """
 
 from . import tools
-from . import utils
 from . import config
+from . import utils
 
 __version__ = "0.1.0"
 
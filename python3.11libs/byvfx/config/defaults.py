@@ -0,0 +1,21 @@
+# byvfx/config/defaults.py
+"""
+Default settings shared by the byvfx tools.
+
+Each setting can be overridden per machine or per job with the environment
+variable named next to it, e.g. ``BYVFX_CAMDB_OFFLINE=1`` on farm nodes.
+"""
+
+# ─── CamDB ─────────────────────────────────────────────────────────
+CAMDB_BASE_URL = "https://camdb.matchmovemachine.com"   # BYVFX_CAMDB_URL
+CAMDB_CACHE_TTL = 24 * 60 * 60                          # BYVFX_CAMDB_CACHE_TTL (seconds)
+CAMDB_OFFLINE = False                                   # BYVFX_CAMDB_OFFLINE
+CAMDB_CACHE_DIR = None                                  # BYVFX_CAMDB_CACHE_DIR (None: user pref dir)
+CAMDB_SNAPSHOT_PATH = None                              # BYVFX_CAMDB_SNAPSHOT (shared studio snapshot)
+CAMDB_CONNECT_TIMEOUT = 3.05                            # BYVFX_CAMDB_CONNECT_TIMEOUT (seconds)
+CAMDB_READ_TIMEOUT = 30                                 # BYVFX_CAMDB_READ_TIMEOUT (seconds)
+CAMDB_RETRIES = 2                                       # BYVFX_CAMDB_RETRIES
+
+# ─── VEX Snippet Manager ───────────────────────────────────────────
+VEX_SNIPPETS_BACKEND = "sqlite"                         # BYVFX_VEX_SNIPPETS_BACKEND ("sqlite" or "json")
+VEX_SNIPPETS_PATH = None                                # BYVFX_VEX_SNIPPETS_PATH (roots, highest first; "&" is the default root)
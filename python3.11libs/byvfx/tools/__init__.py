@@ -16,4 +16,9 @@ try:
 except ImportError:
     pass
 
-__all__ = ['light_converter', 'cache_manager']
+try:
+    from . import hda_tracker
+except ImportError:
+    pass
+
+__all__ = ['light_converter', 'cache_manager', 'hda_tracker']
@@ -0,0 +1,29 @@
+# byvfx/tools/hda_tracker/__init__.py
+"""
+HDA tracker for auditing which digital assets are used by which scenes
+"""
+from .hip_reader import (
+    HdaUsage, HipFormatError, iter_hda_usages, iter_node_types,
+    gather_hd_assets_in_hip_file, read_hd_asset_rows, split_type_name
+)
+from .process_pool import FileResult, HythonPool, HythonWorkerError
+from .index import HdaIndex, IndexStats
+from .mmap_scanner import HDA_NAME_PATTERN, ScanResult, scan_file, scan_files
+from .dependency_graph import HdaDependencyGraph, build_graph, iter_library_definitions
+from .crawler import crawl_hip_files
+from .sinks import CsvSink, JsonlSink, RowSink, SqliteSink, open_sink
+from .benchmark import generate_corpus, run_benchmark
+from .watcher import HdaIndexDaemon, query_daemon
+
+__all__ = [
+    'HdaUsage', 'HipFormatError', 'iter_hda_usages', 'iter_node_types',
+    'gather_hd_assets_in_hip_file', 'read_hd_asset_rows', 'split_type_name',
+    'FileResult', 'HythonPool', 'HythonWorkerError',
+    'HdaIndex', 'IndexStats',
+    'HDA_NAME_PATTERN', 'ScanResult', 'scan_file', 'scan_files',
+    'HdaDependencyGraph', 'build_graph', 'iter_library_definitions',
+    'crawl_hip_files',
+    'CsvSink', 'JsonlSink', 'RowSink', 'SqliteSink', 'open_sink',
+    'generate_corpus', 'run_benchmark',
+    'HdaIndexDaemon', 'query_daemon'
+]
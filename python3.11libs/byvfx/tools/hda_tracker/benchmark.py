@@ -0,0 +1,361 @@
+"""
+Synthetic .hip corpus generator and benchmark harness for the HDA tracker.
+
+``generate_corpus`` writes cpio-format scene files with a configurable
+node count, HDA density, nesting depth and embedded binary payload, an
+asset library defining the HDA types, plus a ``manifest.json`` with the
+ground truth. ``run_benchmark`` runs each tracker mode over the corpus in
+its own child process and reports files/s, MB/s, peak RSS and whether the
+results agree with the manifest. Each mode calls the same code as the
+matching hdaTracker script, so a mode that disagrees points at that
+script; the HDA usages it missed or invented are counted. A mode that
+fails or dies is reported as failed.
+
+Scenes are laid out as Houdini saves them: a node's type is only in its
+``.init`` entry and the libraries it comes from in ``.OPlibraries``.
+Nothing is added to suit a particular mode.
+
+Runs headless on plain Linux; the ``hython`` mode is only included when a
+hython executable can be found.
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import random
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Set, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .hip_reader import CPIO_MAGIC, CPIO_TRAILER, LIBRARIES_ENTRY, gather_hd_assets_in_hip_file
+from .mmap_scanner import HDA_NAME_PATTERN, scan_files
+
+MANIFEST_FILE = "manifest.json"
+# Asset library the generated scenes list in their .OPlibraries entry
+LIBRARY_FILE = os.path.join("otls", "studio_tools.hda")
+
+BUILTIN_TYPES = ("null", "box", "attribwrangle", "merge", "xform", "subnet", "geo", "file")
+
+# Body of a node's .def entry, trimmed from a Houdini 20 scene
+NODE_DEF = (
+    "comment \"\"\n"
+    "position {x} {y}\n"
+    "connectornextid 0\n"
+    "flags =  lock off model off template off footprint off xray off bypass off display on render on "
+    "highlight off unload off savedata off compress on colordefault on exposed on\n"
+    "outputsNamed3\n{{\n}}\n"
+    "inputsNamed3\n{{\n}}\n"
+    "inputs\n{{\n}}\n"
+    "stat\n{{\n  create 1700000000\n  modify 1700000000\n  author artist@studio\n  access 0777\n}}\n"
+    "color UT_Color RGB 0.8 0.8 0.8 \n"
+    "delscript \"\"\n"
+    "exprlanguage hscript\n"
+    "end\n"
+)# Seconds between checks that a mode's child process is still alive
+POLL_SECONDS = 1.0
+
+# missed/extra: (hip, hda) pairs in the manifest but not found, and found
+# but not in the manifest; error: None, or why the mode produced no result
+BenchmarkResult = namedtuple(
+    "BenchmarkResult",
+    ["mode", "files", "seconds", "files_per_second", "mb_per_second", "peak_rss_mb", "agrees", "mismatched_files",
+     "missed", "extra", "error"],
+    defaults=(0, 0, None)
+)
+
+
+# ─── Corpus generation ─────────────────────────────────────────────
+
+
+def _cpio_entry(name: str, size: int) -> bytes:
+    name_bytes = name.encode("utf-8") + b"\0"
+    return (
+        CPIO_MAGIC
+        + b"%06o" % 0 * 6          # dev, ino, mode, uid, gid, nlink
+        + b"%06o" % 0              # rdev
+        + b"%011o" % int(time.time())
+        + b"%06o" % len(name_bytes)
+        + b"%011o" % size
+        + name_bytes
+    )
+
+
+def _write_entry(f, name: str, data: bytes) -> None:
+    f.write(_cpio_entry(name, len(data)))
+    f.write(data)
+
+
+def hda_type_name(k: int) -> str:
+    """Name of the ``k``-th generated HDA type."""
+    return f"studio::tool{k}::{k % 3 + 1}.0"
+
+
+def generate_library(path: str, hda_types: int = 50) -> None:
+    """
+    Write a stand-in asset library defining the generated HDA types.
+
+    Only the parts the tracker reads are written: one ``INDX`` section per
+    definition with its DialogScript header.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"INDX\n")
+        for k in range(hda_types):
+            f.write(b"INDX\n# Dialog script for %s automatically generated\n" % hda_type_name(k).encode())
+
+
+def generate_hip(path: str, node_count: int = 200, hda_density: float = 0.2, max_depth: int = 6,
+                 payload_bytes: int = 0, hda_types: int = 50, seed: int = 0,
+                 library_path: str = None) -> List[Tuple[str, int, str]]:
+    """
+    Write one synthetic scene file.
+
+    Args:
+        path (str): Output .hip path
+        node_count (int): Nodes below ``/obj``
+        hda_density (float): Fraction of nodes whose type is an HDA
+        max_depth (int): Deepest network level (``/obj`` is 1)
+        payload_bytes (int): Size of an embedded binary geometry entry
+        hda_types (int): Size of the pool of HDA type names to draw from
+        seed (int): Random seed
+        library_path (str): Library to list in the ``.OPlibraries`` entry
+
+    Returns:
+        List[Tuple[str, int, str]]: Ground truth ``(hda, depth, node_path)``
+    """
+    rng = random.Random(seed)
+    truth = []
+    networks = [("/obj", 1)]
+
+    with open(path, "wb") as f:
+        _write_entry(f, ".start", b"fstart 1\nfend 240\nfps 24\n")
+        if library_path:
+            _write_entry(f, LIBRARIES_ENTRY, f"OPlib {library_path}\n".encode())
+        _write_entry(f, "obj.init", b"type = obj\nmatchesdef = 0\n")
+
+        for i in range(node_count):
+            parent, parent_depth = rng.choice(networks)
+            node_path = f"{parent}/node{i}"
+            depth = parent_depth + 1
+            is_hda = rng.random() < hda_density
+            if is_hda:
+                type_name = hda_type_name(rng.randrange(hda_types))
+                truth.append((type_name, depth, node_path))
+            else:
+                type_name = rng.choice(BUILTIN_TYPES)
+
+            name = node_path[1:]
+            # matchesdef = 1: an asset instance using its library's definition
+            _write_entry(f, name + ".init", f"type = {type_name}\nmatchesdef = {int(is_hda)}\n".encode())
+            _write_entry(f, name + ".def", NODE_DEF.format(x=i, y=-i).encode())
+            _write_entry(f, name + ".parm", b"{\nversion 0.8\nfoo\t[ 0\tlocks=0 ]\t(\t1\t)\n}\n" * 4)
+            if depth < max_depth:
+                networks.append((node_path, depth))
+
+        if payload_bytes:
+            _write_entry_stream(f, "obj/node0/stash1.bgeo.sc", payload_bytes, rng)
+        _write_entry(f, CPIO_TRAILER, b"")
+    return truth
+
+
+def _write_entry_stream(f, name: str, size: int, rng: random.Random) -> None:
+    f.write(_cpio_entry(name, size))
+    block = rng.randbytes(1 << 16) + b"\0"
+    remaining = size
+    while remaining:
+        chunk = block[:min(remaining, len(block))]
+        f.write(chunk)
+        remaining -= len(chunk)
+
+
+def generate_corpus(output_dir: str, file_count: int = 100, seed: int = 0, **params) -> Dict[str, List]:
+    """
+    Write ``file_count`` synthetic scenes and a manifest with the ground truth.
+
+    Args:
+        output_dir (str): Directory to write into (created if missing)
+        file_count (int): Number of scene files
+        seed (int): Base random seed
+        **params: Passed to ``generate_hip``
+
+    Returns:
+        Dict[str, List]: Ground truth keyed by scene path
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    library_path = os.path.join(os.path.abspath(output_dir), LIBRARY_FILE)
+    generate_library(library_path, params.get("hda_types", 50))
+    manifest = {}
+    for i in range(file_count):
+        shot_dir = os.path.join(output_dir, f"shot{i // 100:03d}")
+        os.makedirs(shot_dir, exist_ok=True)
+        path = os.path.join(shot_dir, f"scene{i:05d}.hip")
+        manifest[path] = generate_hip(path, seed=seed + i, library_path=library_path, **params)
+
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w") as f:
+        json.dump({"params": params, "files": manifest}, f)
+    return manifest
+
+
+def load_manifest(corpus_dir: str) -> Dict[str, List]:
+    with open(os.path.join(corpus_dir, MANIFEST_FILE), "r") as f:
+        return json.load(f)["files"]
+
+
+# ─── Tracker modes ─────────────────────────────────────────────────
+# Each mode takes a list of paths and returns the set of (hip, hda) pairs
+# found, using the same calls as the hdaTracker script it stands for
+
+
+def _mode_reader(paths: List[str]) -> Set[Tuple[str, str]]:
+    # hdaTracker_singleThreaded
+    found = set()
+    for path in paths:
+        found.update((row[0], row[1]) for row in gather_hd_assets_in_hip_file(path))
+    return found
+
+
+def _mode_reader_threads(paths: List[str]) -> Set[Tuple[str, str]]:
+    # hdaTracker_multiThreaded
+    found = set()
+    with ThreadPoolExecutor() as executor:
+        for rows in executor.map(gather_hd_assets_in_hip_file, paths):
+            found.update((row[0], row[1]) for row in rows)
+    return found
+
+
+def _mode_binary(paths: List[str]) -> Set[Tuple[str, str]]:
+    # hdaTracker_Binary
+    found = set()
+    for result in scan_files(paths, HDA_NAME_PATTERN):
+        found.update((result.path, name) for name in result.matches)
+    return found
+
+
+def _mode_hython(paths: List[str]) -> Set[Tuple[str, str]]:
+    # hdaTracker_processPool
+    from .process_pool import HythonPool
+    found = set()
+    for result in HythonPool().scan(paths):
+        found.update((row[0], row[1]) for row in result.rows)
+    return found
+
+
+MODES = {
+    "reader": _mode_reader,
+    "reader_threads": _mode_reader_threads,
+    "binary": _mode_binary,
+    "hython": _mode_hython,
+}
+
+
+def available_modes() -> List[str]:
+    from .process_pool import find_hython
+    return [mode for mode in MODES if mode != "hython" or find_hython()]
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    # ru_maxrss is in kilobytes on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024.0
+
+
+def _run_mode_in_child(mode: str, paths: List[str], results) -> None:
+    try:
+        start = time.perf_counter()
+        found = MODES[mode](paths)
+        results.put((True, (sorted(found), time.perf_counter() - start, _peak_rss_mb())))
+    except BaseException:
+        results.put((False, traceback.format_exc()))
+
+
+def _failed(mode: str, paths: List[str], error: str) -> BenchmarkResult:
+    return BenchmarkResult(mode, len(paths), 0.0, 0.0, 0.0, 0.0, False, len(paths), error=error)
+
+
+def run_mode(mode: str, paths: List[str], truth: Dict[str, List], timeout: float = None) -> BenchmarkResult:
+    """
+    Run one mode in a fresh process so its peak RSS is measured on its own.
+
+    Args:
+        mode (str): Key of ``MODES``
+        paths (List[str]): Scene files to scan
+        truth (Dict[str, List]): Manifest ground truth
+        timeout (float): Seconds before the mode is killed; None waits
+            as long as the child process is alive
+
+    Returns:
+        BenchmarkResult: Timing, memory and agreement for the mode, or a
+        result with ``error`` set if the mode raised, died or timed out
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_mode_in_child, args=(mode, paths, results))
+    process.start()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    outcome = None
+    while outcome is None:
+        try:
+            outcome = results.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            if not process.is_alive():
+                # The result may have been queued just before the process exited
+                try:
+                    outcome = results.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    outcome = (False, f"Child process exited with code {process.exitcode}")
+            elif deadline is not None and time.monotonic() > deadline:
+                process.terminate()
+                outcome = (False, f"Timed out after {timeout:.0f}s")
+    process.join()
+
+    ok, payload = outcome
+    if not ok:
+        return _failed(mode, paths, payload)
+    found, seconds, peak_rss = payload
+
+    found = set(map(tuple, found))
+    expected = {(path, hda) for path in paths for hda, _, _ in truth.get(path, [])}
+    missed, extra = expected - found, found - expected
+    mismatched = {path for path, _ in missed | extra}
+
+    total_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+    return BenchmarkResult(
+        mode, len(paths), seconds,
+        len(paths) / seconds if seconds else 0.0,
+        total_mb / seconds if seconds else 0.0,
+        peak_rss, not mismatched, len(mismatched), len(missed), len(extra)
+    )
+
+
+def run_benchmark(corpus_dir: str, modes: Iterable[str] = None, timeout: float = None) -> List[BenchmarkResult]:
+    """Run every requested (or available) mode over a generated corpus."""
+    truth = load_manifest(corpus_dir)
+    paths = sorted(truth)
+    return [run_mode(mode, paths, truth, timeout) for mode in (modes or available_modes())]
+
+
+def format_results(results: Iterable[BenchmarkResult]) -> str:
+    """Render results as a fixed-width text table."""
+    lines = [f"{'mode':<16}{'files':>8}{'sec':>10}{'files/s':>12}{'MB/s':>10}{'RSS MB':>10}  agree"]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.mode:<16}{r.files:>8}  FAILED: {r.error.strip().splitlines()[-1]}")
+            continue
+        agree = "yes" if r.agrees else f"NO ({r.mismatched_files} files: {r.missed} missed, {r.extra} extra)"
+        lines.append(
+            f"{r.mode:<16}{r.files:>8}{r.seconds:>10.2f}{r.files_per_second:>12.1f}"
+            f"{r.mb_per_second:>10.1f}{r.peak_rss_mb:>10.1f}  {agree}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,110 @@
+"""
+Parallel directory crawler for finding scene files.
+
+``os.walk`` lists one directory at a time, which on NFS means one round
+trip after another. This crawler lists each directory level with a
+bounded pool of threads (``os.scandir`` releases the GIL while waiting on
+the file server) and yields matching files as soon as their directory has
+been listed, so the scan stage can start before the walk is finished.
+"""
+
+import fnmatch
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .hip_reader import HIP_EXTENSIONS
+
+# Houdini writes numbered backups to $HIP/backup/<name>_bak<N>.hip
+BACKUP_DIR_NAMES = ("backup",)
+BACKUP_FILE_PATTERNS = ("*_bak[0-9]*", "*_autosave*", "*.autosave.*")
+
+
+def _matches(rel_path: str, patterns: Iterable[str]) -> bool:
+    name = rel_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(rel_path, p) or fnmatch.fnmatch(name, p) for p in patterns)
+
+
+def _list_directory(path: str) -> Tuple[List[str], List[str]]:
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError as e:
+        print("Error listing directory:", path, str(e))
+    return files, dirs
+
+
+def crawl_hip_files(root_directory: str,
+                    include: Optional[Iterable[str]] = None,
+                    exclude: Optional[Iterable[str]] = None,
+                    extensions: Tuple[str, ...] = HIP_EXTENSIONS,
+                    skip_backups: bool = True,
+                    max_depth: Optional[int] = None,
+                    workers: int = 8) -> Iterator[str]:
+    """
+    Yield scene files under a root directory, level by level.
+
+    Glob patterns are matched against the path relative to the root (with
+    forward slashes) and against the bare file or directory name, so both
+    ``"shots/*/fx/*"`` and ``"*_wip*"`` work. A directory matching an
+    exclude pattern is not descended into.
+
+    Args:
+        root_directory (str): Directory to crawl
+        include (Iterable[str]): Only yield files matching one of these globs
+        exclude (Iterable[str]): Skip files and directories matching these globs
+        extensions (Tuple[str, ...]): Accepted file extensions
+        skip_backups (bool): Skip ``backup`` folders and autosave/backup files
+        max_depth (int): Deepest directory level to list; the root is 0
+        workers (int): Directories listed concurrently
+
+    Yields:
+        str: Matching file paths, in no particular order
+    """
+    include = tuple(include or ())
+    exclude = tuple(exclude or ())
+    if skip_backups:
+        exclude += BACKUP_FILE_PATTERNS
+    extensions = tuple(ext.lower() for ext in extensions)
+    root_prefix = len(os.path.join(root_directory, ""))
+
+    def relative(path: str) -> str:
+        return path[root_prefix:].replace(os.sep, "/")
+
+    level = [root_directory]
+    depth = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while level:
+            next_level = []
+            futures = [executor.submit(_list_directory, path) for path in level]
+            for future in as_completed(futures):
+                files, dirs = future.result()
+
+                for path in files:
+                    if not path.lower().endswith(extensions):
+                        continue
+                    rel_path = relative(path)
+                    if exclude and _matches(rel_path, exclude):
+                        continue
+                    if include and not _matches(rel_path, include):
+                        continue
+                    yield path
+
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                for path in dirs:
+                    if skip_backups and os.path.basename(path).lower() in BACKUP_DIR_NAMES:
+                        continue
+                    if exclude and _matches(relative(path), exclude):
+                        continue
+                    next_level.append(path)
+            level = next_level
+            depth += 1
@@ -0,0 +1,318 @@
+"""
+Reverse dependency graph of HDAs, the scenes that use them and the HDAs
+nested inside other HDA definitions.
+
+Scene usage comes from the tracker (an ``HdaIndex`` or plain
+``(hip, hda)`` rows). Nesting comes from reading the referenced asset
+libraries directly: every definition section in an .hda/.otl carries a
+``DialogScript`` naming the type and a ``Contents`` section that is a
+(usually gzipped) cpio archive in the same format as a .hip file, so the
+nested node types are read with the same cpio walker as scenes. Libraries
+are memory-mapped and inflated incrementally; nothing is loaded into hou.
+
+Edges point from a dependency to its dependents (HDA -> scenes using it,
+HDA -> definitions that contain it), so "everything affected by
+publishing X" is a plain transitive closure from X.
+"""
+
+import json
+import mmap
+import os
+import re
+import zlib
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .hip_reader import (
+    CPIO_MAGIC, DIALOG_SCRIPT_PATTERN, GZIP_MAGIC, HDA_LIBRARY_EXTENSIONS, INFLATE_CHUNK, HipFormatError,
+    InflateStream, is_hda_candidate, iter_cpio_entries, read_hip_libraries
+)
+
+DEFAULT_GRAPH_FILE = "hda_graph.json"
+GRAPH_FORMAT_VERSION = 1
+
+HDA = "hda"
+HIP = "hip"
+
+# Each definition inside a library is itself an INDX archive
+_SECTION_MAGIC = b"INDX"
+_TYPE_LINE_RE = re.compile(rb"^type\s*=\s*(\S+)", re.MULTILINE)
+
+
+class _MappedStream:
+    """Minimal read/seek stream over a slice of an mmap, without copying it."""
+
+    def __init__(self, mapped, start: int, end: int):
+        self.mapped = mapped
+        self.pos = start
+        self.end = end
+
+    def read(self, size: int) -> bytes:
+        data = self.mapped[self.pos:min(self.pos + size, self.end)]
+        self.pos += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> None:
+        if whence != os.SEEK_CUR:
+            raise OSError("Only relative seeks are supported")
+        self.pos = min(self.pos + offset, self.end)
+
+
+def _iter_content_types(stream) -> Iterator[str]:
+    wanted = lambda name, size: name.endswith(".init")
+    try:
+        for _, body in iter_cpio_entries(stream, wanted):
+            if body is None:
+                continue
+            match = _TYPE_LINE_RE.search(body)
+            if match:
+                yield match.group(1).decode("utf-8", "replace")
+    except HipFormatError:
+        return
+
+
+def _iter_region_types(mapped, start: int, end: int) -> Iterator[str]:
+    """Node types from every gzipped or raw cpio archive found in a region."""
+    pos = start
+    while pos < end:
+        gzip_at = mapped.find(GZIP_MAGIC, pos, end)
+        cpio_at = mapped.find(CPIO_MAGIC, pos, end)
+        candidates = [at for at in (gzip_at, cpio_at) if at != -1]
+        if not candidates:
+            return
+        at = min(candidates)
+
+        if at == gzip_at:
+            stream = InflateStream(mapped, at, end)
+            try:
+                if stream.peek(len(CPIO_MAGIC)) == CPIO_MAGIC:
+                    yield from _iter_content_types(stream)
+                while stream.read(INFLATE_CHUNK):
+                    pass
+                pos = max(stream.consumed_end(), at + 1)
+            except zlib.error:
+                pos = at + 1
+        else:
+            stream = _MappedStream(mapped, at, end)
+            yield from _iter_content_types(stream)
+            pos = max(stream.pos, at + 1)
+
+
+def iter_library_definitions(library_path: str) -> Iterator[Tuple[str, Set[str]]]:
+    """
+    Yield every HDA defined in a library with the node types it contains.
+
+    Handles both single-file libraries and expanded (``hotl -t``) directory
+    libraries.
+
+    Args:
+        library_path (str): Path to an .hda/.otl file or expanded directory
+
+    Yields:
+        Tuple[str, Set[str]]: ``(type_name, nested_type_names)``
+    """
+    if os.path.isdir(library_path):
+        yield from _iter_expanded_definitions(library_path)
+        return
+
+    if not os.path.getsize(library_path):
+        return
+    with open(library_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # Split at each definition's INDX header (skipping the library's own)
+        bounds = []
+        at = mapped.find(_SECTION_MAGIC, 1)
+        while at != -1:
+            bounds.append(at)
+            at = mapped.find(_SECTION_MAGIC, at + 1)
+        bounds.append(len(mapped))
+
+        owner = None
+        nested = set()
+        for start, end in zip(bounds, bounds[1:]):
+            match = DIALOG_SCRIPT_PATTERN.search(mapped, start, end)
+            if match:
+                if owner:
+                    yield owner, nested
+                owner = match.group(1).decode("utf-8", "replace")
+                nested = set()
+            # Regions without a dialog script belong to the previous definition
+            nested.update(_iter_region_types(mapped, start, end))
+        if owner:
+            yield owner, nested
+
+
+def _iter_expanded_definitions(library_dir: str) -> Iterator[Tuple[str, Set[str]]]:
+    for entry in os.scandir(library_dir):
+        dialog_script = os.path.join(entry.path, "DialogScript")
+        if not entry.is_dir() or not os.path.isfile(dialog_script):
+            continue
+        with open(dialog_script, "rb") as f:
+            match = DIALOG_SCRIPT_PATTERN.search(f.read(4096))
+        if not match:
+            continue
+
+        nested = set()
+        for name in ("Contents.gz", "Contents"):
+            contents = os.path.join(entry.path, name)
+            if os.path.isfile(contents) and os.path.getsize(contents):
+                with open(contents, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    nested.update(_iter_region_types(mapped, 0, len(mapped)))
+        yield match.group(1).decode("utf-8", "replace"), nested
+
+
+class HdaDependencyGraph:
+    """
+    Directed graph over HDA types and scene files.
+
+    Stored on disk as compact JSON adjacency (CSR): a node table of
+    ``[kind, key]`` pairs, an ``offsets`` array and a flat ``targets``
+    array, where the dependents of node ``i`` are
+    ``targets[offsets[i]:offsets[i + 1]]``.
+
+    Example:
+        >>> graph = HdaDependencyGraph.load("hda_graph.json")
+        >>> hdas, scenes = graph.affected_by("sidefx::labs::foo::2.0")
+    """
+
+    def __init__(self):
+        self.nodes: List[Tuple[str, str]] = []
+        self.ids: Dict[Tuple[str, str], int] = {}
+        self.dependents: List[Set[int]] = []
+
+    def _node_id(self, kind: str, key: str) -> int:
+        node = (kind, key)
+        node_id = self.ids.get(node)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.ids[node] = node_id
+            self.nodes.append(node)
+            self.dependents.append(set())
+        return node_id
+
+    def add_scene_usage(self, hip_path: str, hda: str) -> None:
+        """Record that a scene uses an HDA."""
+        self.dependents[self._node_id(HDA, hda)].add(self._node_id(HIP, hip_path))
+
+    def add_nesting(self, parent_hda: str, child_hda: str) -> None:
+        """Record that ``parent_hda``'s definition contains ``child_hda``."""
+        if parent_hda != child_hda:
+            self.dependents[self._node_id(HDA, child_hda)].add(self._node_id(HDA, parent_hda))
+
+    def affected_by(self, hda: str) -> Tuple[Set[str], Set[str]]:
+        """
+        Everything that transitively depends on an HDA.
+
+        Args:
+            hda (str): HDA type name
+
+        Returns:
+            Tuple[Set[str], Set[str]]: ``(hda_types, hip_paths)`` affected,
+            not including ``hda`` itself
+        """
+        start = self.ids.get((HDA, hda))
+        if start is None:
+            return set(), set()
+
+        seen = {start}
+        pending = deque([start])
+        while pending:
+            for target in self.dependents[pending.popleft()]:
+                if target not in seen:
+                    seen.add(target)
+                    pending.append(target)
+        seen.discard(start)
+
+        hdas, scenes = set(), set()
+        for node_id in seen:
+            kind, key = self.nodes[node_id]
+            (hdas if kind == HDA else scenes).add(key)
+        return hdas, scenes
+
+    def save(self, path: str = DEFAULT_GRAPH_FILE) -> None:
+        """Write the graph as compact CSR JSON."""
+        offsets = [0]
+        targets = []
+        for dependents in self.dependents:
+            targets.extend(sorted(dependents))
+            offsets.append(len(targets))
+        data = {
+            "version": GRAPH_FORMAT_VERSION,
+            "nodes": [list(node) for node in self.nodes],
+            "offsets": offsets,
+            "targets": targets,
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_GRAPH_FILE) -> "HdaDependencyGraph":
+        """Read a graph written by ``save``."""
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != GRAPH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph format version: {data.get('version')}")
+
+        graph = cls()
+        graph.nodes = [tuple(node) for node in data["nodes"]]
+        graph.ids = {node: i for i, node in enumerate(graph.nodes)}
+        offsets, targets = data["offsets"], data["targets"]
+        graph.dependents = [set(targets[offsets[i]:offsets[i + 1]]) for i in range(len(graph.nodes))]
+        return graph
+
+
+def find_libraries(paths: Iterable[str]) -> Iterator[str]:
+    """Expand library directories (e.g. an otls folder) into library files."""
+    for path in paths:
+        if os.path.isdir(path) and not os.path.isfile(os.path.join(path, "houdini.hdalibrary")):
+            for entry in os.scandir(path):
+                if entry.name.lower().endswith(HDA_LIBRARY_EXTENSIONS):
+                    yield entry.path
+        else:
+            yield path
+
+
+def build_graph(usages: Iterable[Tuple[str, str]], library_paths: Iterable[str] = (),
+                scan_scene_libraries: bool = True) -> HdaDependencyGraph:
+    """
+    Build the reverse dependency graph.
+
+    Args:
+        usages (Iterable[Tuple[str, str]]): ``(hip_path, hda)`` pairs from the
+            tracker, e.g. ``HdaIndex.usage_pairs()``
+        library_paths (Iterable[str]): Extra library files or otls folders
+        scan_scene_libraries (bool): Also open the libraries listed in each
+            scene's ``.OPlibraries`` entry
+
+    Returns:
+        HdaDependencyGraph: The populated graph
+    """
+    graph = HdaDependencyGraph()
+    libraries = list(find_libraries(library_paths))
+    scenes = set()
+    for hip_path, hda in usages:
+        graph.add_scene_usage(hip_path, hda)
+        scenes.add(hip_path)
+
+    if scan_scene_libraries:
+        for hip_path in sorted(scenes):
+            try:
+                libraries.extend(read_hip_libraries(hip_path))
+            except (OSError, HipFormatError):
+                continue
+
+    definitions = {}
+    for library in dict.fromkeys(libraries):
+        try:
+            for type_name, nested in iter_library_definitions(library):
+                definitions.setdefault(type_name, set()).update(nested)
+        except (OSError, ValueError) as e:
+            print("Error reading HDA library:", library, str(e))
+
+    defined_types = set(definitions)
+    for parent, nested in definitions.items():
+        for child in nested:
+            if child in defined_types or is_hda_candidate(child):
+                graph.add_nesting(parent, child)
+    return graph
@@ -0,0 +1,505 @@
+"""
+Streaming reader for Houdini scene files.
+
+A .hip file is a cpio archive (old portable "odc" format) where every node
+in the scene is stored as a handful of small text entries such as
+``obj/geo1.init`` (operator type), ``obj/geo1.def`` (flags, position) and
+``obj/geo1.parm`` (parameter values). This module walks those entries
+header by header, reads only the ``.init`` bodies and seeks past everything
+else, so HDA usage can be gathered without ``hou.hipFile.load`` and without
+cooking anything.
+
+Does not need ``hou``; works in plain Python as well as in hython.
+"""
+
+import mmap
+import os
+import re
+import zlib
+from collections import namedtuple
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+CPIO_MAGIC = b"070707"
+CPIO_HEADER_SIZE = 76
+CPIO_TRAILER = "TRAILER!!!"
+
+HIP_EXTENSIONS = (".hip", ".hipnc", ".hiplc")
+HDA_LIBRARY_EXTENSIONS = (".hda", ".hdanc", ".hdalc", ".otl", ".otlnc", ".otllc")
+
+# Entry listing the asset libraries a scene had loaded when it was saved
+LIBRARIES_ENTRY = ".OPlibraries"
+
+# Entry bodies larger than this are never parsed as text (embedded geometry etc.)
+MAX_TEXT_ENTRY_SIZE = 1024 * 1024
+
+_VERSION_RE = re.compile(r"^\d+(\.\d+)*$")
+_TYPE_LINE_RE = re.compile(rb"^type\s*=\s*(\S+)", re.MULTILINE)
+# Header of the DialogScript section every asset definition carries
+DIALOG_SCRIPT_PATTERN = re.compile(rb"# Dialog script for (\S+) automatically generated")
+# Library sections may be stored gzipped
+GZIP_MAGIC = b"\x1f\x8b\x08"
+INFLATE_CHUNK = 1 << 16
+# Inflated bytes carried over between chunks so a header split by a chunk boundary still matches
+DIALOG_SCRIPT_OVERLAP = 512
+
+# Type names defined by each library file, keyed by path: (signature, types)
+_library_types: Dict[str, tuple] = {}
+
+CpioEntry = namedtuple("CpioEntry", ["name", "offset", "size", "mtime"])
+HdaUsage = namedtuple(
+    "HdaUsage",
+    ["hip_path", "hda", "namespace", "name", "version", "depth", "node_path"]
+)
+
+
+class HipFormatError(Exception):
+    """Raised when a file is not a readable cpio-style .hip archive."""
+
+
+def split_type_name(type_name: str) -> Tuple[str, str, str]:
+    """
+    Split an operator type name into namespace, name and version.
+
+    Args:
+        type_name (str): Full type name, e.g. ``sidefx::labs::foo::2.0``
+
+    Returns:
+        Tuple[str, str, str]: ``(namespace, name, version)``, with empty
+        strings for missing components
+
+    Example:
+        >>> split_type_name("sidefx::labs::foo::2.0")
+        ('sidefx::labs', 'foo', '2.0')
+    """
+    parts = type_name.split("::")
+    version = ""
+    if len(parts) > 1 and _VERSION_RE.match(parts[-1]):
+        version = parts.pop()
+    name = parts.pop()
+    return "::".join(parts), name, version
+
+
+def is_hda_candidate(type_name: str, hda_types: Optional[Set[str]] = None, guess: bool = False) -> bool:
+    """
+    Decide whether an operator type should be reported as an HDA.
+
+    A .hip file does not record whether a type is defined by an asset, so
+    the answer comes from ``hda_types``: the types defined by the asset
+    libraries the scene had loaded (see ``scene_hda_types``). Only when
+    those are unknown, or ``guess`` is set because some library could not
+    be read, namespaced type names are reported as a last resort. That
+    guess misses studio HDAs without a namespace.
+
+    Args:
+        type_name (str): Operator type name from a ``.init`` entry
+        hda_types (Optional[Set[str]]): Known HDA type names, if available
+        guess (bool): Also report namespaced types not in ``hda_types``
+
+    Returns:
+        bool: True if the type should be reported
+    """
+    if hda_types is not None:
+        if type_name in hda_types:
+            return True
+        if not guess:
+            return False
+    # Versioned built-ins such as copytopoints::2.0 have no namespace
+    return bool(split_type_name(type_name)[0])
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise HipFormatError("Unexpected end of file")
+    return data
+
+
+def _skip(stream: BinaryIO, size: int) -> None:
+    if not size:
+        return
+    try:
+        stream.seek(size, os.SEEK_CUR)
+    except (OSError, AttributeError):
+        # Non-seekable stream (pipe, gzip, ...): read and discard
+        while size:
+            chunk = stream.read(min(size, 1 << 20))
+            if not chunk:
+                raise HipFormatError("Unexpected end of file")
+            size -= len(chunk)
+
+
+def parse_cpio_header(header: bytes) -> Tuple[int, int, int]:
+    """
+    Decode an odc cpio header.
+
+    Args:
+        header (bytes): The 76 header bytes
+
+    Returns:
+        Tuple[int, int, int]: ``(mtime, name_size, file_size)``
+
+    Raises:
+        HipFormatError: If the magic or octal fields are invalid
+    """
+    if header[:6] != CPIO_MAGIC:
+        raise HipFormatError(f"Bad cpio magic: {header[:6]!r}")
+    try:
+        mtime = int(header[48:59], 8)
+        name_size = int(header[59:65], 8)
+        file_size = int(header[65:76], 8)
+    except ValueError:
+        raise HipFormatError("Corrupt cpio header")
+    return mtime, name_size, file_size
+
+
+def iter_cpio_entries(stream: BinaryIO, wanted=None) -> Iterator[Tuple[CpioEntry, Optional[bytes]]]:
+    """
+    Walk the entries of a cpio archive without loading it.
+
+    Args:
+        stream (BinaryIO): Binary stream positioned at the first header
+        wanted (callable): Predicate ``wanted(name, size)``; the body is
+            read and returned only for entries where it returns True
+
+    Yields:
+        Tuple[CpioEntry, Optional[bytes]]: Entry info and its body, or
+        None when the body was skipped
+    """
+    offset = 0
+    while True:
+        header = stream.read(CPIO_HEADER_SIZE)
+        if not header:
+            return
+        if len(header) != CPIO_HEADER_SIZE:
+            raise HipFormatError("Truncated cpio header")
+        mtime, name_size, file_size = parse_cpio_header(header)
+        name = _read_exact(stream, name_size).rstrip(b"\0").decode("utf-8", "replace")
+        data_offset = offset + CPIO_HEADER_SIZE + name_size
+        offset = data_offset + file_size
+
+        if name == CPIO_TRAILER:
+            return
+
+        entry = CpioEntry(name, data_offset, file_size, mtime)
+        if wanted is not None and wanted(name, file_size):
+            yield entry, _read_exact(stream, file_size)
+        else:
+            _skip(stream, file_size)
+            yield entry, None
+
+
+def _wants_scene_text(name: str, size: int) -> bool:
+    return (name.endswith(".init") or name == LIBRARIES_ENTRY) and size <= MAX_TEXT_ENTRY_SIZE
+
+
+def _iter_scene(hip_path: str) -> Iterator[Tuple[str, object]]:
+    """``("libraries", paths)`` for the ``.OPlibraries`` entry and ``("node", (path, type, depth))`` per node."""
+    with open(hip_path, "rb") as stream:
+        for entry, body in iter_cpio_entries(stream, _wants_scene_text):
+            if body is None:
+                continue
+            if entry.name == LIBRARIES_ENTRY:
+                yield "libraries", _parse_libraries(body)
+                continue
+            match = _TYPE_LINE_RE.search(body)
+            if not match:
+                continue
+            node_path = "/" + entry.name[:-len(".init")]
+            depth = node_path.count("/")
+            yield "node", (node_path, match.group(1).decode("utf-8", "replace"), depth)
+
+
+def iter_node_types(hip_path: str) -> Iterator[Tuple[str, str, int]]:
+    """
+    Yield the operator type of every node stored in a .hip file.
+
+    Args:
+        hip_path (str): Path to a .hip/.hipnc/.hiplc file
+
+    Yields:
+        Tuple[str, str, int]: ``(node_path, type_name, depth)`` where depth
+        matches a ``hou.node('/')`` traversal (``/obj`` is 1)
+
+    Raises:
+        HipFormatError: If the file is not a cpio-style scene
+    """
+    for kind, value in _iter_scene(hip_path):
+        if kind == "node":
+            yield value
+
+
+def _parse_libraries(body: bytes) -> List[str]:
+    libraries = []
+    for token in body.decode("utf-8", "replace").split():
+        if token.lower().endswith(HDA_LIBRARY_EXTENSIONS):
+            libraries.append(os.path.expandvars(token))
+    return libraries
+
+
+def read_hip_libraries(hip_path: str) -> List[str]:
+    """
+    List the HDA library files recorded in a scene's ``.OPlibraries`` entry.
+
+    Environment variables such as ``$HFS`` are expanded with the current
+    environment; paths that cannot be expanded are returned as-is.
+
+    Args:
+        hip_path (str): Path to the scene file
+
+    Returns:
+        List[str]: Library paths in the order they appear
+    """
+    wanted = lambda name, size: name == LIBRARIES_ENTRY and size <= MAX_TEXT_ENTRY_SIZE
+    with open(hip_path, "rb") as stream:
+        for entry, body in iter_cpio_entries(stream, wanted):
+            if body is not None:
+                return _parse_libraries(body)
+    return []
+
+
+class InflateStream:
+    """Read-only stream that gunzips a region of an mmap on demand (gzipped library sections)."""
+
+    def __init__(self, mapped, start: int, end: int):
+        self.mapped = mapped
+        self.pos = start
+        self.end = end
+        self.inflater = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        # Inflated bytes not read yet start at buffer_pos; consumed bytes are
+        # dropped once they make up most of the buffer, not on every read
+        self.buffer = bytearray()
+        self.buffer_pos = 0
+
+    def peek(self, size: int) -> bytes:
+        while len(self.buffer) - self.buffer_pos < size and not self.inflater.eof and self.pos < self.end:
+            chunk = self.mapped[self.pos:min(self.pos + INFLATE_CHUNK, self.end)]
+            self.pos += len(chunk)
+            if self.buffer_pos > len(self.buffer) // 2:
+                del self.buffer[:self.buffer_pos]
+                self.buffer_pos = 0
+            self.buffer += self.inflater.decompress(chunk)
+        return bytes(self.buffer[self.buffer_pos:self.buffer_pos + size])
+
+    def read(self, size: int) -> bytes:
+        data = self.peek(size)
+        self.buffer_pos += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> None:
+        if whence != os.SEEK_CUR:
+            raise OSError("Only relative seeks are supported")
+        # Skip without materializing the skipped bytes
+        while offset > 0:
+            available = len(self.buffer) - self.buffer_pos
+            if available >= offset:
+                self.buffer_pos += offset
+                return
+            offset -= available
+            self.buffer_pos = len(self.buffer)
+            if not self.peek(min(offset, INFLATE_CHUNK)):
+                return
+
+    def consumed_end(self) -> int:
+        """Offset just past the compressed stream (valid once fully read)."""
+        return self.pos - len(self.inflater.unused_data)
+
+
+def _dialog_script_types(mapped) -> Set[str]:
+    """Types named by DialogScript headers in a library, stored plain or in gzipped sections."""
+    types = {m.group(1).decode("utf-8", "replace") for m in DIALOG_SCRIPT_PATTERN.finditer(mapped)}
+    pos = 0
+    end = len(mapped)
+    while True:
+        at = mapped.find(GZIP_MAGIC, pos)
+        if at == -1:
+            return types
+        stream = InflateStream(mapped, at, end)
+        tail = b""
+        try:
+            while True:
+                chunk = stream.read(INFLATE_CHUNK)
+                if not chunk:
+                    break
+                data = tail + chunk
+                types.update(m.group(1).decode("utf-8", "replace") for m in DIALOG_SCRIPT_PATTERN.finditer(data))
+                tail = data[-DIALOG_SCRIPT_OVERLAP:]
+            pos = max(stream.consumed_end(), at + 1)
+        except zlib.error:
+            # Magic bytes that are not the start of a gzip stream
+            pos = at + 1
+
+
+def _library_signature(library_path: str) -> tuple:
+    stat = os.stat(library_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_library_types(library_path: str) -> Set[str]:
+    """
+    Type names defined in an HDA library, from each definition's DialogScript.
+
+    Gzipped sections are inflated and searched as well.
+
+    Results are cached per library and reused while its mtime and size are
+    unchanged, so a library shared by thousands of scenes is read once.
+
+    Args:
+        library_path (str): Path to an .hda/.otl file or expanded directory
+
+    Returns:
+        Set[str]: Defined type names, e.g. ``{"sidefx::labs::foo::2.0"}``
+
+    Raises:
+        OSError: If the library cannot be read
+    """
+    signature = _library_signature(library_path)
+    cached = _library_types.get(library_path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    types = set()
+    if os.path.isdir(library_path):
+        for entry in os.scandir(library_path):
+            dialog_script = os.path.join(entry.path, "DialogScript")
+            if entry.is_dir() and os.path.isfile(dialog_script):
+                with open(dialog_script, "rb") as f:
+                    types.update(m.decode("utf-8", "replace") for m in DIALOG_SCRIPT_PATTERN.findall(f.read(4096)))
+    elif os.path.getsize(library_path):
+        with open(library_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            types = _dialog_script_types(mapped)
+    _library_types[library_path] = (signature, types)
+    return types
+
+
+def scene_hda_types(library_paths: Iterable[str]) -> Tuple[Set[str], bool]:
+    """
+    HDA types defined by a scene's libraries.
+
+    Args:
+        library_paths (Iterable[str]): Library files, e.g. from ``read_hip_libraries``
+
+    Returns:
+        Tuple[Set[str], bool]: ``(type_names, complete)``; ``complete`` is
+        False when a library could not be read (moved, or ``$HFS`` of
+        another machine) or no definitions were found in it (a format
+        this reader does not understand), in which case the types are a
+        lower bound
+    """
+    types = set()
+    complete = True
+    for library in dict.fromkeys(library_paths):
+        try:
+            library_types = read_library_types(library)
+        except (OSError, ValueError):
+            complete = False
+            continue
+        if not library_types:
+            complete = False
+        types |= library_types
+    return types, complete
+
+
+def iter_hda_usages(hip_path: str, hda_types: Optional[Set[str]] = None,
+                    library_paths: Iterable[str] = ()) -> Iterator[HdaUsage]:
+    """
+    Yield HDA usages found in a .hip file without loading the scene.
+
+    Unless ``hda_types`` is given, a node counts as an HDA when its type is
+    defined by one of the libraries in the scene's ``.OPlibraries`` entry
+    (plus ``library_paths``). Scenes without that entry, or with libraries
+    that cannot be read, fall back to the namespace guess of
+    ``is_hda_candidate`` for the types the libraries do not cover.
+
+    Args:
+        hip_path (str): Path to the scene file
+        hda_types (Optional[Set[str]]): Known HDA type names; skips the
+            library lookup
+        library_paths (Iterable[str]): Extra libraries defining HDA types
+
+    Yields:
+        HdaUsage: One record per node whose type is an HDA
+    """
+    library_paths = list(library_paths)
+    guess = False
+    # Without hda_types, nodes before the .OPlibraries entry wait until it is read
+    resolved = hda_types is not None
+    pending = []
+
+    def usage(node_path: str, type_name: str, depth: int) -> Optional[HdaUsage]:
+        if not is_hda_candidate(type_name, hda_types, guess):
+            return None
+        namespace, name, version = split_type_name(type_name)
+        return HdaUsage(hip_path, type_name, namespace, name, version, depth, node_path)
+
+    for kind, value in _iter_scene(hip_path):
+        if kind == "libraries":
+            if not resolved:
+                hda_types, complete = scene_hda_types(value + library_paths)
+                guess = not complete
+                resolved = True
+                for node in pending:
+                    found = usage(*node)
+                    if found:
+                        yield found
+                pending = []
+            continue
+        if not resolved:
+            pending.append(value)
+            continue
+        found = usage(*value)
+        if found:
+            yield found
+
+    if not resolved:
+        # No .OPlibraries entry: only the extra libraries are known
+        hda_types, _ = scene_hda_types(library_paths)
+        guess = True
+        for node in pending:
+            found = usage(*node)
+            if found:
+                yield found
+
+
+def read_hd_asset_rows(hip_path: str, hda_types: Optional[Set[str]] = None,
+                       library_paths: Iterable[str] = ()) -> List[Tuple[str, str, int]]:
+    """
+    ``(hip_path, hda_name, depth)`` rows for a scene, raising on a file that
+    cannot be read. Use this when the rows go to a resumable sink, so a
+    failed scene is not marked done with no rows.
+
+    Args:
+        hip_path (str): Path to the scene file
+        hda_types (Optional[Set[str]]): Known HDA type names
+        library_paths (Iterable[str]): Extra libraries defining HDA types
+
+    Returns:
+        List[Tuple[str, str, int]]: ``(hip_path, hda_name, depth)`` rows
+
+    Raises:
+        OSError: If the scene cannot be opened or read
+        HipFormatError: If the scene is not a readable .hip file
+    """
+    return [(usage.hip_path, usage.hda, usage.depth)
+            for usage in iter_hda_usages(hip_path, hda_types, library_paths)]
+
+
+def gather_hd_assets_in_hip_file(hip_path: str, hda_types: Optional[Set[str]] = None,
+                                 library_paths: Iterable[str] = ()) -> List[Tuple[str, str, int]]:
+    """
+    Drop-in replacement for the hdaTracker scripts' hou-based gatherer.
+    Errors are printed and give no rows; see ``read_hd_asset_rows`` to
+    tell a failed scene from one without HDAs.
+
+    Args:
+        hip_path (str): Path to the scene file
+        hda_types (Optional[Set[str]]): Known HDA type names
+        library_paths (Iterable[str]): Extra libraries defining HDA types
+
+    Returns:
+        List[Tuple[str, str, int]]: ``(hip_path, hda_name, depth)`` rows
+    """
+    try:
+        return read_hd_asset_rows(hip_path, hda_types, library_paths)
+    except (OSError, HipFormatError) as e:
+        print("Error gathering HDA data for:", hip_path, str(e))
+        return []
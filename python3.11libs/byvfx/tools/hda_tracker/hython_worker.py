@@ -0,0 +1,56 @@
+"""
+Headless hython worker for the HDA tracker process pool.
+
+Started by ``process_pool.HythonPool``; not meant to be imported. Reads one
+.hip path per line on stdin, loads it into this process' own hou session
+and streams one protocol line per HDA node back on stdout, followed by a
+``done`` line for the file. Anything else Houdini prints is ignored by the
+parent because protocol lines carry a fixed prefix.
+"""
+
+import json
+import sys
+
+import hou
+
+# The pool puts python3.11libs on PYTHONPATH for us
+from byvfx.tools.hda_tracker.traversal import gather_hda_rows
+
+# Must match process_pool.PROTOCOL_PREFIX
+PROTOCOL_PREFIX = "@@HDA "
+
+
+def emit(out, kind, payload=None):
+    """Write a single protocol line and flush it immediately."""
+    out.write(PROTOCOL_PREFIX + json.dumps([kind, payload]) + "\n")
+    out.flush()
+
+
+def gather_hdas(hip_path, out):
+    """Load a scene and emit ``(hip, hda, version, depth, node_path)`` rows."""
+    for row in gather_hda_rows(hip_path):
+        emit(out, "row", list(row))
+
+
+def main():
+    out = sys.stdout
+    emit(out, "ready")
+    for line in sys.stdin:
+        hip_path = line.rstrip("\n")
+        if not hip_path:
+            continue
+        error = None
+        try:
+            gather_hdas(hip_path, out)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        finally:
+            try:
+                hou.hipFile.clear(suppress_save_prompt=True)
+            except Exception:
+                pass
+        emit(out, "done", error)
+
+
+if __name__ == "__main__":
+    main()
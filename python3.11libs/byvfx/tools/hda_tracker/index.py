@@ -0,0 +1,241 @@
+"""
+Incremental HDA usage index stored in SQLite.
+
+Every scanned scene is recorded with its size, mtime and a content hash.
+A rescan only re-parses files whose size or mtime changed, and only if
+the content hash changed as well (so a plain ``touch`` or copy costs one
+hash, not a parse). Files that disappeared from the scanned root are
+dropped; files that cannot be read are recorded with their error (and
+retried on the next update) instead of stopping the scan. Lookups such as "which scenes use ``sidefx::labs::foo::2.0``" are
+answered from an index on the HDA column.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .hip_reader import HdaUsage, HipFormatError, iter_hda_usages
+
+DEFAULT_INDEX_FILE = "hda_index.sqlite"
+
+IndexStats = namedtuple("IndexStats", ["scanned", "unchanged", "removed", "failed"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    scanned_at REAL NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS usages (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    hda TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    node_path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS usages_hda ON usages(hda);
+CREATE INDEX IF NOT EXISTS usages_name ON usages(namespace, name);
+CREATE INDEX IF NOT EXISTS usages_path ON usages(path);
+"""
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the blake2b hex digest of a file, read in chunks."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HdaIndex:
+    """
+    Persistent, incrementally updated index of HDA usage per scene file.
+
+    Args:
+        db_path (str): SQLite file to create or open
+        parser (Callable): ``parser(hip_path)`` returning an iterable of
+            ``HdaUsage``; defaults to the static .hip reader
+
+    Example:
+        >>> index = HdaIndex("hda_index.sqlite")
+        >>> index.update(hip_files, prune_root="/shows/bunny")
+        >>> index.files_using("sidefx::labs::foo::2.0")
+    """
+
+    def __init__(self, db_path: str = DEFAULT_INDEX_FILE,
+                 parser: Callable[[str], Iterable[HdaUsage]] = iter_hda_usages):
+        self.db_path = db_path
+        self.parser = parser
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ─── Updating ───────────────────────────────────────────────────
+
+    def _stored_state(self, path: str) -> Optional[Tuple[int, int, str]]:
+        return self.connection.execute(
+            "SELECT size, mtime_ns, content_hash FROM files WHERE path = ?", (path,)
+        ).fetchone()
+
+    def index_file(self, path: str, force: bool = False) -> Optional[bool]:
+        """
+        Bring a single file's entry up to date.
+
+        Args:
+            path (str): Scene file path
+            force (bool): Re-parse even if the file looks unchanged
+
+        Returns:
+            Optional[bool]: True if re-parsed, False if unchanged, None if
+            the file is gone (its entry is removed)
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.remove(path)
+            return None
+
+        # An empty stored hash means the file could not be read last time: retry it
+        stored = self._stored_state(path)
+        if not force and stored and stored[2] and stored[0] == st.st_size and stored[1] == st.st_mtime_ns:
+            return False
+
+        error = None
+        usages = []
+        try:
+            content_hash = hash_file(path)
+        except OSError as e:
+            if not os.path.exists(path):
+                # Deleted between the stat and the read
+                self.remove(path)
+                return None
+            content_hash = ""
+            error = str(e)
+
+        if not force and stored and content_hash and stored[2] == content_hash:
+            self.connection.execute(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                (st.st_size, st.st_mtime_ns, path)
+            )
+            return False
+
+        if error is None:
+            try:
+                usages = list(self.parser(path))
+            except (OSError, HipFormatError) as e:
+                error = str(e)
+
+        with self.connection:
+            self.connection.execute("DELETE FROM usages WHERE path = ?", (path,))
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash, scanned_at, error) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, st.st_size, st.st_mtime_ns, content_hash, time.time(), error)
+            )
+            self.connection.executemany(
+                "INSERT INTO usages (path, hda, namespace, name, version, depth, node_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(path, u.hda, u.namespace, u.name, u.version, u.depth, u.node_path) for u in usages]
+            )
+        return True
+
+    def remove(self, path: str) -> None:
+        """Drop a file and its usages from the index."""
+        with self.connection:
+            self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def update(self, hip_files: Iterable[str], prune_root: str = None, force: bool = False) -> IndexStats:
+        """
+        Index a batch of scene files, skipping the ones that did not change.
+
+        Args:
+            hip_files (Iterable[str]): Scene paths; may be a lazy generator
+            prune_root (str): If given, indexed files under this directory
+                that were not in ``hip_files`` are treated as deleted
+            force (bool): Re-parse everything
+
+        Returns:
+            IndexStats: Counts of scanned, unchanged, removed and failed files
+        """
+        scanned = unchanged = failed = 0
+        seen = set()
+        for path in hip_files:
+            seen.add(path)
+            changed = self.index_file(path, force=force)
+            if changed:
+                scanned += 1
+                if self.connection.execute(
+                        "SELECT error FROM files WHERE path = ?", (path,)).fetchone()[0]:
+                    failed += 1
+            elif changed is False:
+                unchanged += 1
+        self.connection.commit()
+
+        removed = 0
+        if prune_root is not None:
+            prefix = os.path.join(prune_root, "")
+            stale = [
+                path for (path,) in self.connection.execute("SELECT path FROM files")
+                if path.startswith(prefix) and path not in seen
+            ]
+            with self.connection:
+                self.connection.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in stale])
+            removed = len(stale)
+
+        return IndexStats(scanned, unchanged, removed, failed)
+
+    # ─── Queries ────────────────────────────────────────────────────
+
+    def files_using(self, hda: str) -> List[str]:
+        """Scene files that contain at least one node of the given HDA type."""
+        return [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT path FROM usages WHERE hda = ? ORDER BY path", (hda,)
+        )]
+
+    def files_using_any_version(self, namespace: str, name: str) -> List[Tuple[str, str]]:
+        """``(path, version)`` pairs for every version of ``namespace::name``."""
+        return self.connection.execute(
+            "SELECT DISTINCT path, version FROM usages WHERE namespace = ? AND name = ? "
+            "ORDER BY path, version", (namespace, name)
+        ).fetchall()
+
+    def usage_pairs(self) -> List[Tuple[str, str]]:
+        """Distinct ``(path, hda)`` pairs, e.g. for ``dependency_graph.build_graph``."""
+        return self.connection.execute("SELECT DISTINCT path, hda FROM usages").fetchall()
+
+    def hdas_in(self, path: str) -> List[Tuple[str, int, str]]:
+        """``(hda, depth, node_path)`` rows recorded for one scene file."""
+        return self.connection.execute(
+            "SELECT hda, depth, node_path FROM usages WHERE path = ? ORDER BY node_path", (path,)
+        ).fetchall()
+
+    def hda_counts(self) -> List[Tuple[str, int]]:
+        """Every HDA type in the index with the number of scenes using it."""
+        return self.connection.execute(
+            "SELECT hda, COUNT(DISTINCT path) FROM usages GROUP BY hda ORDER BY hda"
+        ).fetchall()
+
+    def failed_files(self) -> List[Tuple[str, str]]:
+        """``(path, error)`` for files that could not be parsed."""
+        return self.connection.execute(
+            "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"
+        ).fetchall()
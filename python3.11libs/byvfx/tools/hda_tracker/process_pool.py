@@ -0,0 +1,238 @@
+"""
+Process pool of headless hython workers for the HDA tracker.
+
+The hou module holds a single global scene per process, so loading .hip
+files from several threads either serializes or clobbers the loaded
+scene. This pool runs N separate hython processes instead; each one loads
+its share of the scenes and streams rows back over a pipe. A worker that
+crashes or exceeds the per-file timeout is killed and replaced, and only
+that file is reported as failed.
+"""
+
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from typing import Iterable, Iterator, List, Optional
+
+FileResult = namedtuple("FileResult", ["hip_path", "rows", "error", "elapsed"])
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hython_worker.py")
+# python3.11libs, so workers can import byvfx regardless of how they are launched
+LIBS_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Must match hython_worker.PROTOCOL_PREFIX (the worker module imports hou)
+PROTOCOL_PREFIX = "@@HDA "
+
+_EOF = object()
+_THREAD_DONE = object()
+
+
+def find_hython() -> Optional[str]:
+    """
+    Locate the hython executable.
+
+    Returns:
+        Optional[str]: ``$HFS/bin/hython`` if it exists, otherwise whatever
+        ``hython`` resolves to on PATH, or None
+    """
+    hfs = os.environ.get("HFS")
+    if hfs:
+        for name in ("hython", "hython.exe"):
+            candidate = os.path.join(hfs, "bin", name)
+            if os.path.isfile(candidate):
+                return candidate
+    return shutil.which("hython")
+
+
+class HythonWorkerError(Exception):
+    """Raised when a hython worker cannot be started."""
+
+
+class _HythonProcess:
+    """One hython child process plus a thread pumping its stdout into a queue."""
+
+    def __init__(self, command: List[str], env: dict, startup_timeout: float):
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            text=True,
+            bufsize=1,
+        )
+        self.messages = queue.Queue()
+        self.files_done = 0
+        threading.Thread(target=self._pump, daemon=True).start()
+
+        kind, _ = self._next_message(time.monotonic() + startup_timeout)
+        if kind != "ready":
+            self.kill()
+            raise HythonWorkerError(f"hython worker failed to start ({kind})")
+
+    def _pump(self) -> None:
+        for line in self.proc.stdout:
+            if line.startswith(PROTOCOL_PREFIX):
+                try:
+                    self.messages.put(json.loads(line[len(PROTOCOL_PREFIX):]))
+                except ValueError:
+                    continue
+        self.messages.put(_EOF)
+
+    def _next_message(self, deadline: float):
+        try:
+            message = self.messages.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            return "timeout", None
+        if message is _EOF:
+            return "crashed", None
+        return message
+
+    def run(self, hip_path: str, timeout: float) -> FileResult:
+        """Scan one file; on timeout or crash the process is left dead."""
+        start = time.monotonic()
+        deadline = start + timeout
+        rows = []
+        try:
+            self.proc.stdin.write(hip_path + "\n")
+            self.proc.stdin.flush()
+        except OSError:
+            return FileResult(hip_path, [], "worker crashed", 0.0)
+
+        while True:
+            kind, payload = self._next_message(deadline)
+            if kind == "row":
+                rows.append(tuple(payload))
+            elif kind == "done":
+                self.files_done += 1
+                return FileResult(hip_path, rows, payload, time.monotonic() - start)
+            elif kind == "timeout":
+                self.kill()
+                return FileResult(hip_path, [], f"timed out after {timeout}s", time.monotonic() - start)
+            else:
+                self.proc.wait()
+                return FileResult(hip_path, [], f"worker crashed (exit code {self.proc.returncode})",
+                                  time.monotonic() - start)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self) -> None:
+        try:
+            self.proc.kill()
+            self.proc.wait()
+        except OSError:
+            pass
+
+
+class HythonPool:
+    """
+    Scan .hip files in parallel with N hython worker processes.
+
+    Args:
+        workers (int): Number of hython processes (default: CPU count)
+        timeout (float): Seconds allowed per file before the worker is killed
+        hython (str): Path to hython (default: ``find_hython()``)
+        startup_timeout (float): Seconds allowed for a worker to import hou
+        max_files_per_worker (int): Recycle a worker after this many files
+            to keep memory growth in check; 0 disables recycling
+
+    Example:
+        >>> pool = HythonPool(workers=8, timeout=300)
+        >>> for result in pool.scan(hip_files):
+        ...     print(result.hip_path, len(result.rows), result.error)
+    """
+
+    def __init__(self, workers: int = None, timeout: float = 600.0, hython: str = None,
+                 startup_timeout: float = 300.0, max_files_per_worker: int = 200):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.hython = hython or find_hython()
+        self.startup_timeout = startup_timeout
+        self.max_files_per_worker = max_files_per_worker
+        if not self.hython:
+            raise HythonWorkerError("Could not find hython; set $HFS or pass hython=")
+
+    def _environment(self) -> dict:
+        env = dict(os.environ)
+        python_path = env.get("PYTHONPATH")
+        env["PYTHONPATH"] = LIBS_ROOT + (os.pathsep + python_path if python_path else "")
+        return env
+
+    def _spawn(self) -> _HythonProcess:
+        return _HythonProcess([self.hython, WORKER_SCRIPT], self._environment(), self.startup_timeout)
+
+    def _worker_loop(self, jobs: queue.Queue, results: queue.Queue) -> None:
+        process = None
+        try:
+            while True:
+                hip_path = jobs.get()
+                if hip_path is None:
+                    break
+
+                if process is None or not process.alive:
+                    try:
+                        process = self._spawn()
+                    except (OSError, HythonWorkerError) as e:
+                        process = None
+                        results.put(FileResult(hip_path, [], str(e), 0.0))
+                        continue
+
+                results.put(process.run(hip_path, self.timeout))
+
+                if not process.alive:
+                    process = None
+                elif self.max_files_per_worker and process.files_done >= self.max_files_per_worker:
+                    process.close()
+                    process = None
+        finally:
+            if process is not None:
+                process.close()
+            results.put(_THREAD_DONE)
+
+    def scan(self, hip_files: Iterable[str]) -> Iterator[FileResult]:
+        """
+        Scan files and yield one result per file as soon as it finishes.
+
+        Args:
+            hip_files (Iterable[str]): Scene paths; may be a lazy generator
+
+        Yields:
+            FileResult: ``rows`` holds ``(hip, hda, version, depth, node_path)``
+            tuples; ``error`` is None on success
+        """
+        jobs = queue.Queue(maxsize=self.workers * 4)
+        results = queue.Queue()
+
+        def feed():
+            try:
+                for hip_path in hip_files:
+                    jobs.put(hip_path)
+            finally:
+                for _ in range(self.workers):
+                    jobs.put(None)
+
+        threading.Thread(target=feed, daemon=True).start()
+        for _ in range(self.workers):
+            threading.Thread(target=self._worker_loop, args=(jobs, results), daemon=True).start()
+
+        running = self.workers
+        while running:
+            result = results.get()
+            if result is _THREAD_DONE:
+                running -= 1
+                continue
+            yield result
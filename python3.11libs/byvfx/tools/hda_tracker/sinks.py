@@ -0,0 +1,289 @@
+"""
+Streaming output sinks for HDA tracker rows.
+
+Rows are written as they are produced instead of being collected in
+memory and dumped at the end, so a crash late in a long scan keeps
+everything written so far. Each sink also records which scene files were
+completed (the resume marker); reopening a sink with ``resume=True``
+appends to the existing output and reports those files through
+``completed_files()`` so the scan can skip them. Rows written after the
+last completed file (a scene interrupted half way) are dropped on resume,
+so no scene is written twice.
+
+Example:
+    >>> with open_sink("hdas.csv", resume=True) as sink:
+    ...     done = sink.completed_files()
+    ...     for hip_path in hip_files:
+    ...         if hip_path in done:
+    ...             continue
+    ...         try:
+    ...             rows = read_hd_asset_rows(hip_path)
+    ...         except (OSError, HipFormatError):
+    ...             continue  # not marked done; a resumed run retries it
+    ...         sink.write_rows(hip_path, rows)
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import time
+from typing import Iterable, Sequence, Set
+
+DEFAULT_HEADER = ("HIP File", "HDA", "Depth")
+
+
+class RowSink:
+    """
+    Base class for tracker output sinks.
+
+    Subclasses implement ``_write(rows)``, ``_flush()`` and, for their
+    resume marker, ``_mark_done(hip_path)`` and ``_load_completed()``.
+
+    Args:
+        path (str): Output file
+        header (Sequence[str]): Column names
+        resume (bool): Continue an existing output instead of replacing it
+        flush_rows (int): Flush after this many buffered rows
+        flush_seconds (float): Flush at least this often while writing
+    """
+
+    def __init__(self, path: str, header: Sequence[str] = DEFAULT_HEADER, resume: bool = False,
+                 flush_rows: int = 1000, flush_seconds: float = 5.0):
+        self.path = path
+        self.header = tuple(header)
+        self.resume = resume and os.path.exists(path)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.rows_written = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._completed = self._load_completed() if self.resume else set()
+
+    # ─── Public API ─────────────────────────────────────────────────
+
+    def completed_files(self) -> Set[str]:
+        """Scene files fully written by this or a previous run."""
+        return set(self._completed)
+
+    def write_rows(self, hip_path: str, rows: Iterable[Sequence]) -> None:
+        """Write all rows of one scene and mark the scene as completed."""
+        rows = [tuple(row) for row in rows]
+        if rows:
+            self._write(rows)
+        self._mark_done(hip_path)
+        self._completed.add(hip_path)
+        self.rows_written += len(rows)
+        self._pending += len(rows) + 1
+        if self._pending >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        self._flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ─── Subclass hooks ─────────────────────────────────────────────
+
+    def _write(self, rows):
+        raise NotImplementedError
+
+    def _flush(self):
+        raise NotImplementedError
+
+    def _mark_done(self, hip_path):
+        raise NotImplementedError
+
+    def _load_completed(self) -> Set[str]:
+        raise NotImplementedError
+
+
+class _MarkerFileMixin:
+    """
+    Resume marker kept next to a text output as ``<output>.done``.
+
+    Each line is ``<offset>\t<hip_path>``: the size of the output once the
+    scene's rows were written. On resume the output is truncated to the
+    last offset that is both marked and on disk.
+    """
+
+    def _marker_path(self) -> str:
+        return self.path + ".done"
+
+    def _open_marker(self):
+        self._marker = open(self._marker_path(), "a" if self.resume else "w", encoding="utf-8")
+
+    def _mark_done(self, hip_path):
+        self._marker.write(f"{self._file.tell()}\t{hip_path}\n")
+
+    def _load_completed(self) -> Set[str]:
+        entries = []
+        try:
+            with open(self._marker_path(), "r", encoding="utf-8") as f:
+                for line in f:
+                    offset, _, hip_path = line.rstrip("\n").partition("\t")
+                    if not line.endswith("\n") or not offset.isdigit() or not hip_path:
+                        continue
+                    entries.append((int(offset), hip_path))
+        except FileNotFoundError:
+            pass
+
+        # The marker may be ahead of the output after a power loss
+        size = os.path.getsize(self.path)
+        entries = [(offset, hip_path) for offset, hip_path in entries if offset <= size]
+        if not entries:
+            # Nothing usable to continue from: start over
+            self.resume = False
+            return set()
+
+        self._resume_offset = max(offset for offset, _ in entries)
+        with open(self._marker_path(), "w", encoding="utf-8") as f:
+            f.writelines(f"{offset}\t{hip_path}\n" for offset, hip_path in entries)
+        return {hip_path for _, hip_path in entries}
+
+    def _open_output(self, **kwargs):
+        if self.resume:
+            # Drop rows of a scene that was interrupted before its marker
+            os.truncate(self.path, self._resume_offset)
+        return open(self.path, "a" if self.resume else "w", encoding="utf-8", **kwargs)
+
+    def _flush_marker(self):
+        # Rows must reach disk before the marker claims the file is done
+        self._marker.flush()
+        os.fsync(self._marker.fileno())
+
+
+class CsvSink(_MarkerFileMixin, RowSink):
+    """Append rows to a CSV file."""
+
+    def __init__(self, path: str, **kwargs):
+        super(CsvSink, self).__init__(path, **kwargs)
+        self._file = self._open_output(newline="")
+        self._writer = csv.writer(self._file)
+        if not self.resume:
+            self._writer.writerow(self.header)
+        self._open_marker()
+
+    def _write(self, rows):
+        self._writer.writerows(rows)
+
+    def _flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._flush_marker()
+
+    def close(self):
+        super(CsvSink, self).close()
+        self._file.close()
+        self._marker.close()
+
+
+class JsonlSink(_MarkerFileMixin, RowSink):
+    """Append rows to a JSON Lines file, one object per row keyed by header."""
+
+    def __init__(self, path: str, **kwargs):
+        super(JsonlSink, self).__init__(path, **kwargs)
+        self._file = self._open_output()
+        self._open_marker()
+
+    def _write(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(dict(zip(self.header, row))) + "\n")
+
+    def _flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._flush_marker()
+
+    def close(self):
+        super(JsonlSink, self).close()
+        self._file.close()
+        self._marker.close()
+
+
+class SqliteSink(RowSink):
+    """
+    Insert rows into a SQLite table, batching them into transactions.
+
+    The resume marker lives in the same database (``completed`` table) and
+    is committed in the same transaction as the rows it covers.
+    """
+
+    def __init__(self, path: str, table: str = "hdas", **kwargs):
+        self.table = table
+        self._connection = sqlite3.connect(path)
+        super(SqliteSink, self).__init__(path, **kwargs)
+        self.columns = [self._column_name(name) for name in self.header]
+        if not self.resume:
+            self._connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+            self._connection.execute("DROP TABLE IF EXISTS completed")
+        self._connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(self.columns)})'
+        )
+        self._connection.execute("CREATE TABLE IF NOT EXISTS completed (hip_path TEXT PRIMARY KEY)")
+        self._connection.commit()
+        self._insert = (
+            f'INSERT INTO "{table}" ({", ".join(self.columns)}) '
+            f'VALUES ({", ".join("?" * len(self.columns))})'
+        )
+
+    @staticmethod
+    def _column_name(name: str) -> str:
+        return '"' + name.lower().replace(" ", "_").replace('"', "") + '"'
+
+    def _write(self, rows):
+        self._connection.executemany(self._insert, rows)
+
+    def _flush(self):
+        self._connection.commit()
+
+    def _mark_done(self, hip_path):
+        self._connection.execute("INSERT OR REPLACE INTO completed (hip_path) VALUES (?)", (hip_path,))
+
+    def _load_completed(self) -> Set[str]:
+        try:
+            return {row[0] for row in self._connection.execute("SELECT hip_path FROM completed")}
+        except sqlite3.OperationalError:
+            return set()
+
+    def close(self):
+        super(SqliteSink, self).close()
+        self._connection.close()
+
+
+SINK_TYPES = {
+    ".csv": CsvSink,
+    ".jsonl": JsonlSink,
+    ".sqlite": SqliteSink,
+    ".db": SqliteSink,
+}
+
+
+def open_sink(path: str, **kwargs) -> RowSink:
+    """
+    Open the sink matching an output file's extension.
+
+    Args:
+        path (str): Output file ending in .csv, .jsonl, .sqlite or .db
+        **kwargs: Passed to the sink (header, resume, flush_rows, ...)
+
+    Returns:
+        RowSink: The opened sink
+
+    Raises:
+        ValueError: If the extension is not supported
+    """
+    extension = os.path.splitext(path)[1].lower()
+    sink_type = SINK_TYPES.get(extension)
+    if sink_type is None:
+        raise ValueError(f"Unsupported output format: {extension}")
+    return sink_type(path, **kwargs)
@@ -0,0 +1,115 @@
+"""
+Scene traversal for gathering HDA usage inside a live hou session.
+
+``iter_hda_nodes`` walks the node tree with an explicit stack, so deep
+networks cannot hit Python's recursion limit, and looks up each
+``hou.NodeType``'s definition only once per traversal. When only the
+presence of HDAs matters (not depth), ``hda_instances`` skips the tree
+walk entirely and asks each loaded definition's node type for its
+instances.
+"""
+
+import hou
+from typing import Dict, Iterator, Optional, Tuple
+
+# Definition lookups keyed by hou.NodeType: (hda_name, version) or None
+DefinitionMemo = Dict[hou.NodeType, Optional[Tuple[str, str]]]
+
+
+def _lookup_definition(node_type: hou.NodeType, memo: DefinitionMemo) -> Optional[Tuple[str, str]]:
+    try:
+        return memo[node_type]
+    except KeyError:
+        pass
+    definition = node_type.definition()
+    if definition is None:
+        result = None
+    else:
+        hda_name = definition.nodeTypeName()
+        result = (hda_name, hou.hda.componentsFromFullNodeTypeName(hda_name)[3])
+    memo[node_type] = result
+    return result
+
+
+def iter_hda_nodes(root: hou.Node = None,
+                   memo: DefinitionMemo = None) -> Iterator[Tuple[hou.Node, str, str, int]]:
+    """
+    Yield every node whose type is defined by an HDA, depth-first.
+
+    Args:
+        root (hou.Node): Where to start (default ``/``); depth is relative to it
+        memo (DefinitionMemo): Definition cache to share between calls on
+            the same scene; do not reuse it after loading another scene
+
+    Yields:
+        Tuple[hou.Node, str, str, int]: ``(node, hda_name, version, depth)``
+    """
+    if memo is None:
+        memo = {}
+    stack = [(root or hou.node("/"), 0)]
+    while stack:
+        node, depth = stack.pop()
+        found = _lookup_definition(node.type(), memo)
+        if found is not None:
+            yield node, found[0], found[1], depth
+
+        try:
+            children = node.children()
+        except hou.PermissionError:
+            print(f"PermissionError: Skipped node - {node.path()}")
+            continue
+        # Reversed so children come off the stack in their natural order
+        stack.extend((child, depth + 1) for child in reversed(children))
+
+
+def gather_hda_rows(hip_path: str = None, memo: DefinitionMemo = None):
+    """
+    Collect ``(hip, hda, version, depth, node_path)`` rows for the current scene.
+
+    Args:
+        hip_path (str): Scene to load first; None uses the scene already open
+        memo (DefinitionMemo): Shared definition cache
+
+    Returns:
+        list: One row per HDA node
+    """
+    if hip_path is not None:
+        hou.hipFile.load(hip_path, suppress_save_prompt=True, ignore_load_warnings=True)
+    else:
+        hip_path = hou.hipFile.path()
+    return [
+        (hip_path, hda_name, version, depth, node.path())
+        for node, hda_name, version, depth in iter_hda_nodes(memo=memo)
+    ]
+
+
+def hda_instances() -> Iterator[Tuple[str, hou.Node]]:
+    """
+    Yield ``(hda_name, node)`` for every HDA instance, without walking the tree.
+
+    Goes through ``hou.hda.loadedFiles()`` (plus embedded definitions) and
+    ``NodeType.instances()``, so cost scales with the number of loaded
+    definitions rather than the number of nodes. No depth information.
+    """
+    seen = set()
+    for library in list(hou.hda.loadedFiles()) + ["Embedded"]:
+        try:
+            definitions = hou.hda.definitionsInFile(library)
+        except hou.OperationFailed:
+            continue
+        for definition in definitions:
+            node_type = definition.nodeType()
+            if node_type is None or node_type in seen:
+                continue
+            seen.add(node_type)
+            hda_name = definition.nodeTypeName()
+            for node in node_type.instances():
+                yield hda_name, node
+
+
+def hdas_present() -> Dict[str, int]:
+    """Instance count per HDA type in the current scene (fast path)."""
+    counts = {}
+    for hda_name, _ in hda_instances():
+        counts[hda_name] = counts.get(hda_name, 0) + 1
+    return counts
@@ -0,0 +1,332 @@
+"""
+Watch-mode HDA indexer driven by Linux inotify.
+
+``HdaIndexDaemon`` brings the SQLite index up to date once, then watches
+every directory under the show root with inotify. Saves, renames and
+deletes of scene files are collected and debounced (Houdini and sync
+tools often touch a file several times in a row) and only those files are
+re-indexed, usually within a couple of seconds of the save.
+
+The live index can be queried over a local Unix socket with one JSON
+request per line (see ``query_daemon``), or read directly: the index runs
+in WAL mode, so other processes can open the SQLite file while the
+daemon writes to it.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import json
+import os
+import select
+import socket
+import sqlite3
+import struct
+import threading
+import time
+from typing import Dict, Optional
+
+from .crawler import BACKUP_DIR_NAMES, BACKUP_FILE_PATTERNS, crawl_hip_files
+from .hip_reader import HIP_EXTENSIONS, HipFormatError
+from .index import HdaIndex
+
+# inotify flags, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyError(OSError):
+    """Raised when inotify is unavailable or a watch cannot be added."""
+
+
+class Inotify:
+    """Thin ctypes wrapper around the Linux inotify API."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise InotifyError("libc not found; inotify requires Linux")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise InotifyError("inotify is not available on this platform")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise InotifyError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise InotifyError(err, os.strerror(err), path)
+        return wd
+
+    def read_events(self, timeout: float):
+        """Return ``(wd, mask, cookie, name)`` tuples, waiting up to ``timeout``."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, cookie, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class HdaIndexDaemon:
+    """
+    Long-running indexer that keeps an ``HdaIndex`` current for a show root.
+
+    Args:
+        root_directory (str): Show root to watch
+        index_path (str): SQLite index file
+        socket_path (str): Unix socket for queries; None disables it
+        debounce (float): Seconds a file must stay quiet before re-indexing
+        skip_backups (bool): Ignore backup folders and autosave files
+
+    Example:
+        >>> daemon = HdaIndexDaemon("/shows/bunny", "hda_index.sqlite", "/tmp/hda_index.sock")
+        >>> daemon.serve_forever()
+    """
+
+    def __init__(self, root_directory: str, index_path: str, socket_path: Optional[str] = None,
+                 debounce: float = 2.0, skip_backups: bool = True):
+        self.root_directory = os.path.abspath(root_directory)
+        self.index = HdaIndex(index_path)
+        self.socket_path = socket_path
+        self.debounce = debounce
+        self.skip_backups = skip_backups
+
+        self.lock = threading.Lock()
+        self.inotify = Inotify()
+        self.watches: Dict[int, str] = {}
+        self.pending: Dict[str, float] = {}
+        self.rescan_needed = False
+        self.last_update = None
+        self._stop = threading.Event()
+        self._server = None
+
+    # ─── Filtering and watches ──────────────────────────────────────
+
+    def _is_scene(self, path: str) -> bool:
+        if not path.lower().endswith(HIP_EXTENSIONS):
+            return False
+        if self.skip_backups:
+            parts = path.lower().split(os.sep)
+            if any(part in BACKUP_DIR_NAMES for part in parts[:-1]):
+                return False
+            if any(fnmatch.fnmatch(parts[-1], p) for p in BACKUP_FILE_PATTERNS):
+                return False
+        return True
+
+    def _watch_tree(self, top: str) -> None:
+        for dirpath, dirnames, _ in os.walk(top):
+            if self.skip_backups:
+                dirnames[:] = [d for d in dirnames if d.lower() not in BACKUP_DIR_NAMES]
+            try:
+                self.watches[self.inotify.add_watch(dirpath, WATCH_MASK)] = dirpath
+            except InotifyError as e:
+                if e.errno == errno.ENOSPC:
+                    print("inotify watch limit reached; raise fs.inotify.max_user_watches")
+                    return
+                print("Error watching directory:", dirpath, str(e))
+
+    def _full_rescan(self) -> None:
+        with self.lock:
+            stats = self.index.update(crawl_hip_files(self.root_directory, skip_backups=self.skip_backups),
+                                      prune_root=self.root_directory)
+            self.last_update = time.time()
+        print(f"Full rescan: {stats.scanned} re-parsed, {stats.unchanged} unchanged, "
+              f"{stats.removed} removed, {stats.failed} failed")
+
+    # ─── Event handling ─────────────────────────────────────────────
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            self.rescan_needed = True
+            return
+        directory = self.watches.get(wd)
+        if directory is None:
+            return
+        if mask & IN_IGNORED:
+            del self.watches[wd]
+            return
+
+        path = os.path.join(directory, name) if name else directory
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                if self.skip_backups and name.lower() in BACKUP_DIR_NAMES:
+                    return
+                # A directory that appeared (or moved in) may already hold scenes
+                self._watch_tree(path)
+                for hip_path in crawl_hip_files(path, skip_backups=self.skip_backups):
+                    self.pending[hip_path] = time.monotonic()
+            elif mask & IN_MOVED_FROM:
+                self.rescan_needed = True
+            return
+
+        if self._is_scene(path):
+            self.pending[path] = time.monotonic()
+
+    def _flush_pending(self) -> None:
+        now = time.monotonic()
+        ready = [path for path, stamp in self.pending.items() if now - stamp >= self.debounce]
+        if not ready:
+            return
+        with self.lock:
+            for path in ready:
+                del self.pending[path]
+                try:
+                    result = self.index.index_file(path)
+                except (OSError, ValueError, sqlite3.Error, HipFormatError) as e:
+                    # One bad scene must not stop the daemon
+                    print("Error indexing file:", path, str(e))
+                    continue
+                state = {True: "re-indexed", False: "unchanged", None: "removed"}[result]
+                print(f"{state}: {path}")
+            self.index.connection.commit()
+            self.last_update = time.time()
+
+    # ─── Query server ───────────────────────────────────────────────
+
+    def handle_query(self, request: dict):
+        """Answer one query dict; see ``query_daemon`` for the request format."""
+        query = request.get("query")
+        with self.lock:
+            if query == "files_using":
+                return self.index.files_using(request["hda"])
+            if query == "files_using_any_version":
+                return self.index.files_using_any_version(request["namespace"], request["name"])
+            if query == "hdas_in":
+                return self.index.hdas_in(request["path"])
+            if query == "hda_counts":
+                return self.index.hda_counts()
+            if query == "status":
+                return {
+                    "root": self.root_directory,
+                    "watched_directories": len(self.watches),
+                    "pending_files": len(self.pending),
+                    "last_update": self.last_update,
+                }
+        raise ValueError(f"Unknown query: {query}")
+
+    def _serve_client(self, connection: socket.socket) -> None:
+        with connection, connection.makefile("rwb") as stream:
+            for line in stream:
+                try:
+                    response = {"result": self.handle_query(json.loads(line))}
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"error": str(e)}
+                stream.write(json.dumps(response).encode() + b"\n")
+                stream.flush()
+
+    def _serve_socket(self) -> None:
+        while not self._stop.is_set():
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve_client, args=(connection,), daemon=True).start()
+
+    def _start_server(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        self._server.listen(16)
+        threading.Thread(target=self._serve_socket, daemon=True).start()
+
+    # ─── Main loop ──────────────────────────────────────────────────
+
+    def serve_forever(self) -> None:
+        """Index, watch and answer queries until ``stop()`` or Ctrl+C."""
+        self._watch_tree(self.root_directory)
+        self._full_rescan()
+        if self.socket_path:
+            self._start_server()
+        print(f"Watching {len(self.watches)} directories under {self.root_directory}")
+
+        try:
+            while not self._stop.is_set():
+                for wd, mask, _, name in self.inotify.read_events(timeout=min(self.debounce, 1.0)):
+                    self._handle_event(wd, mask, name)
+                if self.rescan_needed:
+                    self.rescan_needed = False
+                    self.pending.clear()
+                    self._watch_tree(self.root_directory)
+                    self._full_rescan()
+                self._flush_pending()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self._server = None
+        self.inotify.close()
+        self.index.close()
+
+
+def query_daemon(socket_path: str, query: str, timeout: float = 10.0, **params):
+    """
+    Send one query to a running ``HdaIndexDaemon``.
+
+    Args:
+        socket_path (str): The daemon's Unix socket
+        query (str): ``files_using``, ``files_using_any_version``,
+            ``hdas_in``, ``hda_counts`` or ``status``
+        timeout (float): Socket timeout in seconds
+        **params: Query arguments, e.g. ``hda="sidefx::labs::foo::2.0"``
+
+    Returns:
+        The query result (decoded JSON)
+
+    Raises:
+        RuntimeError: If the daemon reports an error
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(dict(params, query=query)).encode() + b"\n")
+            stream.flush()
+            response = json.loads(stream.readline())
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["result"]
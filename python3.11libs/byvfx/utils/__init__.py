@@ -1,2 +1,15 @@
 # byvfx/utils/__init__.py
-from . import splitABC_groups, splitABC_path, mass_merger, color_anim_nodes, vex_snippet_manager, multi_import
\ No newline at end of file
+"""
+Houdini utilities. Submodules are imported on first access: most of them
+need hou and PySide2, and the headless ones (camdb_client, camdb_cache, ...)
+must stay cheap to import from batch scripts and plain Python.
+"""
+import importlib
+
+__all__ = ['splitABC_groups', 'splitABC_path', 'mass_merger', 'color_anim_nodes', 'vex_snippet_manager', 'multi_import']
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,12 @@
 from PySide2 import QtWidgets, QtCore
 import hou
-import urllib.request
 import urllib.error
-import json
-import gzip
 import traceback # Keep import here, use conditionally
+from byvfx.utils.camdb_catalog import CameraCatalog, normalize_name
+from byvfx.utils.camdb_client import CamDBClient, normalize_sensor_response, sensors_endpoint
+from byvfx.utils.camdb_prefetch import SensorPrefetcher
+from byvfx.utils.camdb_rigs import create_camera_node, create_camera_rigs, read_manifest, resolve_rig_requests
+from byvfx.utils.camdb_snapshot import load_studio_snapshot
 
 # ┌──────────────────────────────────────────────────────────────────────────┐
 # │ GLOBAL DEBUG FLAG                                                        │
@@ -20,6 +22,284 @@ def debug_log(*args, **kwargs):
 # Keep a module-level reference so Python doesn't garbage-collect the window
 camdb_win = None
 
+# Delay between the last keystroke and refiltering the camera list
+SEARCH_DEBOUNCE_MS = 200
+# Best fuzzy matches listed while searching; scrolling to the end of the
+# list fetches this many more
+SEARCH_RESULT_LIMIT = 50
+
+# Item data role holding a camera's row id in the CameraCatalog
+CATALOG_ROW_ROLE = QtCore.Qt.UserRole + 1
+
+# Status suffix per response source (see camdb_cache.CachedResponse)
+SOURCE_LABELS = {
+    "network": "",
+    "revalidated": " (unchanged since last load)",
+    "cache": " (cached)",
+    "stale": " (cached copy - CamDB unreachable)",
+    "snapshot": " (studio snapshot)",
+}
+
+class CamDBRequestSignals(QtCore.QObject):
+    """Signals of a CamDBRequest; QRunnable itself cannot emit"""
+    finished = QtCore.Signal(int, object, str)  # request id, data, source
+    failed = QtCore.Signal(int, str)            # request id, error message
+
+
+def build_catalog(data):
+    """Camera list -> CameraCatalog with its fuzzy index (run on a worker thread)"""
+    return CameraCatalog(data if isinstance(data, list) else [], build_fuzzy=True)
+
+
+class CamDBRequest(QtCore.QRunnable):
+    """
+    Fetch and decode one endpoint on a QThreadPool worker.
+
+    Results come back through ``signals`` on the main thread. A cancelled
+    request still finishes its HTTP call (bounded by the transport's
+    timeouts) but its result is dropped instead of emitted.
+    """
+
+    def __init__(self, request_id, client, endpoint, transform=None):
+        super(CamDBRequest, self).__init__()
+        self.request_id = request_id
+        self.client = client
+        self.endpoint = endpoint
+        self.transform = transform
+        self.cancelled = False
+        self.signals = CamDBRequestSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            debug_log(f"Requesting: {self.endpoint}")
+            response = self.client.fetch_all(self.endpoint)
+            data = self.transform(response.data) if self.transform else response.data
+        except urllib.error.HTTPError as http_err:
+            error_msg = f"HTTP {http_err.code}: {http_err.reason}"
+            try:
+                error_msg += f"\nResponse: {http_err.read().decode('utf-8')}"
+            except Exception:
+                pass # Ignore if reading body fails
+            debug_log(f"HTTP Error for {self.endpoint}: {error_msg}")
+            if not self.cancelled:
+                self.signals.failed.emit(self.request_id, error_msg)
+            return
+        except Exception as e:
+            debug_log(f"Error for {self.endpoint}: {e}")
+            if DEBUG_MODE:
+                traceback.print_exc()
+            if not self.cancelled:
+                self.signals.failed.emit(self.request_id, f"API request failed: {e}")
+            return
+
+        if not self.cancelled:
+            self.signals.finished.emit(self.request_id, data, response.source)
+
+
+class SnapshotLoadSignals(QtCore.QObject):
+    """Signals of a SnapshotLoadTask"""
+    finished = QtCore.Signal(object, object)  # Snapshot, CameraCatalog
+
+
+class SnapshotLoadTask(QtCore.QRunnable):
+    """Read the studio snapshot and index its cameras on a QThreadPool worker"""
+
+    def __init__(self):
+        super(SnapshotLoadTask, self).__init__()
+        self.cancelled = False
+        self.signals = SnapshotLoadSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        snapshot = load_studio_snapshot()
+        if snapshot is None or self.cancelled:
+            return
+        catalog = build_catalog(snapshot.cameras)
+        if not self.cancelled:
+            self.signals.finished.emit(snapshot, catalog)
+
+
+class CameraListModel(QtCore.QAbstractListModel):
+    """
+    Camera list backed by a CameraCatalog.
+
+    Filtering is done by the catalog's set index rather than a
+    QSortFilterProxyModel, whose filterAcceptsRow would be a Python call per
+    camera. The model only holds the matching row ids; display text is built
+    in data(), so only the rows the view actually paints are materialized.
+    With search text the rows are the catalog's ranked fuzzy matches, best
+    first, SEARCH_RESULT_LIMIT at a time: the view calls fetchMore when it
+    is scrolled to the end. Without search text they are in catalog order.
+    """
+
+    def __init__(self, parent=None):
+        super(CameraListModel, self).__init__(parent)
+        self.catalog = CameraCatalog([])
+        self.rows = []
+        self._positions = {}
+        self._filter = (None, None, "")
+        self._limit = SEARCH_RESULT_LIMIT
+        self._has_more = False
+
+    def _set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self._positions = {row: position for position, row in enumerate(rows)}
+        self.endResetModel()
+
+    def _query(self):
+        make, cam_type, text = self._filter
+        rows = self.catalog.ranked(make=make, cam_type=cam_type, text=text, limit=self._limit)
+        # Only searches are cut at the limit; a full page may have more behind it
+        self._has_more = bool(normalize_name(text)) and len(rows) >= self._limit
+        return rows
+
+    def set_catalog(self, catalog):
+        self.catalog = catalog
+        self._filter = (None, None, "")
+        self._has_more = False
+        self._set_rows(list(range(len(catalog))))
+
+    def set_filter(self, make=None, cam_type=None, text=""):
+        """Apply a filter; returns False if the visible rows did not change"""
+        self._filter = (make, cam_type, text)
+        self._limit = SEARCH_RESULT_LIMIT
+        rows = self._query()
+        if rows == self.rows:
+            return False
+        self._set_rows(rows)
+        return True
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and self._has_more
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        """Append the next page of search matches below the ones already listed"""
+        if parent.isValid() or not self._has_more:
+            return
+        self._limit += SEARCH_RESULT_LIMIT
+        # A larger search can reorder the top matches; keep the listed rows
+        # where they are and append the new ones in rank order
+        new_rows = [row for row in self._query() if row not in self._positions]
+        if not new_rows:
+            self._has_more = False
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(new_rows) - 1)
+        self.rows.extend(new_rows)
+        for position, row in enumerate(new_rows, start=first):
+            self._positions[row] = position
+        self.endInsertRows()
+
+    def index_of(self, catalog_row):
+        """Model index of a catalog row, invalid if it is filtered out"""
+        position = self._positions.get(catalog_row)
+        if position is None:
+            return QtCore.QModelIndex()
+        return self.index(position, 0)
+
+    def cameras(self):
+        """Iterate over the visible camera dicts"""
+        return (self.catalog.cameras[row] for row in self.rows)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            camera = self.catalog.cameras[self.rows[index.row()]]
+            return f"{camera.get('make', 'Unknown')} - {camera.get('name', 'Unknown')}"
+        if role == QtCore.Qt.UserRole:
+            return self.catalog.cameras[self.rows[index.row()]]
+        if role == CATALOG_ROW_ROLE:
+            return self.rows[index.row()]
+        return None
+
+
+class SensorPrefetchSignals(QtCore.QObject):
+    """Signals of a SensorPrefetchTask"""
+    progress = QtCore.Signal(int, int)        # done, total
+    finished = QtCore.Signal(object, object)  # sensors by camera id, errors by camera id
+
+
+class SensorPrefetchTask(QtCore.QRunnable):
+    """Run SensorPrefetcher.prefetch on a QThreadPool worker"""
+
+    def __init__(self, prefetcher, camera_ids):
+        super(SensorPrefetchTask, self).__init__()
+        self.prefetcher = prefetcher
+        self.camera_ids = camera_ids
+        self.cancelled = False
+        self.signals = SensorPrefetchSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def report_progress(self, done, total):
+        if not self.cancelled:
+            self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            sensors, errors = self.prefetcher.prefetch(
+                self.camera_ids,
+                progress=self.report_progress,
+                cancelled=lambda: self.cancelled,
+            )
+        except Exception as e:
+            debug_log(f"Sensor prefetch failed: {e}")
+            if DEBUG_MODE:
+                traceback.print_exc()
+            sensors, errors = self.prefetcher.sensors, {None: str(e)}
+        if not self.cancelled:
+            self.signals.finished.emit(sensors, errors)
+
+
+class RigResolveSignals(QtCore.QObject):
+    """Signals of a RigResolveTask"""
+    finished = QtCore.Signal(object)  # ResolvedRigs
+    failed = QtCore.Signal(str)       # error message
+
+
+class RigResolveTask(QtCore.QRunnable):
+    """
+    Read a camera manifest and look up its cameras and sensors on a
+    QThreadPool worker; the nodes are created on the main thread.
+    """
+
+    def __init__(self, csv_path, client, catalog=None, sensors=None):
+        super(RigResolveTask, self).__init__()
+        self.csv_path = csv_path
+        self.client = client
+        self.catalog = catalog
+        self.sensors = sensors
+        self.cancelled = False
+        self.signals = RigResolveSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            resolved = resolve_rig_requests(read_manifest(self.csv_path), self.client, self.catalog, self.sensors)
+        except Exception as e:
+            debug_log(f"Resolving manifest failed: {e}")
+            if DEBUG_MODE:
+                traceback.print_exc()
+            if not self.cancelled:
+                self.signals.failed.emit(str(e))
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(resolved)
+
+
 class CamDBPanel(QtWidgets.QWidget):
     def __init__(self, parent=None):
         super(CamDBPanel, self).__init__(parent)
@@ -28,9 +308,30 @@ class CamDBPanel(QtWidgets.QWidget):
         
         # Store camera data
         self.camera_data = []
-        self.filtered_cameras = []
         self.selected_camera = None
         self.sensor_data = []
+        self.catalog = CameraCatalog([])
+        self.selected_row = None
+        
+        # API client with the shared on-disk response cache
+        # (TTL, offline mode: byvfx.config.defaults)
+        self.client = CamDBClient()
+        self.cache = self.client.cache
+        self.last_source = "network"
+        
+        # Network and JSON decoding run on worker threads; only the newest
+        # request of each kind is allowed to update the panel
+        self.thread_pool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(4)
+        self._request_counter = 0
+        self._camera_request = None
+        self._sensor_request = None
+        self._snapshot_task = None
+        
+        # Sensors keyed by camera id, filled by "Prefetch Sensors"
+        self.prefetcher = SensorPrefetcher(self.cache)
+        self._prefetch_task = None
+        self._batch_task = None
         
         # ─── Layout ─────────────────────────────────────────────────
         main_layout = QtWidgets.QVBoxLayout(self)
@@ -41,6 +342,15 @@ class CamDBPanel(QtWidgets.QWidget):
         self.load_all_button.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; padding: 8px; }")
         load_layout.addWidget(self.load_all_button)
         
+        self.prefetch_button = QtWidgets.QPushButton("Prefetch Sensors")
+        self.prefetch_button.setToolTip("Load sensor data for every listed camera in the background")
+        self.prefetch_button.setEnabled(False)
+        load_layout.addWidget(self.prefetch_button)
+        
+        self.offline_check = QtWidgets.QCheckBox("Offline (cached data only)")
+        self.offline_check.setChecked(self.cache.offline)
+        load_layout.addWidget(self.offline_check)
+        
         self.status_label = QtWidgets.QLabel("Click 'Load All Cameras' to start")
         load_layout.addWidget(self.status_label)
         load_layout.addStretch()
@@ -69,7 +379,7 @@ class CamDBPanel(QtWidgets.QWidget):
         search_layout = QtWidgets.QVBoxLayout()
         search_layout.addWidget(QtWidgets.QLabel("Search Name:"))
         self.search_edit = QtWidgets.QLineEdit()
-        self.search_edit.setPlaceholderText("Search camera names...")
+        self.search_edit.setPlaceholderText("Search make or model...")
         search_layout.addWidget(self.search_edit)
         filter_layout.addLayout(search_layout)
         
@@ -85,8 +395,11 @@ class CamDBPanel(QtWidgets.QWidget):
         left_layout = QtWidgets.QVBoxLayout(left_widget)
         left_layout.addWidget(QtWidgets.QLabel("Cameras:"))
         
-        self.camera_list = QtWidgets.QListWidget()
+        self.camera_model = CameraListModel(self)
+        self.camera_list = QtWidgets.QListView()
+        self.camera_list.setModel(self.camera_model)
         self.camera_list.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.camera_list.setUniformItemSizes(True) # Lets the view skip measuring every row
         left_layout.addWidget(self.camera_list)
         
         splitter.addWidget(left_widget)
@@ -125,90 +438,133 @@ class CamDBPanel(QtWidgets.QWidget):
         self.create_camera_button.setEnabled(False)
         right_layout.addWidget(self.create_camera_button)
         
+        # Batch creation from a shot manifest
+        self.batch_create_button = QtWidgets.QPushButton("Batch Create Cameras from CSV...")
+        self.batch_create_button.setToolTip("CSV columns: make, model, mode (optional), node_name (optional)")
+        right_layout.addWidget(self.batch_create_button)
+        
         splitter.addWidget(right_widget)
         splitter.setSizes([300, 500])
         
         # ─── Signals ────────────────────────────────────────────────
         self.load_all_button.clicked.connect(self.load_all_cameras)
+        self.offline_check.toggled.connect(self.set_offline)
+        self.prefetch_button.clicked.connect(self.prefetch_sensors)
         self.make_combo.currentTextChanged.connect(self.filter_cameras)
         self.type_combo.currentTextChanged.connect(self.filter_cameras)
-        self.search_edit.textChanged.connect(self.filter_cameras)
-        self.camera_list.currentItemChanged.connect(self.on_camera_selected)
+        # Typing restarts the timer, so a burst of keystrokes refilters once
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_cameras)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.camera_list.selectionModel().currentChanged.connect(self.on_camera_selected)
         self.load_sensors_button.clicked.connect(self.load_sensor_data)
         self.sensor_list.currentItemChanged.connect(self.on_sensor_selected)
         self.create_camera_button.clicked.connect(self.create_houdini_camera)
-
-    def api_request(self, endpoint):
-        """Make API request with proper headers"""
-        url = f"https://camdb.matchmovemachine.com{endpoint}"
+        self.batch_create_button.clicked.connect(self.batch_create_cameras)
         
-        try:
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-            req.add_header('Accept', 'application/json, text/plain, */*')
-            req.add_header('Accept-Language', 'en-US,en;q=0.9')
-            req.add_header('Connection', 'keep-alive')
-            
-            with urllib.request.urlopen(req) as response:
-                raw_data = response.read()
-                
-                # Handle compression
-                content_encoding = response.info().get('Content-Encoding', '').lower()
-                if content_encoding == 'gzip':
-                    raw_data = gzip.decompress(raw_data)
-                elif content_encoding == 'deflate':
-                    import zlib
-                    raw_data = zlib.decompress(raw_data)
-                
-                encoding = response.info().get_content_charset("utf-8")
-                text_data = raw_data.decode(encoding)
-                return json.loads(text_data)
-                
-        except Exception as e:
-            raise Exception(f"API request failed: {e}")
+        # Start from the shared studio snapshot if there is one; the load
+        # button then only refreshes from the API
+        self.load_snapshot()
+
+    def load_snapshot(self):
+        """Read and index the studio snapshot (BYVFX_CAMDB_SNAPSHOT) on the thread pool"""
+        self._snapshot_task = SnapshotLoadTask()
+        self._snapshot_task.signals.finished.connect(self.on_snapshot_loaded)
+        self.thread_pool.start(self._snapshot_task)
+
+    def on_snapshot_loaded(self, snapshot, catalog):
+        """Populate cameras and sensors from the snapshot unless CamDB answered first"""
+        self._snapshot_task = None
+        self.client.snapshot = snapshot
+        self.prefetcher.sensors.update(snapshot.sensors)
+        if self.camera_data:
+            return
+        self.show_cameras(catalog, "snapshot")
+        self.load_all_button.setText("Refresh Cameras from CamDB")
+        self.status_label.setText(f"Loaded {len(self.camera_data)} cameras from studio snapshot {snapshot.version}")
+
+    def update_stats_tooltip(self):
+        """Show the transport's request/latency counters on the status label"""
+        stats = self.cache.transport.stats.snapshot()
+        lines = [
+            f"CamDB circuit: {self.cache.transport.breaker.state}",
+            f"Requests: {stats['requests']} (retries {stats['retries']}, failures {stats['failures']}, "
+            f"timeouts {stats['timeouts']}, short-circuited {stats['short_circuits']})",
+        ]
+        if 'latency_p50_ms' in stats:
+            lines.append(f"Latency p50/p95: {stats['latency_p50_ms']:.0f} / {stats['latency_p95_ms']:.0f} ms")
+        self.status_label.setToolTip("\n".join(lines))
+
+    def set_offline(self, offline):
+        """Toggle cache-only mode"""
+        self.cache.offline = offline
+
+    def start_request(self, endpoint, on_finished, on_failed, transform=None):
+        """Run an endpoint request on the thread pool and return it"""
+        self._request_counter += 1
+        request = CamDBRequest(self._request_counter, self.client, endpoint, transform)
+        request.signals.finished.connect(on_finished)
+        request.signals.failed.connect(on_failed)
+        self.thread_pool.start(request)
+        return request
+
+    def cancel_sensor_request(self):
+        """Drop the in-flight sensor request, if any"""
+        if self._sensor_request is not None:
+            self._sensor_request.cancel()
+            self._sensor_request = None
+            self.status_label.setText("Sensor loading cancelled")
 
     def load_all_cameras(self):
-        """Load all cameras from the API"""
+        """Load all cameras from the API without blocking the UI"""
         self.status_label.setText("Loading cameras...")
         self.load_all_button.setEnabled(False)
-        
-        try:
-            # Load cameras
-            data = self.api_request("/cameras/")
-            self.camera_data = data if isinstance(data, list) else []
-            
-            # Populate filter dropdowns
-            makes = set()
-            types = set()
-            
-            for camera in self.camera_data:
-                if camera.get('make'):
-                    makes.add(camera['make'])
-                if camera.get('cam_type'):
-                    types.add(camera['cam_type'])
-            
-            # Update make combo
-            self.make_combo.clear()
-            self.make_combo.addItem("All Makes")
-            for make in sorted(makes):
-                self.make_combo.addItem(make)
-            
-            # Update type combo
-            self.type_combo.clear()
-            self.type_combo.addItem("All Types")
-            for cam_type in sorted(types):
-                self.type_combo.addItem(cam_type)
-            
-            # Filter and display cameras
-            self.filter_cameras()
-            
-            self.status_label.setText(f"Loaded {len(self.camera_data)} cameras")
-            
-        except Exception as e:
-            self.status_label.setText(f"Error loading cameras: {e}")
-        
-        finally:
-            self.load_all_button.setEnabled(True)
+        self._camera_request = self.start_request("/cameras/", self.on_cameras_loaded, self.on_cameras_failed,
+                                                  transform=build_catalog)
+
+    def on_cameras_loaded(self, request_id, catalog, source):
+        """Populate the panel once the camera list arrives"""
+        if self._camera_request is None or request_id != self._camera_request.request_id:
+            return
+        self._camera_request = None
+        self.load_all_button.setEnabled(True)
+        self.show_cameras(catalog, source)
+
+    def show_cameras(self, catalog, source):
+        """Show a catalog from build_catalog: filters and list"""
+        self.last_source = source
+        self.catalog = catalog
+        self.camera_data = catalog.cameras
+        self.camera_model.set_catalog(self.catalog)
+        self.camera_list.clearSelection()
+        self.on_camera_selected(QtCore.QModelIndex(), QtCore.QModelIndex())
+        
+        # Repopulate the combos without refiltering on every addItem
+        for combo, label, values in ((self.make_combo, "All Makes", self.catalog.makes),
+                                     (self.type_combo, "All Types", self.catalog.types)):
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(label)
+            for value in values:
+                combo.addItem(value)
+            combo.blockSignals(False)
+        
+        # Filter and display cameras
+        self.filter_cameras()
+        self.prefetch_button.setEnabled(bool(self.camera_data))
+        
+        self.status_label.setText(f"Loaded {len(self.camera_data)} cameras{SOURCE_LABELS[source]}")
+        self.update_stats_tooltip()
+
+    def on_cameras_failed(self, request_id, error_msg):
+        if self._camera_request is None or request_id != self._camera_request.request_id:
+            return
+        self._camera_request = None
+        self.load_all_button.setEnabled(True)
+        self.status_label.setText(f"Error loading cameras: {error_msg.splitlines()[0]}")
+        self.update_stats_tooltip()
 
     def filter_cameras(self):
         """Filter cameras based on selected criteria"""
@@ -217,39 +573,33 @@ class CamDBPanel(QtWidgets.QWidget):
         
         selected_make = self.make_combo.currentText()
         selected_type = self.type_combo.currentText()
-        search_text = self.search_edit.text().lower()
-        
-        self.filtered_cameras = []
         
-        for camera in self.camera_data:
-            # Filter by make
-            if selected_make != "All Makes" and camera.get('make') != selected_make:
-                continue
-            
-            # Filter by type
-            if selected_type != "All Types" and camera.get('cam_type') != selected_type:
-                continue
-            
-            # Filter by search text
-            if search_text and search_text not in camera.get('name', '').lower():
-                continue
-            
-            self.filtered_cameras.append(camera)
-        
-        # Update camera list
-        self.camera_list.clear()
-        for camera in self.filtered_cameras:
-            name = camera.get('name', 'Unknown')
-            make = camera.get('make', 'Unknown')
-            item_text = f"{make} - {name}"
-            item = QtWidgets.QListWidgetItem(item_text)
-            item.setData(QtCore.Qt.UserRole, camera)
-            self.camera_list.addItem(item)
+        changed = self.camera_model.set_filter(
+            make=None if selected_make == "All Makes" else selected_make,
+            cam_type=None if selected_type == "All Types" else selected_type,
+            text=self.search_edit.text(),
+        )
+        if not changed:
+            return # Same result (e.g. a trailing space); keep the list as is
+        
+        # A model reset drops the current index; restore it if the camera is still listed
+        index = self.camera_model.index_of(self.selected_row)
+        if index.isValid():
+            self.camera_list.selectionModel().blockSignals(True)
+            self.camera_list.setCurrentIndex(index)
+            self.camera_list.selectionModel().blockSignals(False)
+            self.camera_list.scrollTo(index)
+        elif self.selected_row is not None:
+            self.on_camera_selected(QtCore.QModelIndex(), QtCore.QModelIndex())
 
     def on_camera_selected(self, current, previous):
         """Handle camera selection"""
-        if current:
+        # Sensors requested for the previous camera are no longer wanted
+        self.cancel_sensor_request()
+        
+        if current.isValid():
             self.selected_camera = current.data(QtCore.Qt.UserRole)
+            self.selected_row = current.data(CATALOG_ROW_ROLE)
             
             # Display camera info
             info = f"ID: {self.selected_camera.get('id', 'N/A')}\n"
@@ -266,11 +616,12 @@ class CamDBPanel(QtWidgets.QWidget):
             self.create_camera_button.setEnabled(False)
         else:
             self.selected_camera = None
+            self.selected_row = None
             self.camera_info.clear()
             self.load_sensors_button.setEnabled(False)
 
     def load_sensor_data(self):
-        """Load sensor data for the selected camera"""
+        """Load sensor data for the selected camera without blocking the UI"""
         if not self.selected_camera:
             return
         
@@ -278,79 +629,97 @@ class CamDBPanel(QtWidgets.QWidget):
         if not camera_id:
             return
         
+        self.cancel_sensor_request()
+        
+        prefetched = self.prefetcher.get(camera_id)
+        if prefetched is not None:
+            self.show_sensors(prefetched, "cache")
+            return
+        
         self.status_label.setText("Loading sensor data...")
         self.load_sensors_button.setEnabled(False)
+        self._sensor_request = self.start_request(
+            sensors_endpoint(camera_id), self.on_sensors_loaded, self.on_sensors_failed,
+            transform=normalize_sensor_response
+        )
 
-        try:
-            endpoint = f"/cameras/{camera_id}/sensors/"
-            debug_log(f"Requesting: {endpoint}")
-            
-            data = self.api_request(endpoint)
-            
-            debug_log(f"Raw sensor response: {data}")
-            
-            # Handle different response formats
-            if isinstance(data, dict):
-                if 'sensors' in data:
-                    self.sensor_data = data['sensors']
-                elif 'data' in data:
-                    self.sensor_data = data['data']
-                elif 'results' in data:
-                    self.sensor_data = data['results']
-                else:
-                    self.sensor_data = [data] # Might be a single sensor object
-            elif isinstance(data, list):
-                self.sensor_data = data
-            else:
-                self.sensor_data = []
-            
-            debug_log(f"Processed sensor data: {self.sensor_data}")
-            
-            self.sensor_list.clear()
-            
-            if not self.sensor_data:
-                item = QtWidgets.QListWidgetItem("No sensor data available")
-                self.sensor_list.addItem(item)
-                self.status_label.setText("No sensor configurations found")
-                return
-            
-            for i, sensor in enumerate(self.sensor_data):
-                debug_log(f"Processing sensor {i}: {sensor}")
-                
-                mode = sensor.get('mode_name', f'Mode {i+1}')
-                res_w = sensor.get('res_width', 'N/A')
-                res_h = sensor.get('res_height', 'N/A')
-                sensor_w = sensor.get('sensor_width', 'N/A')
-                sensor_h = sensor.get('sensor_height', 'N/A')
-                
-                res = f"{res_w}x{res_h}"
-                sensor_size = f"{sensor_w}x{sensor_h}mm"
-                
-                item_text = f"{mode} - {res} ({sensor_size})"
-                item = QtWidgets.QListWidgetItem(item_text)
-                item.setData(QtCore.Qt.UserRole, sensor)
-                self.sensor_list.addItem(item)
+    def on_sensors_loaded(self, request_id, sensors, source):
+        """Fill the sensor list once the selected camera's sensors arrive"""
+        if self._sensor_request is None or request_id != self._sensor_request.request_id:
+            return
+        self._sensor_request = None
+        self.load_sensors_button.setEnabled(True)
+        self.show_sensors(sensors, source)
+
+    def show_sensors(self, sensors, source):
+        """Fill the sensor list"""
+        self.last_source = source
+        self.sensor_data = sensors
+        debug_log(f"Processed sensor data: {self.sensor_data}")
+        
+        self.sensor_list.clear()
+        
+        if not self.sensor_data:
+            item = QtWidgets.QListWidgetItem("No sensor data available")
+            self.sensor_list.addItem(item)
+            self.status_label.setText("No sensor configurations found")
+            return
+        
+        for i, sensor in enumerate(self.sensor_data):
+            debug_log(f"Processing sensor {i}: {sensor}")
             
-            self.status_label.setText(f"Loaded {len(self.sensor_data)} sensor configurations")
+            mode = sensor.get('mode_name', f'Mode {i+1}')
+            res_w = sensor.get('res_width', 'N/A')
+            res_h = sensor.get('res_height', 'N/A')
+            sensor_w = sensor.get('sensor_width', 'N/A')
+            sensor_h = sensor.get('sensor_height', 'N/A')
             
-        except urllib.error.HTTPError as http_err:
-            error_msg = f"HTTP {http_err.code}: {http_err.reason}"
-            try:
-                error_body = http_err.read().decode('utf-8')
-                error_msg += f"\nResponse: {error_body}"
-            except:
-                pass # Ignore if reading body fails
-            self.status_label.setText(f"HTTP Error: {error_msg.splitlines()[0]}") # Show first line in status
-            debug_log(f"HTTP Error loading sensors: {error_msg}")
+            res = f"{res_w}x{res_h}"
+            sensor_size = f"{sensor_w}x{sensor_h}mm"
             
-        except Exception as e:
-            self.status_label.setText(f"Error loading sensors: {e}")
-            debug_log(f"Error loading sensors: {e}")
-            if DEBUG_MODE:
-                traceback.print_exc()
+            item_text = f"{mode} - {res} ({sensor_size})"
+            item = QtWidgets.QListWidgetItem(item_text)
+            item.setData(QtCore.Qt.UserRole, sensor)
+            self.sensor_list.addItem(item)
         
-        finally:
-            self.load_sensors_button.setEnabled(True)
+        self.status_label.setText(f"Loaded {len(self.sensor_data)} sensor configurations{SOURCE_LABELS[source]}")
+        self.update_stats_tooltip()
+
+    def on_sensors_failed(self, request_id, error_msg):
+        if self._sensor_request is None or request_id != self._sensor_request.request_id:
+            return
+        self._sensor_request = None
+        self.load_sensors_button.setEnabled(True)
+        if error_msg.startswith("HTTP "):
+            self.status_label.setText(f"HTTP Error: {error_msg.splitlines()[0]}") # Show first line in status
+        else:
+            self.status_label.setText(f"Error loading sensors: {error_msg}")
+        self.update_stats_tooltip()
+
+    def prefetch_sensors(self):
+        """Load sensors for every listed camera over a few keep-alive connections"""
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+        camera_ids = [camera.get('id') for camera in self.camera_model.cameras()]
+        self.prefetch_button.setEnabled(False)
+        self.status_label.setText(f"Prefetching sensors for {len(camera_ids)} cameras...")
+        
+        self._prefetch_task = SensorPrefetchTask(self.prefetcher, camera_ids)
+        self._prefetch_task.signals.progress.connect(self.on_prefetch_progress)
+        self._prefetch_task.signals.finished.connect(self.on_prefetch_finished)
+        self.thread_pool.start(self._prefetch_task)
+
+    def on_prefetch_progress(self, done, total):
+        self.status_label.setText(f"Prefetching sensors... {done}/{total}")
+
+    def on_prefetch_finished(self, sensors, errors):
+        self._prefetch_task = None
+        self.prefetch_button.setEnabled(True)
+        status = f"Prefetched sensors for {len(sensors)} cameras"
+        if errors:
+            status += f" ({len(errors)} failed)"
+            debug_log(f"Prefetch errors: {errors}")
+        self.status_label.setText(status)
 
     def on_sensor_selected(self, current, previous):
         """Handle sensor selection"""
@@ -392,55 +761,7 @@ class CamDBPanel(QtWidgets.QWidget):
             return
         
         try:
-            obj = hou.node("/obj")
-            
-            camera_make = self.selected_camera.get('make', 'UnknownCam')
-            camera_model_name = self.selected_camera.get('name', 'Model')
-            
-            # Sanitize names for Houdini nodes
-            sane_make = "".join(c if c.isalnum() else "_" for c in camera_make)
-            sane_model = "".join(c if c.isalnum() else "_" for c in camera_model_name)
-            
-            camera_name = f"{sane_make}_{sane_model}"
-            
-            cam_node = obj.createNode("cam", camera_name)
-            
-            res_w = sensor.get('res_width')
-            res_h = sensor.get('res_height')
-            sensor_w_mm = sensor.get('sensor_width')
-            format_aspect = sensor.get('format_aspect')
-
-            if res_w and res_h:
-                try:
-                    cam_node.parm("resx").set(int(res_w))
-                    cam_node.parm("resy").set(int(res_h))
-                except (ValueError, TypeError) as e:
-                    debug_log(f"Could not set resolution {res_w}x{res_h}: {e}")
-
-
-            if sensor_w_mm:
-                try:
-                    aperture_inches = float(sensor_w_mm) / 25.4
-                    cam_node.parm("aperture").set(aperture_inches)
-                except (ValueError, TypeError) as e:
-                    debug_log(f"Could not set aperture {sensor_w_mm}mm: {e}")
-            
-            if format_aspect:
-                try:
-                    aspect = float(format_aspect)
-                    cam_node.parm("aspect").set(aspect)
-                except (ValueError, TypeError) as e:
-                    debug_log(f"Could not set aspect ratio {format_aspect}: {e}")
-            
-            comment = f"CamDB Camera: {self.selected_camera.get('make')} {self.selected_camera.get('name')}\n"
-            comment += f"Mode: {sensor.get('mode_name', 'N/A')}\n"
-            comment += f"Sensor: {sensor.get('sensor_width','N/A')}x{sensor.get('sensor_height','N/A')}mm\n"
-            comment += f"Resolution: {res_w or 'N/A'}x{res_h or 'N/A'}"
-            
-            cam_node.setComment(comment)
-            cam_node.setGenericFlag(hou.nodeFlag.DisplayComment, True)
-            
-            cam_node.parmTuple("t").set((0, 0, 5))
+            cam_node = create_camera_node(hou.node("/obj"), self.selected_camera, sensor)
             cam_node.moveToGoodPosition()
             
             self.status_label.setText(f"Created camera: {cam_node.name()}")
@@ -460,6 +781,73 @@ class CamDBPanel(QtWidgets.QWidget):
             if DEBUG_MODE:
                 traceback.print_exc()
 
+    def batch_create_cameras(self):
+        """Create cameras for every row of a CSV manifest in one undo step"""
+        csv_path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Select Camera Manifest", "", "CSV Files (*.csv);;All Files (*)"
+        )
+        if not csv_path:
+            return
+        
+        # Camera and sensor lookups run on the thread pool, starting from the
+        # catalog and sensors the panel already has
+        self.status_label.setText("Resolving cameras...")
+        self.batch_create_button.setEnabled(False)
+        catalog = self.catalog if self.camera_data else None
+        self._batch_task = RigResolveTask(csv_path, self.client, catalog, dict(self.prefetcher.sensors))
+        self._batch_task.signals.finished.connect(self.on_batch_resolved)
+        self._batch_task.signals.failed.connect(self.on_batch_failed)
+        self.thread_pool.start(self._batch_task)
+
+    def on_batch_resolved(self, resolved):
+        """Create the resolved cameras (hou calls stay on the main thread)"""
+        self._batch_task = None
+        self.batch_create_button.setEnabled(True)
+        self.status_label.setText("Building cameras...")
+        try:
+            result = create_camera_rigs(resolved)
+        except Exception as e:
+            hou.ui.displayMessage(f"Error creating cameras: {e}", severity=hou.severityType.Error)
+            self.status_label.setText(f"Error creating cameras: {e}")
+            if DEBUG_MODE:
+                traceback.print_exc()
+            return
+        
+        summary = f"Created {len(result.created)} cameras"
+        if result.failures:
+            summary += f", {len(result.failures)} rows failed"
+        self.status_label.setText(summary)
+        self.update_stats_tooltip()
+        hou.ui.displayMessage(
+            summary,
+            severity=hou.severityType.Warning if result.failures else hou.severityType.Message,
+            details="\n".join(f"{label}: {error}" for label, error in result.failures) or None,
+            title="CamDB Batch Create"
+        )
+
+    def on_batch_failed(self, error_msg):
+        self._batch_task = None
+        self.batch_create_button.setEnabled(True)
+        hou.ui.displayMessage(f"Error reading manifest: {error_msg}", severity=hou.severityType.Error)
+        self.status_label.setText(f"Error reading manifest: {error_msg}")
+
+    def closeEvent(self, event):
+        """Drop in-flight requests so no result lands on a closed panel"""
+        self.cancel_sensor_request()
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+        if self._camera_request is not None:
+            self._camera_request.cancel()
+            self._camera_request = None
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            self._batch_task = None
+        super(CamDBPanel, self).closeEvent(event)
+
 def show_camdb_floating():
     global camdb_win
     
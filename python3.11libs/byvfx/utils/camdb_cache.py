@@ -0,0 +1,210 @@
+"""
+Persistent on-disk cache for CamDB API responses.
+
+Responses are stored as one JSON file per endpoint under the user pref
+dir, together with the ``ETag``/``Last-Modified`` validators the server
+sent. A fresh entry (younger than the TTL) is returned without touching
+the network; a stale one is revalidated with a conditional request, so an
+unchanged camera list costs a ``304`` instead of a full download. In
+offline mode only the cache is used, and when the API is unreachable (or
+the transport's circuit breaker is open) a stale entry is served rather
+than failing.
+
+No Qt or hou imports, so this also works from plain Python and hython.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import zlib
+from collections import namedtuple
+from typing import Optional
+
+from byvfx.config import defaults
+from byvfx.utils.camdb_transport import CamDBTransport, shared_transport
+
+# data: decoded JSON; source: "network", "revalidated", "cache" or "stale"
+CachedResponse = namedtuple("CachedResponse", ["data", "source", "fetched_at"])
+
+
+class CacheMissError(LookupError):
+    """Raised in offline mode when an endpoint has never been cached."""
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def camdb_settings() -> dict:
+    """Resolve the CamDB settings from ``byvfx.config.defaults`` and the environment."""
+    return {
+        "base_url": os.environ.get("BYVFX_CAMDB_URL", defaults.CAMDB_BASE_URL).rstrip("/"),
+        "ttl": float(os.environ.get("BYVFX_CAMDB_CACHE_TTL", defaults.CAMDB_CACHE_TTL)),
+        "offline": _env_flag("BYVFX_CAMDB_OFFLINE", defaults.CAMDB_OFFLINE),
+        "cache_dir": os.environ.get("BYVFX_CAMDB_CACHE_DIR", defaults.CAMDB_CACHE_DIR),
+        "snapshot_path": os.environ.get("BYVFX_CAMDB_SNAPSHOT", defaults.CAMDB_SNAPSHOT_PATH),
+        "connect_timeout": float(os.environ.get("BYVFX_CAMDB_CONNECT_TIMEOUT", defaults.CAMDB_CONNECT_TIMEOUT)),
+        "read_timeout": float(os.environ.get("BYVFX_CAMDB_READ_TIMEOUT", defaults.CAMDB_READ_TIMEOUT)),
+        "retries": int(os.environ.get("BYVFX_CAMDB_RETRIES", defaults.CAMDB_RETRIES)),
+    }
+
+
+def default_cache_dir() -> str:
+    """``$HOUDINI_USER_PREF_DIR/camdb_cache``, or ``~/.byvfx/camdb_cache`` outside Houdini."""
+    pref_dir = os.environ.get("HOUDINI_USER_PREF_DIR")
+    if pref_dir:
+        return os.path.join(pref_dir, "camdb_cache")
+    return os.path.join(os.path.expanduser("~"), ".byvfx", "camdb_cache")
+
+
+def decode_response_body(raw_data: bytes, content_encoding: str = "", charset: str = "utf-8"):
+    """Decompress (gzip/deflate) and JSON-decode a response body."""
+    content_encoding = (content_encoding or "").lower()
+    if content_encoding == "gzip":
+        raw_data = gzip.decompress(raw_data)
+    elif content_encoding == "deflate":
+        raw_data = zlib.decompress(raw_data)
+    return json.loads(raw_data.decode(charset or "utf-8"))
+
+
+class CamDBCache:
+    """
+    Endpoint-keyed response cache with conditional revalidation.
+
+    Args:
+        cache_dir (str): Where entries are stored (default: user pref dir)
+        base_url (str): API root the endpoints are relative to
+        ttl (float): Seconds an entry is served without revalidation
+        offline (bool): Never touch the network; serve cached entries only
+        retries (int): Extra attempts for transient failures
+        timeout (float): Read timeout per attempt
+        connect_timeout (float): Connect timeout per attempt
+        transport (CamDBTransport): Transport to use; by default the one
+            shared by everything talking to ``base_url``
+
+    Example:
+        >>> cache = CamDBCache()
+        >>> cameras = cache.request("/cameras/").data
+    """
+
+    def __init__(self, cache_dir: str = None, base_url: str = None,
+                 ttl: float = None, offline: bool = None, retries: int = None,
+                 timeout: float = None, connect_timeout: float = None,
+                 transport: CamDBTransport = None):
+        settings = camdb_settings()
+        self.cache_dir = cache_dir or settings["cache_dir"] or default_cache_dir()
+        self.base_url = (base_url or settings["base_url"]).rstrip("/")
+        self.ttl = settings["ttl"] if ttl is None else ttl
+        self.offline = settings["offline"] if offline is None else offline
+        self.transport = transport or shared_transport(
+            self.base_url,
+            connect_timeout=settings["connect_timeout"] if connect_timeout is None else connect_timeout,
+            read_timeout=settings["read_timeout"] if timeout is None else timeout,
+            retries=settings["retries"] if retries is None else retries,
+        )
+
+    def _entry_path(self, endpoint: str) -> str:
+        key = hashlib.sha1((self.base_url + endpoint).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def load(self, endpoint: str) -> Optional[dict]:
+        """Return the stored entry for an endpoint, or None."""
+        try:
+            with open(self._entry_path(endpoint), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("endpoint") == endpoint else None
+
+    def store(self, endpoint: str, data, etag: str = None, last_modified: str = None) -> dict:
+        """Write an entry atomically, so concurrent panels never read half a file."""
+        entry = {
+            "endpoint": endpoint,
+            "base_url": self.base_url,
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "data": data,
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(endpoint)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def _conditional_headers(self, entry: Optional[dict]) -> dict:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def request(self, endpoint: str, force: bool = False, allow_stale: bool = True) -> CachedResponse:
+        """
+        Return an endpoint's JSON, from the cache where possible.
+
+        Args:
+            endpoint (str): API path, e.g. ``/cameras/``
+            force (bool): Revalidate even if the entry is still fresh
+            allow_stale (bool): Serve the cached entry when the API fails;
+                False raises the error instead
+
+        Returns:
+            CachedResponse: Data plus where it came from
+
+        Raises:
+            CacheMissError: Offline and the endpoint was never cached
+            urllib.error.HTTPError: Online, the API returned an error and nothing is cached
+            OSError: Online, the API was unreachable and nothing is cached
+        """
+        entry = self.load(endpoint)
+        if self.offline:
+            if entry is None:
+                raise CacheMissError(f"{endpoint} is not cached (offline mode)")
+            return CachedResponse(entry["data"], "cache", entry["fetched_at"])
+        if entry and not force and self.is_fresh(entry):
+            return CachedResponse(entry["data"], "cache", entry["fetched_at"])
+
+        try:
+            response = self.transport.get(endpoint, self._conditional_headers(entry))
+            if response.status == 304 and entry:
+                # Unchanged on the server: keep the data, restart the TTL
+                entry = self.store(endpoint, entry["data"],
+                                   response.headers.get("ETag") or entry.get("etag"),
+                                   response.headers.get("Last-Modified") or entry.get("last_modified"))
+                return CachedResponse(entry["data"], "revalidated", entry["fetched_at"])
+            data = decode_response_body(response.body, response.headers.get("Content-Encoding", ""),
+                                        response.headers.get_content_charset("utf-8"))
+        except urllib.error.HTTPError as e:
+            if entry and allow_stale and (e.code >= 500 or e.code == 429):
+                return CachedResponse(entry["data"], "stale", entry["fetched_at"])
+            raise
+        except (OSError, ValueError):
+            # Includes CircuitOpenError: fall back at once, no waiting on a dead host
+            if entry and allow_stale:
+                return CachedResponse(entry["data"], "stale", entry["fetched_at"])
+            raise
+
+        entry = self.store(endpoint, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return CachedResponse(data, "network", entry["fetched_at"])
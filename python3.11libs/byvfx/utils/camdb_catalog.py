@@ -0,0 +1,180 @@
+"""
+Indexed in-memory catalog of CamDB cameras.
+
+``CameraCatalog`` precomputes everything the panel filters on: make and
+type buckets, lowercase names and an n-gram index over the names. Each
+filter returns a set of row ids, so make/type/search combine by set
+intersection and a keystroke costs a handful of dict lookups instead of a
+pass over every camera. ``ranked`` adds typo- and spacing-tolerant search
+ordered by relevance (see camdb_fuzzy). No Qt or hou imports.
+"""
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from .camdb_fuzzy import FuzzyIndex
+
+# Longest n-gram indexed; queries up to this length are answered by one
+# lookup, longer ones by intersecting their n-grams and verifying
+NGRAM_SIZE = 3
+
+
+def normalize_name(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def iter_ngrams(text: str, size: int = NGRAM_SIZE) -> Iterable[str]:
+    """Every distinct substring of ``text`` with length 1 to ``size``."""
+    seen = set()
+    for n in range(1, size + 1):
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if gram not in seen:
+                seen.add(gram)
+                yield gram
+
+
+class CameraCatalog:
+    """
+    Bucketed and n-gram indexed view of a camera list.
+
+    Row ids are positions in ``cameras``; ``cameras_for`` turns a result
+    set back into camera dicts in their original order.
+
+    Args:
+        cameras (List[dict]): Camera records as returned by ``/cameras/``
+        build_fuzzy (bool): Build the fuzzy index now rather than on the
+            first ranked search; pass True when constructing off the UI thread
+
+    Example:
+        >>> catalog = CameraCatalog(cameras)
+        >>> ids = catalog.filter(make="ARRI", text="alexa")
+        >>> catalog.cameras_for(ids)
+    """
+
+    def __init__(self, cameras: List[dict], build_fuzzy: bool = False):
+        self.cameras = list(cameras)
+        self.all_ids: FrozenSet[int] = frozenset(range(len(self.cameras)))
+        self.names: List[str] = []
+        self.by_make: Dict[str, FrozenSet[int]] = defaultdict(set)
+        self.by_type: Dict[str, FrozenSet[int]] = defaultdict(set)
+        self.by_make_type: Dict[tuple, FrozenSet[int]] = defaultdict(set)
+        self.ngrams: Dict[str, FrozenSet[int]] = defaultdict(set)
+
+        for row, camera in enumerate(self.cameras):
+            name = normalize_name(camera.get('name', ''))
+            self.names.append(name)
+            if camera.get('make'):
+                self.by_make[camera['make']].add(row)
+            if camera.get('cam_type'):
+                self.by_type[camera['cam_type']].add(row)
+            self.by_make_type[(camera.get('make'), camera.get('cam_type'))].add(row)
+            for gram in iter_ngrams(name):
+                self.ngrams[gram].add(row)
+
+        # Frozen so filters can hand buckets out without copying
+        for index in (self.by_make, self.by_type, self.by_make_type, self.ngrams):
+            for key, rows in index.items():
+                index[key] = frozenset(rows)
+
+        # Last search, reused when the next query extends it (typing)
+        self._last_text = None
+        self._last_ids: FrozenSet[int] = self.all_ids
+        self._fuzzy: Optional[FuzzyIndex] = FuzzyIndex(self.cameras) if build_fuzzy else None
+
+    def __len__(self) -> int:
+        return len(self.cameras)
+
+    @property
+    def makes(self) -> List[str]:
+        return sorted(self.by_make)
+
+    @property
+    def types(self) -> List[str]:
+        return sorted(self.by_type)
+
+    @property
+    def fuzzy(self) -> FuzzyIndex:
+        """Fuzzy index over make and name, built on first use unless built up front."""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(self.cameras)
+        return self._fuzzy
+
+    def search(self, text: str) -> FrozenSet[int]:
+        """Rows whose name contains ``text`` (case-insensitive)."""
+        text = normalize_name(text)
+        if not text:
+            return self.all_ids
+        if text == self._last_text:
+            return self._last_ids
+
+        if len(text) <= NGRAM_SIZE:
+            ids = frozenset(self.ngrams.get(text, ()))
+        else:
+            if self._last_text and text.startswith(self._last_text):
+                candidates = self._last_ids
+            else:
+                grams = sorted((self.ngrams.get(text[i:i + NGRAM_SIZE], frozenset())
+                                for i in range(len(text) - NGRAM_SIZE + 1)), key=len)
+                candidates = grams[0].intersection(*grams[1:])
+            # n-grams can all be present without the whole query being contiguous
+            ids = frozenset(row for row in candidates if text in self.names[row])
+
+        self._last_text, self._last_ids = text, ids
+        return ids
+
+    def filter(self, make: Optional[str] = None, cam_type: Optional[str] = None,
+               text: str = "") -> FrozenSet[int]:
+        """
+        Combine make, type and name filters.
+
+        Args:
+            make (str): Exact make; None or empty for all
+            cam_type (str): Exact camera type; None or empty for all
+            text (str): Name substring
+
+        Returns:
+            FrozenSet[int]: Matching row ids
+        """
+        sets = []
+        if make and cam_type:
+            sets.append(self.by_make_type.get((make, cam_type), frozenset()))
+        elif make:
+            sets.append(self.by_make.get(make, frozenset()))
+        elif cam_type:
+            sets.append(self.by_type.get(cam_type, frozenset()))
+        if normalize_name(text):
+            sets.append(self.search(text))
+        if not sets:
+            return self.all_ids
+        if len(sets) == 1:
+            return frozenset(sets[0])
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def ranked(self, make: Optional[str] = None, cam_type: Optional[str] = None,
+               text: str = "", limit: int = 50) -> List[int]:
+        """
+        Fuzzy make/name search, best match first.
+
+        "alexa 35", "ALEXA35" and "arri alexa35" all find "ALEXA 35".
+        Without search text this is ``filter`` in catalog order.
+
+        Args:
+            make (str): Exact make; None or empty for all
+            cam_type (str): Exact camera type; None or empty for all
+            text (str): Free-text query
+            limit (int): Maximum results when searching
+
+        Returns:
+            List[int]: Matching row ids in rank order
+        """
+        allowed = self.filter(make=make, cam_type=cam_type)
+        if not normalize_name(text):
+            return sorted(allowed)
+        matches = self.fuzzy.search(text, limit, None if allowed is self.all_ids else allowed)
+        return [row for _, row in matches]
+
+    def cameras_for(self, ids: Iterable[int]) -> List[dict]:
+        """Camera dicts for row ids, in catalog order."""
+        return [self.cameras[row] for row in sorted(ids)]
@@ -0,0 +1,172 @@
+"""
+Headless CamDB API client.
+
+``CamDBClient`` holds everything the CamDB panel needs from the API
+without any Qt or hou import, so batch scripts, farm jobs and hython
+sessions can use it directly::
+
+    from byvfx.utils.camdb_client import CamDBClient
+
+    client = CamDBClient()
+    for camera in client.find_cameras(make="ARRI", text="alexa"):
+        print(camera["name"], client.sensors(camera["id"]))
+
+Responses go through ``CamDBCache`` (disk cache, ETag revalidation,
+offline mode, retries); paginated responses are followed to the end.
+"""
+
+import urllib.parse
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from byvfx.utils.camdb_cache import CachedResponse, CamDBCache
+from byvfx.utils.camdb_catalog import CameraCatalog
+
+# Guard against pagination loops from a misbehaving server
+MAX_PAGES = 1000
+
+# Best-to-worst freshness, used to report a combined source for paged results
+SOURCE_ORDER = ("network", "revalidated", "cache", "stale")
+
+
+def sensors_endpoint(camera_id) -> str:
+    return f"/cameras/{camera_id}/sensors/"
+
+
+def normalize_sensor_response(data) -> list:
+    """Handle the different sensor response formats; always returns a list"""
+    if isinstance(data, dict):
+        if 'sensors' in data:
+            return data['sensors']
+        elif 'data' in data:
+            return data['data']
+        elif 'results' in data:
+            return data['results']
+        return [data] # Might be a single sensor object
+    elif isinstance(data, list):
+        return data
+    return []
+
+
+def is_paginated(data) -> bool:
+    """DRF-style page: ``{"count", "next", "previous", "results"}``"""
+    return isinstance(data, dict) and "results" in data and "next" in data
+
+
+class CamDBClient:
+    """
+    Pure-Python client for the CamDB API.
+
+    Args:
+        cache (CamDBCache): Response cache to use; by default one under the
+            user pref dir, configured from ``byvfx.config.defaults``
+        snapshot (Snapshot): Studio snapshot (``camdb_snapshot``) answering
+            camera and sensor lookups without the API unless ``force`` is set
+        **cache_options: Passed to ``CamDBCache`` when ``cache`` is None
+            (``base_url``, ``ttl``, ``offline``, ``retries``, ``timeout``)
+
+    Example:
+        >>> client = CamDBClient(base_url="http://localhost:8000", offline=False)
+        >>> cameras = client.cameras()
+    """
+
+    def __init__(self, cache: CamDBCache = None, snapshot=None, **cache_options):
+        self.cache = cache or CamDBCache(**cache_options)
+        self.snapshot = snapshot
+        self._catalog = None
+
+    @property
+    def base_url(self) -> str:
+        return self.cache.base_url
+
+    def _endpoint_from_url(self, url: str) -> str:
+        """Turn a ``next`` link (absolute or relative) into an endpoint."""
+        if url.startswith(self.base_url):
+            return url[len(self.base_url):] or "/"
+        parts = urllib.parse.urlsplit(url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    # ─── Raw requests ───────────────────────────────────────────────
+
+    def fetch(self, endpoint: str, force: bool = False, allow_stale: bool = True) -> CachedResponse:
+        """One endpoint (one page), through the cache."""
+        return self.cache.request(endpoint, force=force, allow_stale=allow_stale)
+
+    def fetch_all(self, endpoint: str, force: bool = False, allow_stale: bool = True) -> CachedResponse:
+        """
+        Fetch an endpoint and follow its pagination.
+
+        Paginated responses are flattened into one list of results; anything
+        else is returned as the server sent it.
+
+        Returns:
+            CachedResponse: Combined data; ``source`` and ``fetched_at`` are
+            those of the stalest page
+        """
+        response = self.fetch(endpoint, force, allow_stale)
+        if not is_paginated(response.data):
+            return response
+
+        results = list(response.data["results"])
+        source, fetched_at = response.source, response.fetched_at
+        next_url = response.data["next"]
+        pages = 1
+        while next_url:
+            if pages >= MAX_PAGES:
+                raise RuntimeError(f"More than {MAX_PAGES} pages at {endpoint}")
+            page = self.fetch(self._endpoint_from_url(next_url), force, allow_stale)
+            if not is_paginated(page.data):
+                break
+            pages += 1
+            results.extend(page.data["results"])
+            next_url = page.data["next"]
+            source = max(source, page.source, key=SOURCE_ORDER.index)
+            fetched_at = min(fetched_at, page.fetched_at)
+        return CachedResponse(results, source, fetched_at)
+
+    # ─── Cameras and sensors ────────────────────────────────────────
+
+    def cameras(self, force: bool = False, allow_stale: bool = True) -> List[dict]:
+        """Every camera record."""
+        if self.snapshot is not None and not force:
+            cameras = self.snapshot.cameras
+        else:
+            data = self.fetch_all("/cameras/", force, allow_stale).data
+            cameras = data if isinstance(data, list) else []
+        self._catalog = CameraCatalog(cameras)
+        return cameras
+
+    def camera(self, camera_id) -> Optional[dict]:
+        """One camera record from the camera list, or None."""
+        for camera in self.catalog().cameras:
+            if camera.get('id') == camera_id:
+                return camera
+        return None
+
+    def sensors(self, camera_id, force: bool = False) -> List[dict]:
+        """Normalized sensor configurations of a camera."""
+        if self.snapshot is not None and not force and camera_id in self.snapshot.sensors:
+            return self.snapshot.sensors[camera_id]
+        return normalize_sensor_response(self.fetch_all(sensors_endpoint(camera_id), force).data)
+
+    def catalog(self) -> CameraCatalog:
+        """Indexed catalog of the camera list (fetched on first use)."""
+        if self._catalog is None:
+            self.cameras()
+        return self._catalog
+
+    def find_cameras(self, make: str = None, cam_type: str = None, text: str = "") -> List[dict]:
+        """Cameras matching a make, type and/or name substring."""
+        catalog = self.catalog()
+        return catalog.cameras_for(catalog.filter(make=make, cam_type=cam_type, text=text))
+
+    def prefetch_sensors(self, camera_ids: Iterable, connections: int = 4, force: bool = False,
+                         allow_stale: bool = True) -> Tuple[Dict, Dict]:
+        """
+        Load sensors for many cameras over pooled keep-alive connections.
+        ``force`` and ``allow_stale`` are as for ``SensorPrefetcher.prefetch``.
+
+        Returns:
+            Tuple[Dict, Dict]: ``(sensors by camera id, error message by camera id)``
+        """
+        from byvfx.utils.camdb_prefetch import SensorPrefetcher
+        return SensorPrefetcher(self.cache, connections).prefetch(camera_ids, force=force, allow_stale=allow_stale)
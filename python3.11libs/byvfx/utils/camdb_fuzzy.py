@@ -0,0 +1,319 @@
+"""
+Ranked fuzzy search over CamDB camera makes and names.
+
+Names are reduced to lowercase alphanumeric tokens, with letters and
+digits split apart, so "alexa 35", "ALEXA35" and "Alexa-35" all become
+``["alexa", "35"]``. Candidates come first from a token map: names
+with every query token as a whole token or token prefix, shortest
+first, then (for several query tokens) names with any one of them as a
+whole token. Only the remaining room is filled from a trigram index
+over the compacted ``make + name`` string (bigrams as a fallback for
+short or badly typo'd queries), by n-gram overlap. The shortlist is
+scored in detail:
+
+* whole-token matches score highest, then token prefixes, then tokens
+  within a small edit distance
+* the compacted query appearing in the compacted name, or starting it,
+  adds a bonus
+* n-gram overlap and a small length penalty break ties
+"""
+
+import bisect
+import heapq
+import itertools
+import re
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z]+|[0-9]+")
+
+# Candidates scored in detail per requested result
+CANDIDATES_PER_RESULT = 2
+# Token-map rows checked against the other query tokens per wanted candidate
+TOKEN_SCAN_PER_CANDIDATE = 20
+# Query tokens this short keep their expanded prefix rows between searches
+CACHED_PREFIX_LENGTH = 2
+# Sorts after every token starting with a given prefix
+PREFIX_END = "\uffff"
+# N-grams in more than this fraction of the names ("mki" in every "Mk II")
+# say little about a match and are skipped while rarer ones are available
+COMMON_GRAM_FRACTION = 0.05
+
+# Per-token match scores
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.85
+EDIT_SCORE = 0.7
+EDIT_STEP_PENALTY = 0.2
+# Matches scoring below this are dropped
+MIN_SCORE = 0.3
+
+
+def tokenize(text: str) -> List[str]:
+    """``"ALEXA Mini-LF 4.5K"`` -> ``["alexa", "mini", "lf", "4", "5", "k"]``"""
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def grams(text: str, n: int) -> List[str]:
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Levenshtein distance if it is at most ``limit``, else None.
+
+    Bit-parallel (Myers/Hyyrö): one column of the edit table per
+    character of ``b``, held as bit vectors of vertical +1/-1 steps, so
+    the short tokens compared here cost a few integer operations per
+    character instead of a Python loop per table cell.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if not a:
+        return len(b)
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | 1 << i
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    plus, minus = full, 0
+    distance = len(a)
+    for char in b:
+        equal = masks.get(char, 0)
+        vertical = equal | minus
+        horizontal = (((equal & plus) + plus) ^ plus) | equal
+        horizontal_plus = minus | (~(horizontal | plus) & full)
+        horizontal_minus = plus & horizontal
+        if horizontal_plus & last:
+            distance += 1
+        elif horizontal_minus & last:
+            distance -= 1
+        horizontal_plus = ((horizontal_plus << 1) | 1) & full
+        horizontal_minus = (horizontal_minus << 1) & full
+        plus = horizontal_minus | (~(vertical | horizontal_plus) & full)
+        minus = horizontal_plus & vertical
+    return distance if distance <= limit else None
+
+
+def _edit_limit(token: str) -> int:
+    if len(token) >= 8:
+        return 2
+    if len(token) >= 4:
+        return 1
+    return 0
+
+
+def token_match(query_token: str, token: str) -> float:
+    """Score of one query token against one name token."""
+    if token == query_token:
+        return EXACT_SCORE
+    if token.startswith(query_token):
+        return PREFIX_SCORE
+    limit = _edit_limit(query_token)
+    # Numbers are matched exactly or by prefix: "35" is not a typo of "65"
+    if limit and query_token.isalpha() and token.isalpha():
+        segment = token[:len(query_token) + limit]
+        # Each query letter missing from the segment costs an edit of its own
+        if len(set(query_token).difference(segment)) > limit:
+            return 0.0
+        distance = bounded_edit_distance(query_token, segment, limit)
+        if distance is not None:
+            return EDIT_SCORE - EDIT_STEP_PENALTY * distance
+    return 0.0
+
+
+class FuzzyIndex:
+    """
+    Trigram/bigram index over ``make + name`` for ranked fuzzy lookup.
+
+    Args:
+        cameras (List[dict]): Camera records; row ids are list positions
+    """
+
+    def __init__(self, cameras: List[dict]):
+        self.tokens: List[Tuple[str, ...]] = []
+        self.compact: List[str] = []
+        self.name_compact: List[str] = []
+        # " alexa 35": a query token starts a token if " " + token is in it
+        self.spaced: List[str] = []
+        self.trigrams: Dict[str, List[int]] = defaultdict(list)
+        self.bigrams: Dict[str, List[int]] = defaultdict(list)
+        self.initials: Dict[str, List[int]] = defaultdict(list)
+        # token -> ranks of the rows with that token; a row's rank is its
+        # position by compacted length, so merged lists put short names first
+        self.token_ranks: Dict[str, List[int]] = defaultdict(list)
+
+        for row, camera in enumerate(cameras):
+            make_tokens = tokenize(camera.get('make', ''))
+            name_tokens = tokenize(camera.get('name', ''))
+            tokens = tuple(make_tokens + name_tokens)
+            compact = "".join(tokens)
+            self.tokens.append(tokens)
+            self.compact.append(compact)
+            self.name_compact.append("".join(name_tokens))
+            self.spaced.append(" " + " ".join(tokens))
+            for gram in set(grams(compact, 3)):
+                self.trigrams[gram].append(row)
+            for gram in set(grams(compact, 2)):
+                self.bigrams[gram].append(row)
+            for initial in {token[0] for token in tokens}:
+                self.initials[initial].append(row)
+
+        self.rows_by_rank = sorted(range(len(self.compact)), key=lambda row: (len(self.compact[row]), row))
+        for rank, row in enumerate(self.rows_by_rank):
+            for token in set(self.tokens[row]):
+                self.token_ranks[token].append(rank)
+        self.vocabulary = sorted(self.token_ranks)
+        self._prefix_cache: Dict[str, List[int]] = {}
+
+    def _prefix_ranks(self, query_token: str) -> List[int]:
+        """Ranks of the rows with a longer token starting with ``query_token``, in order."""
+        ranks = self._prefix_cache.get(query_token)
+        if ranks is None:
+            start = bisect.bisect_right(self.vocabulary, query_token)
+            end = bisect.bisect_left(self.vocabulary, query_token + PREFIX_END, start)
+            ranks = sorted(set(itertools.chain.from_iterable(
+                self.token_ranks[token] for token in self.vocabulary[start:end])))
+            # Only one and two character prefixes cover enough of the vocabulary to be worth keeping
+            if len(query_token) <= CACHED_PREFIX_LENGTH:
+                self._prefix_cache[query_token] = ranks
+        return ranks
+
+    def _token_hits(self, query_tokens: List[str], wanted: int, allowed: Optional[FrozenSet[int]]) -> List[int]:
+        """
+        Up to ``wanted`` rows from the token map: every query token as a
+        whole token or prefix, then any query token as a whole token.
+        Shorter names come first within each.
+        """
+        hits: Dict[int, None] = {}
+        unique = list(dict.fromkeys(query_tokens))
+        exact = {query_token: self.token_ranks.get(query_token, []) for query_token in unique}
+        prefix = {query_token: self._prefix_ranks(query_token) for query_token in unique}
+
+        # Walk the query token with the fewest rows, checking the others
+        driver = min(unique, key=lambda query_token: len(exact[query_token]) + len(prefix[query_token]))
+        others = [" " + query_token for query_token in unique if query_token != driver]
+        for rank in itertools.islice(itertools.chain(exact[driver], prefix[driver]),
+                                     wanted * TOKEN_SCAN_PER_CANDIDATE):
+            row = self.rows_by_rank[rank]
+            if row in hits or (allowed is not None and row not in allowed):
+                continue
+            spaced = self.spaced[row]
+            if all(other in spaced for other in others):
+                hits[row] = None
+                if len(hits) >= wanted:
+                    return list(hits)
+
+        if others:
+            # Typo'd queries: names sharing any whole token, e.g. "35" in "alxa 35"
+            for rank in heapq.merge(*exact.values()):
+                row = self.rows_by_rank[rank]
+                if allowed is None or row in allowed:
+                    hits[row] = None
+                    if len(hits) >= wanted:
+                        break
+        return list(hits)
+
+    def _informative(self, index: Dict[str, List[int]], query_grams: List[str]) -> List[List[int]]:
+        """Posting lists of the query's n-grams, without the common ones if any rarer one matched."""
+        lists = [index[gram] for gram in query_grams if gram in index]
+        common = len(self.compact) * COMMON_GRAM_FRACTION
+        return [rows for rows in lists if len(rows) <= common] or lists
+
+    def _candidates(self, query: str, wanted: int, allowed: Optional[FrozenSet[int]]) -> Counter:
+        counts = Counter()
+        if len(query) == 1:
+            counts.update(self.initials.get(query, ()))
+        for rows in self._informative(self.trigrams, grams(query, 3)):
+            counts.update(rows)
+        if len(counts) < wanted:
+            # Short query or a typo in every trigram: widen with bigrams
+            for rows in self._informative(self.bigrams, grams(query, 2)):
+                counts.update(rows)
+        if allowed is not None:
+            counts = Counter({row: count for row, count in counts.items() if row in allowed})
+        return counts
+
+    def _token_scores(self, query_tokens: List[str], rows: List[int]) -> List[Dict[str, float]]:
+        """
+        Per query token, the ``token_match`` score of every name token of
+        ``rows`` that matches at all; names share most of their tokens, so
+        each distinct token is matched once per query.
+        """
+        distinct = set(itertools.chain.from_iterable(self.tokens[row] for row in rows))
+        by_query_token = {}
+        for query_token in dict.fromkeys(query_tokens):
+            limit = _edit_limit(query_token)
+            if limit and query_token.isalpha():
+                # Cheap pre-check of token_match's own: too many missing letters
+                letters = set(query_token)
+                end = len(query_token) + limit
+                candidates = [token for token in distinct if len(letters.difference(token[:end])) <= limit]
+            else:
+                candidates = [token for token in distinct if token.startswith(query_token)]
+            matches = {}
+            for token in candidates:
+                match = token_match(query_token, token)
+                if match:
+                    matches[token] = match
+            by_query_token[query_token] = matches
+        return [by_query_token[query_token] for query_token in query_tokens]
+
+    def score(self, row: int, token_scores: List[Dict[str, float]], query: str, overlap: float) -> float:
+        """Detailed score of a row, given ``_token_scores`` for the query."""
+        tokens = self.tokens[row]
+        score = 0.0
+        for matches in token_scores:
+            best = 0.0
+            for token in tokens:
+                match = matches.get(token)
+                if match and match > best:
+                    best = match
+            score += best
+        score /= len(token_scores)
+        if self.name_compact[row].startswith(query):
+            score += 0.4
+        elif query in self.compact[row]:
+            score += 0.25
+        return score + 0.2 * overlap - 0.002 * len(self.compact[row])
+
+    def search(self, text: str, limit: int = 50,
+               allowed: Optional[FrozenSet[int]] = None) -> List[Tuple[float, int]]:
+        """
+        Best matches for ``text``.
+
+        Args:
+            text (str): Query
+            limit (int): Maximum results
+            allowed (FrozenSet[int]): Restrict to these rows (make/type filter)
+
+        Returns:
+            List[Tuple[float, int]]: ``(score, row)``, best first
+        """
+        query_tokens = tokenize(text)
+        query = "".join(query_tokens)
+        if not query:
+            return []
+
+        wanted = limit * CANDIDATES_PER_RESULT
+        shortlist = self._token_hits(query_tokens, wanted, allowed)
+        if len(shortlist) < wanted:
+            # Fill the rest by n-gram overlap
+            listed = set(shortlist)
+            counts = self._candidates(query, wanted, allowed)
+            for row, _ in counts.most_common(wanted + len(listed)):
+                if row not in listed:
+                    shortlist.append(row)
+                    if len(shortlist) >= wanted:
+                        break
+        if not shortlist:
+            return []
+
+        query_grams = grams(query, 3) or [query]
+        token_scores = self._token_scores(query_tokens, shortlist)
+        scored = []
+        for row in shortlist:
+            overlap = sum(map(self.compact[row].__contains__, query_grams)) / len(query_grams)
+            score = self.score(row, token_scores, query, overlap)
+            if score > MIN_SCORE:
+                scored.append((score, -row))
+        return [(score, -row) for score, row in heapq.nlargest(limit, scored)]
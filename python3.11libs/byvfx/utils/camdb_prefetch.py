@@ -0,0 +1,125 @@
+"""
+Bulk sensor prefetch for CamDB over persistent HTTP connections.
+
+``SensorPrefetcher`` loads ``/cameras/{id}/sensors/`` for many cameras at
+once. Concurrency is bounded by a few worker threads, each reusing its own
+keep-alive connection of the shared ``CamDBTransport``, so a few hundred
+cameras cost a few TCP/TLS handshakes instead of one per camera. Requests
+go through ``CamDBCache`` like every other CamDB call: ETag revalidation,
+the transport's retries and its circuit breaker (only requests that still
+fail after their retries count towards opening it, and a half-open
+breaker lets a single trial request through). Results land in an
+in-memory sensor cache keyed by camera id and in the on-disk cache (so
+offline mode can browse them later); entries that are still fresh on disk
+are not requested again.
+
+Point ``base_url`` (or ``BYVFX_CAMDB_URL``) at a local stub server to test.
+"""
+
+import threading
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from byvfx.utils.camdb_cache import CamDBCache
+from byvfx.utils.camdb_client import normalize_sensor_response, sensors_endpoint
+
+DEFAULT_CONNECTIONS = 4
+
+
+class SensorPrefetcher:
+    """
+    Prefetch sensor data for many cameras with bounded concurrency.
+
+    Args:
+        cache (CamDBCache): Disk cache to read fresh entries from and write
+            results to; its ``base_url`` is the server queried
+        connections (int): Keep-alive connections (parallel requests)
+
+    Example:
+        >>> prefetcher = SensorPrefetcher(CamDBCache())
+        >>> sensors, errors = prefetcher.prefetch([12, 15, 31])
+        >>> sensors[12]
+    """
+
+    def __init__(self, cache: CamDBCache = None, connections: int = DEFAULT_CONNECTIONS):
+        self.cache = cache or CamDBCache()
+        self.connections = connections
+        self.sensors: Dict[object, list] = {}
+        self._lock = threading.Lock()
+
+    def _fetch_one(self, camera_id, allow_stale: bool = True) -> list:
+        # Only stale or missing entries (or every entry, forced) get here: revalidate or download
+        response = self.cache.request(sensors_endpoint(camera_id), force=True, allow_stale=allow_stale)
+        return normalize_sensor_response(response.data)
+
+    def prefetch(self, camera_ids: Iterable, progress: Callable[[int, int], None] = None,
+                 cancelled: Callable[[], bool] = None, force: bool = False,
+                 allow_stale: bool = True) -> Tuple[Dict[object, list], Dict[object, str]]:
+        """
+        Fill the sensor cache for every camera id.
+
+        Args:
+            camera_ids (Iterable): Camera ids to load
+            progress (Callable): Called with ``(done, total)`` after each camera
+            cancelled (Callable): Polled before each request; True stops early
+            force (bool): Revalidate every camera, including ones already
+                loaded or fresh on disk
+            allow_stale (bool): Fall back to the cached entry when a request
+                fails; False reports the camera in the errors instead
+
+        Returns:
+            Tuple[Dict, Dict]: ``(sensors by camera id, error message by camera id)``
+        """
+        camera_ids = [camera_id for camera_id in dict.fromkeys(camera_ids) if camera_id is not None]
+        errors = {}
+        pending = []
+
+        # Fresh disk entries (and offline mode) need no request at all
+        for camera_id in camera_ids:
+            if camera_id in self.sensors and not force:
+                continue
+            entry = self.cache.load(sensors_endpoint(camera_id))
+            if entry and (self.cache.offline or (not force and self.cache.is_fresh(entry))):
+                self.sensors[camera_id] = normalize_sensor_response(entry["data"])
+            elif not self.cache.offline:
+                pending.append(camera_id)
+
+        done = len(camera_ids) - len(pending)
+        if progress:
+            progress(done, len(camera_ids))
+        if not pending:
+            return self.sensors, errors
+
+        def fetch(camera_id):
+            if cancelled and cancelled():
+                return None
+            return self._fetch_one(camera_id, allow_stale)
+
+        # Each worker thread keeps one keep-alive connection of the shared transport
+        with ThreadPoolExecutor(max_workers=self.connections) as executor:
+            futures = {executor.submit(fetch, camera_id): camera_id for camera_id in pending}
+            for future in as_completed(futures):
+                camera_id = futures[future]
+                try:
+                    sensors = future.result()
+                except (OSError, ValueError, urllib.error.HTTPError) as e:
+                    # The cache already falls back to stale data for 5xx and
+                    # network errors; this also covers client errors
+                    stale = self.cache.load(sensors_endpoint(camera_id)) if allow_stale else None
+                    if stale:
+                        sensors = normalize_sensor_response(stale["data"])
+                    else:
+                        errors[camera_id] = str(e)
+                        sensors = None
+                if sensors is not None:
+                    with self._lock:
+                        self.sensors[camera_id] = sensors
+                done += 1
+                if progress:
+                    progress(done, len(camera_ids))
+        return self.sensors, errors
+
+    def get(self, camera_id) -> Optional[List[dict]]:
+        """Prefetched sensors for a camera, or None if not loaded"""
+        return self.sensors.get(camera_id)
@@ -0,0 +1,293 @@
+"""
+Batch camera rig creation from CamDB entries or a CSV shot manifest.
+
+``build_camera_rigs`` takes rows of make / model / sensor mode, resolves
+them against the cached CamDB catalog and creates all cameras in a single
+undo group. Parameters are set with one ``setParms`` call per node and the
+nodes are placed on a grid, so building 200 cameras does not pay for
+per-parm updates or ``moveToGoodPosition`` on every node. Rows that cannot
+be resolved or created are reported and skipped.
+
+Resolving (``resolve_rig_requests``) only talks to CamDB and can run on a
+worker thread; ``create_camera_rigs`` then makes the nodes on the main
+thread. ``build_camera_rigs`` does both in turn.
+
+CSV manifests need ``make`` and ``model`` columns; ``mode`` (sensor mode
+name) and ``node_name`` are optional::
+
+    make,model,mode,node_name
+    ARRI,ALEXA Mini LF,Open Gate,sh010_cam
+    RED,V-RAPTOR 8K VV,,sh020_cam
+"""
+
+import csv
+import hou
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from byvfx.utils.camdb_catalog import normalize_name
+from byvfx.utils.camdb_client import CamDBClient
+
+MM_PER_INCH = 25.4
+
+# Grid spacing in network editor units
+GRID_COLUMNS = 10
+GRID_SPACING = (3.0, -1.5)
+
+RigRequest = namedtuple("RigRequest", ["make", "model", "mode", "node_name", "label"])
+BatchResult = namedtuple("BatchResult", ["created", "failures"])
+# requests: (RigRequest, camera, sensor) per resolved row; failures: (label, error)
+ResolvedRigs = namedtuple("ResolvedRigs", ["requests", "failures"])
+
+
+def read_manifest(csv_path: str) -> List[RigRequest]:
+    """
+    Read rig requests from a CSV manifest (header names are case-insensitive).
+
+    Raises:
+        ValueError: If the ``make`` or ``model`` column is missing
+    """
+    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+        missing = {"make", "model"} - set(fields)
+        if missing:
+            raise ValueError(f"Manifest is missing column(s): {', '.join(sorted(missing))}")
+
+        requests = []
+        for line_number, row in enumerate(reader, start=2):
+            value = lambda key: (row.get(fields[key]) or "").strip() if key in fields else ""
+            if not value("make") and not value("model"):
+                continue # Blank line
+            requests.append(RigRequest(value("make"), value("model"), value("mode") or None,
+                                       value("node_name") or None, f"line {line_number}"))
+        return requests
+
+
+def rig_requests(entries: Iterable) -> List[RigRequest]:
+    """Normalize dicts or ``(make, model[, mode[, node_name]])`` tuples into RigRequests."""
+    requests = []
+    for i, entry in enumerate(entries, start=1):
+        if isinstance(entry, RigRequest):
+            requests.append(entry)
+        elif isinstance(entry, dict):
+            requests.append(RigRequest(entry.get('make', ''), entry.get('model') or entry.get('name', ''),
+                                       entry.get('mode'), entry.get('node_name'), f"entry {i}"))
+        else:
+            padded = tuple(entry) + (None,) * (4 - len(entry))
+            requests.append(RigRequest(*padded[:4], f"entry {i}"))
+    return requests
+
+
+class RigResolver:
+    """
+    Resolve make/model/mode requests to ``(camera, sensor)`` via a CamDBClient.
+
+    Args:
+        client (CamDBClient): Used for whatever is not passed in
+        catalog (CameraCatalog): Already loaded camera catalog (default:
+            the client's, fetched on first use)
+        sensors (Dict): Already loaded sensors by camera id, e.g. from a
+            ``SensorPrefetcher``; other cameras are requested once each
+    """
+
+    def __init__(self, client: CamDBClient, catalog=None, sensors: Dict = None):
+        self.client = client
+        self.catalog = catalog if catalog is not None else client.catalog()
+        self.sensors = dict(sensors or {})
+        self._by_make_name: Dict[Tuple[str, str], int] = {}
+        for row, camera in enumerate(self.catalog.cameras):
+            key = ((camera.get('make') or "").lower(), self.catalog.names[row])
+            self._by_make_name.setdefault(key, row)
+
+    def find_camera(self, make: str, model: str) -> dict:
+        """Exact make + model, else a unique name match within the make."""
+        make_key = (make or "").lower()
+        row = self._by_make_name.get((make_key, normalize_name(model)))
+        if row is not None:
+            return self.catalog.cameras[row]
+
+        candidates = [self.catalog.cameras[r] for r in self.catalog.search(model)
+                      if not make_key or (self.catalog.cameras[r].get('make') or "").lower() == make_key]
+        if len(candidates) == 1:
+            return candidates[0]
+        if not candidates:
+            raise LookupError(f"No CamDB camera matches '{make} {model}'")
+        names = ", ".join(sorted(c.get('name', '?') for c in candidates)[:5])
+        raise LookupError(f"'{make} {model}' is ambiguous: {names}")
+
+    def find_sensor(self, camera: dict, mode: Optional[str]) -> dict:
+        """Sensor mode by name (case-insensitive), or the first one if no mode is given."""
+        camera_id = camera.get('id')
+        if camera_id not in self.sensors:
+            self.sensors[camera_id] = self.client.sensors(camera_id)
+        sensors = [s for s in self.sensors[camera_id] if isinstance(s, dict)]
+        if not sensors:
+            raise LookupError(f"No sensor data for {camera.get('make')} {camera.get('name')}")
+        if not mode:
+            return sensors[0]
+        wanted = normalize_name(mode)
+        for sensor in sensors:
+            if normalize_name(sensor.get('mode_name', '')) == wanted:
+                return sensor
+        available = ", ".join(s.get('mode_name', '?') for s in sensors)
+        raise LookupError(f"No sensor mode '{mode}' (available: {available})")
+
+    def resolve(self, request: RigRequest) -> Tuple[dict, dict]:
+        camera = self.find_camera(request.make, request.model)
+        return camera, self.find_sensor(camera, request.mode)
+
+
+def camera_node_name(camera: dict) -> str:
+    """``Make_Model`` with anything but letters and digits replaced by ``_``"""
+    sane_make = "".join(c if c.isalnum() else "_" for c in camera.get('make', 'UnknownCam'))
+    sane_model = "".join(c if c.isalnum() else "_" for c in camera.get('name', 'Model'))
+    return f"{sane_make}_{sane_model}"
+
+
+def camera_parms(camera: dict, sensor: dict) -> Tuple[Dict[str, float], List[str]]:
+    """
+    Camera node parm values for a CamDB sensor.
+
+    Returns:
+        Tuple[Dict[str, float], List[str]]: Parm values for ``setParms``, and
+        warnings for sensor values that could not be converted
+    """
+    parms = {"tx": 0, "ty": 0, "tz": 5}
+    warnings = []
+
+    res_w = sensor.get('res_width')
+    res_h = sensor.get('res_height')
+    if res_w and res_h:
+        try:
+            parms["resx"] = int(res_w)
+            parms["resy"] = int(res_h)
+        except (ValueError, TypeError):
+            warnings.append(f"Could not set resolution {res_w}x{res_h}")
+
+    sensor_w_mm = sensor.get('sensor_width')
+    if sensor_w_mm:
+        try:
+            parms["aperture"] = float(sensor_w_mm) / MM_PER_INCH
+        except (ValueError, TypeError):
+            warnings.append(f"Could not set aperture {sensor_w_mm}mm")
+
+    format_aspect = sensor.get('format_aspect')
+    if format_aspect:
+        try:
+            parms["aspect"] = float(format_aspect)
+        except (ValueError, TypeError):
+            warnings.append(f"Could not set aspect ratio {format_aspect}")
+
+    return parms, warnings
+
+
+def camera_comment(camera: dict, sensor: dict) -> str:
+    comment = f"CamDB Camera: {camera.get('make')} {camera.get('name')}\n"
+    comment += f"Mode: {sensor.get('mode_name', 'N/A')}\n"
+    comment += f"Sensor: {sensor.get('sensor_width', 'N/A')}x{sensor.get('sensor_height', 'N/A')}mm\n"
+    comment += f"Resolution: {sensor.get('res_width') or 'N/A'}x{sensor.get('res_height') or 'N/A'}"
+    return comment
+
+
+def create_camera_node(parent: hou.Node, camera: dict, sensor: dict, node_name: str = None) -> hou.Node:
+    """Create and configure one camera node (no layout, no undo group)."""
+    cam_node = parent.createNode("cam", node_name or camera_node_name(camera))
+    parms, warnings = camera_parms(camera, sensor)
+    cam_node.setParms(parms)
+    comment = camera_comment(camera, sensor)
+    if warnings:
+        comment += "\n" + "\n".join(warnings)
+    cam_node.setComment(comment)
+    cam_node.setGenericFlag(hou.nodeFlag.DisplayComment, True)
+    return cam_node
+
+
+def _grid_origin(parent: hou.Node, exclude: Iterable[hou.Node] = ()) -> hou.Vector2:
+    """Top-left of the grid: just below the parent's existing nodes."""
+    exclude = set(exclude)
+    positions = [child.position() for child in parent.children() if child not in exclude]
+    if not positions:
+        return hou.Vector2(0, 0)
+    return hou.Vector2(min(p[0] for p in positions), min(p[1] for p in positions) + GRID_SPACING[1] * 2)
+
+
+def _failure_label(request: RigRequest) -> str:
+    return f"{request.label} ({request.make} {request.model})"
+
+
+def resolve_rig_requests(entries: Iterable, client: CamDBClient = None, catalog=None,
+                         sensors: Dict = None) -> ResolvedRigs:
+    """
+    Look up the camera and sensor of every entry, without touching hou.
+
+    Args:
+        entries (Iterable): See ``build_camera_rigs``
+        client (CamDBClient): API client for anything not passed in
+        catalog (CameraCatalog): Already loaded camera catalog
+        sensors (Dict): Already loaded sensors by camera id
+
+    Returns:
+        ResolvedRigs: Resolved rows, and ``(label, error)`` for the others
+    """
+    resolver = RigResolver(client or CamDBClient(), catalog, sensors)
+    resolved = []
+    failures = []
+    for request in rig_requests(entries):
+        try:
+            resolved.append((request,) + resolver.resolve(request))
+        except (LookupError, OSError, ValueError) as e:
+            failures.append((_failure_label(request), str(e)))
+    return ResolvedRigs(resolved, failures)
+
+
+def create_camera_rigs(resolved: ResolvedRigs, parent: hou.Node = None,
+                       columns: int = GRID_COLUMNS) -> BatchResult:
+    """
+    Create the cameras of resolved rows in a single undo group, laid out on a grid.
+
+    Returns:
+        BatchResult: Created nodes, and the resolve failures plus any
+        node creation failures
+    """
+    parent = parent or hou.node("/obj")
+    created = []
+    failures = list(resolved.failures)
+    with hou.undos.group(f"Build {len(resolved.requests)} CamDB cameras"):
+        for request, camera, sensor in resolved.requests:
+            try:
+                created.append(create_camera_node(parent, camera, sensor, request.node_name))
+            except (hou.Error, ValueError) as e:
+                failures.append((_failure_label(request), str(e)))
+
+        # Lay out once at the end instead of moveToGoodPosition per node
+        origin = _grid_origin(parent, created)
+        for i, node in enumerate(created):
+            column, row = i % columns, i // columns
+            node.setPosition(origin + hou.Vector2(column * GRID_SPACING[0], row * GRID_SPACING[1]))
+
+    return BatchResult(created, failures)
+
+
+def build_camera_rigs(entries: Iterable, client: CamDBClient = None, parent: hou.Node = None,
+                      columns: int = GRID_COLUMNS) -> BatchResult:
+    """
+    Create one camera per entry, in a single undo group.
+
+    Args:
+        entries (Iterable): RigRequests, dicts (``make``, ``model``, ``mode``,
+            ``node_name``) or tuples in that order
+        client (CamDBClient): API client; its cache makes repeated lookups free
+        parent (hou.Node): Network to build in (default ``/obj``)
+        columns (int): Grid width
+
+    Returns:
+        BatchResult: Created nodes, and ``(label, error)`` for every failed row
+    """
+    return create_camera_rigs(resolve_rig_requests(entries, client), parent, columns)
+
+
+def build_camera_rigs_from_csv(csv_path: str, client: CamDBClient = None,
+                               parent: hou.Node = None) -> BatchResult:
+    """``build_camera_rigs`` for a CSV manifest (see module docstring)."""
+    return build_camera_rigs(read_manifest(csv_path), client, parent)
@@ -0,0 +1,162 @@
+"""
+Compact, versioned snapshot of the whole CamDB catalog.
+
+One person (or a nightly job) exports cameras and sensors into a single
+gzipped columnar JSON file on a shared studio path; every panel then loads
+that file at startup instead of downloading and decoding the camera list
+itself, and only goes to the API for refreshes.
+
+Columnar means each table is stored as a list of column names plus one
+list of values per record, so keys are not repeated per camera. The
+``version`` stamp is a hash of the content: two snapshots with the same
+version hold the same data.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from byvfx.utils.camdb_cache import camdb_settings
+from byvfx.utils.camdb_client import CamDBClient
+
+SNAPSHOT_FORMAT = "camdb-snapshot"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# version: content hash; sensors: sensor lists keyed by camera id
+Snapshot = namedtuple("Snapshot", ["path", "version", "created_at", "source", "cameras", "sensors"])
+
+# Loaded snapshots keyed by path, reused while the file's mtime is unchanged
+_loaded: Dict[str, tuple] = {}
+
+
+def _to_columns(records: List[dict]) -> dict:
+    columns = []
+    seen = set()
+    for record in records:
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    return {"columns": columns, "rows": [[record.get(key) for key in columns] for record in records]}
+
+
+def _from_columns(table: dict) -> List[dict]:
+    columns = table["columns"]
+    # None marks a key the record did not have; drop it to round-trip .get() defaults
+    return [{key: value for key, value in zip(columns, row) if value is not None} for row in table["rows"]]
+
+
+def export_snapshot(path: str, client: CamDBClient = None, include_sensors: bool = True,
+                    connections: int = 4) -> Snapshot:
+    """
+    Fetch the full catalog and write it as a snapshot.
+
+    Every camera list page and sensor list is requested from the API, even
+    if fresh in the client's cache, and any failure aborts the export
+    instead of writing cached (possibly stale) data into the snapshot.
+
+    Args:
+        path (str): Output file, usually on a shared studio path
+        client (CamDBClient): Client to fetch with (default: a fresh one)
+        include_sensors (bool): Also fetch every camera's sensors
+        connections (int): Parallel connections for the sensor fetch
+
+    Returns:
+        Snapshot: What was written
+
+    Raises:
+        RuntimeError: If the client is offline or any camera's sensors could not be fetched
+        urllib.error.HTTPError: If the API answered the camera list with an error
+        OSError: If the API could not be reached
+    """
+    client = client or CamDBClient()
+    if client.cache.offline:
+        raise RuntimeError("Cannot export a snapshot in offline mode")
+    cameras = client.cameras(force=True, allow_stale=False)
+
+    sensors = {}
+    if include_sensors:
+        sensors, errors = client.prefetch_sensors([c.get('id') for c in cameras], connections,
+                                                  force=True, allow_stale=False)
+        if errors:
+            raise RuntimeError(f"Sensor fetch failed for {len(errors)} cameras, e.g. "
+                               f"{next(iter(errors.items()))}")
+
+    sensor_records = []
+    for camera_id, camera_sensors in sensors.items():
+        for sensor in camera_sensors:
+            if isinstance(sensor, dict):
+                sensor_records.append(dict(sensor, _camera_id=camera_id))
+
+    body = {"cameras": _to_columns(cameras), "sensors": _to_columns(sensor_records)}
+    encoded_body = json.dumps(body, separators=(",", ":"), sort_keys=True)
+    version = hashlib.sha1(encoded_body.encode("utf-8")).hexdigest()[:12]
+    created_at = time.time()
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "version": version,
+        "created_at": created_at,
+        "source": client.base_url,
+        "camera_count": len(cameras),
+        "sensor_count": len(sensor_records),
+    }
+
+    # Written next to the target and renamed, so readers never see a partial file
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(header, separators=(",", ":")))
+        f.write("\n")
+        f.write(encoded_body)
+    os.replace(tmp_path, path)
+
+    return Snapshot(path, version, created_at, client.base_url, cameras, dict(sensors))
+
+
+def load_snapshot(path: str) -> Snapshot:
+    """
+    Read a snapshot; repeated calls are free while the file is unchanged.
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is not a snapshot or uses a newer format
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a CamDB snapshot")
+        if header.get("format_version", 0) > SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"{path} uses snapshot format {header['format_version']}; "
+                             f"this tool reads up to {SNAPSHOT_FORMAT_VERSION}")
+        body = json.loads(f.read())
+
+    sensors = {}
+    for sensor in _from_columns(body["sensors"]):
+        sensors.setdefault(sensor.pop("_camera_id"), []).append(sensor)
+
+    snapshot = Snapshot(path, header["version"], header["created_at"], header.get("source"),
+                        _from_columns(body["cameras"]), sensors)
+    _loaded[path] = (mtime_ns, snapshot)
+    return snapshot
+
+
+def load_studio_snapshot() -> Optional[Snapshot]:
+    """The snapshot configured by ``BYVFX_CAMDB_SNAPSHOT``, or None if unset/unreadable."""
+    path = camdb_settings()["snapshot_path"]
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return load_snapshot(path)
+    except (OSError, ValueError) as e:
+        print(f"Could not load CamDB snapshot {path}: {e}")
+        return None
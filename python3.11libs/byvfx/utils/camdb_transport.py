@@ -0,0 +1,315 @@
+"""
+Resilient HTTP transport for the CamDB API.
+
+``CamDBTransport`` sends GET requests with separate connect and read
+timeouts, so a dead host fails within seconds instead of waiting for the
+OS default. Connection errors, timeouts, 5xx and 429 responses are retried
+with jittered exponential backoff (``Retry-After`` is honoured). A circuit
+breaker counts requests that still fail after their retries; once it
+opens, requests fail immediately with ``CircuitOpenError`` and callers
+such as ``CamDBCache`` fall back to cached data without waiting. Latency
+and error counters are kept in ``stats``.
+
+Transports from ``shared_transport`` share one breaker per API root, so
+every panel and client in a session sees the same breaker state.
+"""
+
+import http.client
+import io
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+from collections import deque, namedtuple
+from typing import Dict, Optional
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 30
+RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+TransportResponse = namedtuple("TransportResponse", ["status", "reason", "headers", "body", "elapsed"])
+
+
+class TransportError(OSError):
+    """The request failed at the network level after all retries."""
+
+
+class CircuitOpenError(TransportError):
+    """Raised without a request while the circuit breaker is open."""
+
+
+class TransportHTTPError(urllib.error.HTTPError):
+    """Final error status; an ``urllib.error.HTTPError`` so existing handlers keep working."""
+
+    def __init__(self, url: str, status: int, reason: str, headers, body: bytes):
+        super().__init__(url, status, reason, headers, io.BytesIO(body))
+
+
+class TransportStats:
+    """Thread-safe request, error and latency counters."""
+
+    def __init__(self, latency_window: int = 500):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.short_circuits = 0
+        self.status_counts: Dict[int, int] = {}
+        self.latencies = deque(maxlen=latency_window)
+
+    def add(self, **counters) -> None:
+        with self._lock:
+            for name, amount in counters.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def record_response(self, status: int, elapsed: float) -> None:
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.latencies.append(elapsed)
+
+    def snapshot(self) -> dict:
+        """Counters plus latency percentiles in milliseconds."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            result = {
+                "requests": self.requests,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "short_circuits": self.short_circuits,
+                "status_counts": dict(self.status_counts),
+            }
+        if latencies:
+            pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000.0
+            result.update(latency_p50_ms=pick(0.5), latency_p95_ms=pick(0.95), latency_max_ms=latencies[-1] * 1000.0)
+        return result
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after ``failure_threshold`` consecutive failures; after
+    ``reset_timeout`` seconds one trial request is let through (half-open)
+    and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.opens = 0
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def is_open(self) -> bool:
+        """True while requests would be rejected (does not use up the trial)."""
+        return self.state == "open" or (self.state == "half_open" and self._trial_running)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    self.opens += 1
+                self._opened_at = time.monotonic()
+                self._trial_running = False
+
+
+class CamDBTransport:
+    """
+    GET requests against one API root with timeouts, retries and a breaker.
+
+    Args:
+        base_url (str): ``http://`` or ``https://`` API root
+        connect_timeout (float): Seconds to establish a connection
+        read_timeout (float): Seconds to wait for each read
+        retries (int): Extra attempts for transient failures
+        backoff_base (float): First backoff ceiling; doubles per attempt
+        backoff_max (float): Backoff ceiling cap
+        breaker (CircuitBreaker): Shared breaker (default: a new one)
+
+    Connections are kept alive and reused per thread.
+    """
+
+    def __init__(self, base_url: str, connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT, retries: int = RETRIES,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX,
+                 breaker: CircuitBreaker = None):
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.base_url = base_url.rstrip("/")
+        self._connection_class = (http.client.HTTPSConnection if parts.scheme == "https"
+                                  else http.client.HTTPConnection)
+        self._host, self._port = parts.hostname, parts.port
+        self._path_prefix = parts.path.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = TransportStats()
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connection_class(self._host, self._port, timeout=self.connect_timeout)
+            self._local.connection = connection
+        if connection.sock is None:
+            connection.connect()
+            connection.sock.settimeout(self.read_timeout)
+        return connection
+
+    def _send_once(self, endpoint: str, headers: Dict[str, str]) -> TransportResponse:
+        for first_try in (True, False):
+            connection = self._connection()
+            was_open = getattr(self._local, "used", False)
+            start = time.perf_counter()
+            try:
+                connection.request("GET", self._path_prefix + endpoint, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                self._local.used = False
+                # An idle keep-alive connection the server already dropped: reconnect once
+                if first_try and was_open:
+                    continue
+                raise
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                self._local.used = False
+                raise
+            if response.will_close:
+                connection.close()
+            self._local.used = not response.will_close
+            return TransportResponse(response.status, response.reason, response.headers, body,
+                                     time.perf_counter() - start)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        delay = random.uniform(0, ceiling) # "Full jitter" keeps clients from retrying in lockstep
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+            except ValueError:
+                pass # HTTP-date form; the jittered delay is good enough
+        return delay
+
+    def get(self, endpoint: str, headers: Dict[str, str] = None) -> TransportResponse:
+        """
+        GET an endpoint, retrying transient failures.
+
+        Returns:
+            TransportResponse: Any 2xx/3xx response, including 304
+
+        Raises:
+            CircuitOpenError: The breaker is open; no request was made
+            TransportHTTPError: Final 4xx/5xx status
+            TransportError: Network failure or timeout on every attempt
+        """
+        self.stats.add(requests=1)
+        if not self.breaker.allow():
+            self.stats.add(short_circuits=1)
+            raise CircuitOpenError(f"CamDB circuit open after repeated failures; not contacting {self.base_url}")
+
+        headers = dict({"User-Agent": USER_AGENT, "Accept": "application/json, text/plain, */*",
+                        "Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}, **(headers or {}))
+        url = self.base_url + endpoint
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.stats.add(retries=1)
+            self.stats.add(attempts=1)
+            try:
+                response = self._send_once(endpoint, headers)
+            except (OSError, http.client.HTTPException) as e:
+                if isinstance(e, socket.timeout):
+                    self.stats.add(timeouts=1)
+                if attempt == self.retries:
+                    self.stats.add(failures=1)
+                    self.breaker.record_failure()
+                    raise TransportError(f"Request to {url} failed: {e}") from e
+                time.sleep(self._backoff(attempt, None))
+                continue
+
+            self.stats.record_response(response.status, response.elapsed)
+            if response.status < 400:
+                self.breaker.record_success()
+                return response
+            if response.status in RETRY_STATUSES and attempt < self.retries:
+                time.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                continue
+
+            self.stats.add(failures=1)
+            if response.status in RETRY_STATUSES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success() # 4xx: the server itself is healthy
+            raise TransportHTTPError(url, response.status, response.reason, response.headers, response.body)
+
+    def close(self) -> None:
+        """Close this thread's keep-alive connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+
+
+_shared: Dict[tuple, CamDBTransport] = {}
+_breakers: Dict[str, CircuitBreaker] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_transport(base_url: str, **options) -> CamDBTransport:
+    """
+    One transport per API root and option set, shared by the session.
+
+    All transports for the same API root share one circuit breaker, so a
+    host marked down by one panel or client is skipped by all of them.
+    """
+    base_url = base_url.rstrip("/")
+    key = (base_url, tuple(sorted(options.items())))
+    with _shared_lock:
+        transport = _shared.get(key)
+        if transport is None:
+            breaker = _breakers.setdefault(base_url, CircuitBreaker())
+            transport = _shared[key] = CamDBTransport(base_url, breaker=breaker, **options)
+        return transport
@@ -0,0 +1,329 @@
+"""
+In-memory inverted index for VEX snippet search.
+
+Snippet names, descriptions, tags and the identifiers used in the code
+are split into lowercase tokens once, when the library is loaded, and
+kept in a token -> snippets map that ``add`` and ``remove``
+update in place. A query then costs a few dict lookups per term instead
+of lowercasing every field of every snippet.
+
+Query syntax:
+
+* terms are prefixes: ``curl`` finds ``curlnoise``
+* terms separated by spaces must all match (AND)
+* ``OR`` (or ``|``) separates alternatives: ``curl OR flow noise``
+  means ``curl`` or (``flow`` and ``noise``)
+
+A term scores by the field it hits (name above tags above description
+above code), exact tokens above prefix hits, summed over the terms.
+No Qt or hou imports.
+"""
+
+import bisect
+import heapq
+import itertools
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+WORD_PATTERN = re.compile(r"[a-z0-9_]+")
+IDENTIFIER_PATTERN = re.compile(r"[a-z_][a-z0-9_]*")
+OR_PATTERN = re.compile(r"\s+OR\s+|\|")
+
+# Score of a token per field it appears in
+FIELD_WEIGHTS = {
+    "name": 8.0,
+    "tags": 4.0,
+    "description": 2.0,
+    "code": 1.0,
+}
+# Prefix hits score this fraction of an exact token hit
+PREFIX_FACTOR = 0.7
+# Sorts after every token starting with a given prefix
+PREFIX_END = "\uffff"
+# Terms this short expand to a large part of the vocabulary; their layers
+# are kept until an edit touches a token starting with them
+CACHED_PREFIX_LENGTH = 2
+# Scaled and summed scores are rounded so equal scores land in one layer
+SCORE_DIGITS = 6
+
+SnippetKey = Tuple[str, str]
+
+
+class Layer:
+    """
+    Snippets sharing one score in a query step. Cached layers keep their
+    keys sorted once ``ordered`` is first called, so later searches read
+    only as far as their limit.
+    """
+
+    __slots__ = ("score", "keys", "cached", "_ordered")
+
+    def __init__(self, score: float, keys: Set[SnippetKey], cached: bool = False):
+        self.score = score
+        self.keys = keys
+        self.cached = cached
+        self._ordered: Optional[List[SnippetKey]] = None
+
+    def ordered(self) -> List[SnippetKey]:
+        if self._ordered is None:
+            self._ordered = sorted(self.keys)
+        return self._ordered
+
+
+def _with_parts(tokens: Iterable[str]) -> Iterable[str]:
+    """Tokens plus the parts of snake_case ones: ``old_min`` -> ``old``, ``min``."""
+    for token in tokens:
+        yield token
+        if "_" in token:
+            for part in token.split("_"):
+                if part:
+                    yield part
+
+
+def tokenize_text(text: str) -> List[str]:
+    return list(_with_parts(WORD_PATTERN.findall((text or "").lower())))
+
+
+def tokenize_code(code: str) -> List[str]:
+    """Identifiers in VEX code; ``@Cd`` and ``v@vel`` give ``cd`` and ``vel``."""
+    return list(_with_parts(IDENTIFIER_PATTERN.findall((code or "").lower())))
+
+
+def snippet_tokens(name: str, snippet: dict) -> Dict[str, float]:
+    """Token -> score for one snippet, taking the best field per token."""
+    fields = (
+        ("code", tokenize_code(snippet.get("code", ""))),
+        ("description", tokenize_text(snippet.get("description", ""))),
+        ("tags", [token for tag in snippet.get("tags", []) for token in tokenize_text(tag)]),
+        ("name", tokenize_text(name)),
+    )
+    scores = {}
+    for field, tokens in fields:
+        weight = FIELD_WEIGHTS[field]
+        for token in tokens:
+            scores[token] = weight
+    return scores
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """``"curl OR flow noise"`` -> ``[["curl"], ["flow", "noise"]]``"""
+    groups = []
+    for alternative in OR_PATTERN.split(query or ""):
+        terms = WORD_PATTERN.findall(alternative.lower())
+        if terms:
+            groups.append(terms)
+    return groups
+
+
+class SnippetIndex:
+    """
+    Incrementally updated inverted index over a snippet library.
+
+    Postings are kept per token and score (``{token: {score: {keys}}}``),
+    so a query is answered with set operations on whole score layers and
+    ranking never has to visit snippets below the cut-off. AND pairs of
+    layers are intersected best first, only until the limit is filled, and
+    one and two character prefixes keep their expanded layers between
+    searches, since they cover much of the vocabulary.
+
+    Args:
+        snippets_data (Dict[str, Dict[str, dict]]): ``{category: {name: snippet}}``
+
+    Example:
+        >>> index = SnippetIndex(manager.snippets_data)
+        >>> index.search("curl OR flow noise")
+        [('Noise Functions', 'Curl Flow'), ...]
+    """
+
+    def __init__(self, snippets_data: Optional[Dict[str, Dict[str, dict]]] = None):
+        self.postings: Dict[str, Dict[float, Set[SnippetKey]]] = {}
+        self.vocabulary: List[str] = []
+        self.snippet_tokens: Dict[SnippetKey, Dict[str, float]] = {}
+        # Short prefix term -> its layers, see CACHED_PREFIX_LENGTH
+        self.prefix_cache: Dict[str, List[Layer]] = {}
+        if snippets_data:
+            self.rebuild(snippets_data)
+
+    def __len__(self) -> int:
+        return len(self.snippet_tokens)
+
+    def _post(self, token: str, score: float, key: SnippetKey) -> None:
+        layers = self.postings.get(token)
+        if layers is None:
+            layers = self.postings[token] = {}
+        keys = layers.get(score)
+        if keys is None:
+            keys = layers[score] = set()
+        keys.add(key)
+
+    def rebuild(self, snippets_data: Dict[str, Dict[str, dict]]) -> None:
+        self.postings = {}
+        self.snippet_tokens = {}
+        self.prefix_cache = {}
+        for category, snippets in snippets_data.items():
+            for name, snippet in snippets.items():
+                key = (category, name)
+                tokens = self.snippet_tokens[key] = snippet_tokens(name, snippet)
+                for token, score in tokens.items():
+                    self._post(token, score, key)
+        self.vocabulary = sorted(self.postings)
+
+    def add(self, category: str, name: str, snippet: dict) -> None:
+        """Index a snippet, replacing any previous version of it."""
+        key = (category, name)
+        self.remove(category, name)
+        tokens = self.snippet_tokens[key] = snippet_tokens(name, snippet)
+        self._invalidate(tokens)
+        for token, score in tokens.items():
+            if token not in self.postings:
+                bisect.insort(self.vocabulary, token)
+            self._post(token, score, key)
+
+    def remove(self, category: str, name: str) -> None:
+        key = (category, name)
+        tokens = self.snippet_tokens.pop(key, {})
+        self._invalidate(tokens)
+        for token, score in tokens.items():
+            layers = self.postings[token]
+            layers[score].discard(key)
+            if layers[score]:
+                continue
+            del layers[score]
+            if layers:
+                continue
+            del self.postings[token]
+            position = bisect.bisect_left(self.vocabulary, token)
+            if position < len(self.vocabulary) and self.vocabulary[position] == token:
+                del self.vocabulary[position]
+
+    def _invalidate(self, tokens: Iterable[str]) -> None:
+        """Drop the cached layers of every short prefix of the tokens."""
+        if not self.prefix_cache:
+            return
+        for token in tokens:
+            for length in range(1, CACHED_PREFIX_LENGTH + 1):
+                self.prefix_cache.pop(token[:length], None)
+
+    def remove_category(self, category: str) -> None:
+        for key in [key for key in self.snippet_tokens if key[0] == category]:
+            self.remove(*key)
+
+    def _expand(self, term: str, cached: bool = False) -> List[Layer]:
+        """Exact token hits and scaled prefix hits, each key in its best layer only."""
+        merged: Dict[float, Set[SnippetKey]] = {}
+        for score, keys in self.postings.get(term, {}).items():
+            merged.setdefault(score, set()).update(keys)
+        # Every longer token with the prefix, however short it is; the
+        # result limit is applied to the ranked keys, not the vocabulary
+        start = bisect.bisect_right(self.vocabulary, term)
+        end = bisect.bisect_left(self.vocabulary, term + PREFIX_END, start)
+        for token in self.vocabulary[start:end]:
+            for score, keys in self.postings[token].items():
+                merged.setdefault(round(score * PREFIX_FACTOR, SCORE_DIGITS), set()).update(keys)
+        layers = []
+        seen = set()
+        for score in sorted(merged, reverse=True):
+            keys = merged[score]
+            keys.difference_update(seen)
+            if keys:
+                layers.append(Layer(score, keys, cached))
+                seen.update(keys)
+        return layers
+
+    def _term_layers(self, term: str) -> List[Layer]:
+        """Disjoint score layers for one prefix term, best first."""
+        if len(term) > CACHED_PREFIX_LENGTH:
+            return self._expand(term)
+        layers = self.prefix_cache.get(term)
+        if layers is None:
+            layers = self.prefix_cache[term] = self._expand(term, cached=True)
+        return layers
+
+    def warm(self) -> None:
+        """
+        Expand and sort every one character prefix ahead of the first
+        search, which would otherwise pay for it; for building the index
+        off the UI thread.
+        """
+        for initial in sorted({token[0] for token in self.vocabulary}):
+            for layer in self._term_layers(initial):
+                layer.ordered()
+
+    def _group_layers(self, terms: List[str]) -> Iterator[Layer]:
+        """AND of the terms, best first; a snippet's score is the sum of its term scores."""
+        layers: Iterable[Layer] = self._term_layers(terms[0])
+        for term in terms[1:]:
+            layers = _intersect_layers(list(layers), self._term_layers(term))
+        return iter(layers)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[SnippetKey]:
+        """
+        Ranked ``(category, name)`` matches for a query.
+
+        Args:
+            query (str): Prefix terms, AND by default, alternatives split by ``OR``
+            limit (int): Maximum results; None for all
+
+        Returns:
+            List[SnippetKey]: Best first; equal scores by category and name
+        """
+        groups = [self._group_layers(terms) for terms in parse_query(query)]
+        # Layers of one group are disjoint; alternatives may share keys,
+        # which keep the score of the first (best) layer they appear in
+        shared = len(groups) > 1
+        seen: Set[SnippetKey] = set()
+        results: List[SnippetKey] = []
+        stream = heapq.merge(*groups, key=lambda layer: -layer.score)
+        for _, level in itertools.groupby(stream, key=lambda layer: layer.score):
+            level = list(level)
+            needed = None if limit is None else limit - len(results)
+            results.extend(_first_keys(level, seen, needed))
+            if limit is not None and len(results) >= limit:
+                break
+            if shared:
+                for layer in level:
+                    seen.update(layer.keys)
+        return results
+
+
+def _intersect_layers(left: List[Layer], right: List[Layer]) -> Iterator[Layer]:
+    """
+    AND of two disjoint layer lists, best first. A key is in one layer per
+    side, so each pair of layers gives disjoint keys; pairs are intersected
+    lazily, and a search that fills its limit never intersects the low ones.
+    """
+    pairs: Dict[float, List[Tuple[Layer, Layer]]] = {}
+    for left_layer in left:
+        for right_layer in right:
+            score = round(left_layer.score + right_layer.score, SCORE_DIGITS)
+            pairs.setdefault(score, []).append((left_layer, right_layer))
+    for score in sorted(pairs, reverse=True):
+        keys: Set[SnippetKey] = set()
+        for left_layer, right_layer in pairs[score]:
+            keys |= left_layer.keys & right_layer.keys
+        if keys:
+            yield Layer(score, keys)
+
+
+def _first_keys(level: List[Layer], seen: Set[SnippetKey], needed: Optional[int]) -> List[SnippetKey]:
+    """Up to ``needed`` keys (all if None) of one score level by category and name, skipping ``seen``."""
+    if all(layer.cached for layer in level):
+        if len(level) == 1 and not seen:
+            ordered = level[0].ordered()
+            return ordered if needed is None else ordered[:needed]
+        # Alternatives may list a key in several layers: merged, the copies are adjacent
+        keys = []
+        previous = None
+        for key in heapq.merge(*(layer.ordered() for layer in level)):
+            if key != previous and key not in seen:
+                keys.append(key)
+                if len(keys) == needed:
+                    break
+            previous = key
+        return keys
+    keys = level[0].keys if len(level) == 1 else set().union(*(layer.keys for layer in level))
+    if seen:
+        keys = keys - seen
+    if needed is None or len(keys) <= needed:
+        return sorted(keys)
+    return heapq.nsmallest(needed, keys)
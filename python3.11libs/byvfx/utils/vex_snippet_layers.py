@@ -0,0 +1,261 @@
+"""
+Layered VEX snippet libraries: show, department and personal roots.
+
+``BYVFX_VEX_SNIPPETS_PATH`` lists snippet roots, highest precedence
+first, separated like ``PATH``::
+
+    $HOME/houdini20.5/scripts;$DEPT_ROOT/vex;$SHOW_ROOT/vex
+
+Each root is a directory holding a ``vex_snippets.db`` or
+``vex_snippets.json`` library. ``LayeredSnippetStore`` merges them into
+one library: a snippet in a higher root overrides the one with the same
+category and name below it. The first root takes all edits and every
+other root is read-only, so deleting a personal override brings back the
+show's version. ``&`` in the path stands for the default root.
+
+Read-only roots are parsed once per session and reused while their files'
+mtimes are unchanged, so reopening the manager does not re-read a large
+studio library; a changed root is picked up on the next ``poll``.
+No Qt or hou imports.
+"""
+
+import os
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from byvfx.config import defaults
+from byvfx.utils.vex_snippet_store import (
+    JsonSnippetStore, SnippetData, SnippetStore, SqliteSnippetStore, open_snippet_store, snippet_backend
+)
+
+LIBRARY_FILES = {
+    "sqlite": "vex_snippets.db",
+    "json": "vex_snippets.json",
+}
+DEFAULT_ROOT_TOKEN = "&"
+
+# path: root directory; writable: takes edits (only the first root)
+SnippetRoot = namedtuple("SnippetRoot", ["path", "writable"])
+
+# Parsed read-only libraries keyed by file path, reused while the signature matches
+_loaded: Dict[str, tuple] = {}
+
+
+def snippet_roots(default_root: str) -> List[SnippetRoot]:
+    """
+    Roots from ``BYVFX_VEX_SNIPPETS_PATH`` (or ``VEX_SNIPPETS_PATH``), highest precedence first.
+
+    Args:
+        default_root (str): Directory ``&`` expands to, and the only root
+            when no search path is set
+    """
+    search_path = os.environ.get("BYVFX_VEX_SNIPPETS_PATH", defaults.VEX_SNIPPETS_PATH)
+    paths = []
+    for entry in (search_path or DEFAULT_ROOT_TOKEN).split(os.pathsep):
+        entry = entry.strip()
+        if not entry:
+            continue
+        path = default_root if entry == DEFAULT_ROOT_TOKEN else os.path.expanduser(os.path.expandvars(entry))
+        path = os.path.normpath(path)
+        if path not in paths:
+            paths.append(path)
+    return [SnippetRoot(path, position == 0) for position, path in enumerate(paths)]
+
+
+def root_library(root: str) -> Optional[Tuple[str, str]]:
+    """``(backend, file)`` of the library in a root, SQLite first; None if it has none."""
+    for backend, name in LIBRARY_FILES.items():
+        path = os.path.join(root, name)
+        if os.path.exists(path):
+            return backend, path
+    return None
+
+
+def _signature(path: str) -> tuple:
+    """Stat of a library file and its journal, if any."""
+    signature = []
+    for name in (path, path + ".journal"):
+        try:
+            stat = os.stat(name)
+        except FileNotFoundError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def load_root(root: str) -> SnippetData:
+    """
+    Library of a read-only root, parsed at most once per change on disk.
+
+    Returns empty data when the root has no library.
+    """
+    library = root_library(root)
+    if library is None:
+        return [], {}
+    backend, path = library
+    signature = _signature(path)
+    cached = _loaded.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    if backend == "sqlite":
+        store = SqliteSnippetStore(path, read_only=True)
+    else:
+        store = JsonSnippetStore(path, read_only=True)
+    try:
+        data = store.load()
+    finally:
+        store.close()
+    _loaded[path] = (signature, data)
+    return data
+
+
+class LayeredSnippetStore(SnippetStore):
+    """
+    Merged view of several snippet roots with override precedence.
+
+    Args:
+        roots (List[SnippetRoot]): Highest precedence first; only a
+            writable first root takes edits
+        backend (str): Library format created in the writable root when it
+            has none yet (default from the settings)
+
+    Example:
+        >>> store = LayeredSnippetStore(snippet_roots(default_root))
+        >>> manager = VEXSnippetManager(store)
+        >>> store.origin("Noise Functions", "Curl")
+        '/shows/bunny/vex'
+    """
+
+    def __init__(self, roots: List[SnippetRoot], backend: Optional[str] = None):
+        if not roots:
+            raise ValueError("No snippet roots given")
+        self.roots = roots
+        self.writable = None
+        if roots[0].writable:
+            library = root_library(roots[0].path)
+            if library is None:
+                backend = backend or snippet_backend()
+                library = backend, os.path.join(roots[0].path, LIBRARY_FILES[backend])
+            self.writable = open_snippet_store(library[1], library[0])
+        self.path = self.writable.path if self.writable else None
+        self.read_only_roots = [root.path for root in roots if not (root.writable and self.writable)]
+        self.origins: Dict[Tuple[str, str], str] = {}
+        self._signatures: Dict[str, Optional[tuple]] = {}
+        self._changes: List[dict] = []
+
+    def _root_signature(self, root: str) -> Optional[tuple]:
+        library = root_library(root)
+        return library and _signature(library[1])
+
+    def _writable_store(self) -> SnippetStore:
+        if self.writable is None:
+            raise PermissionError(f"No writable snippet root in: {', '.join(r.path for r in self.roots)}")
+        return self.writable
+
+    def _lower(self, category: str, name: str) -> Optional[dict]:
+        """The snippet a read-only root provides under an override, if any."""
+        for root in self.read_only_roots:
+            snippet = load_root(root)[1].get(category, {}).get(name)
+            if snippet is not None:
+                return snippet
+        return None
+
+    def exists(self) -> bool:
+        return (self.writable is not None and self.writable.exists()) or any(
+            root_library(root) for root in self.read_only_roots)
+
+    def load(self) -> SnippetData:
+        categories: List[str] = []
+        snippets: Dict[str, Dict[str, dict]] = {}
+        self.origins = {}
+        layers = [(root, load_root(root)) for root in reversed(self.read_only_roots)]
+        self._signatures = {root: self._root_signature(root) for root in self.read_only_roots}
+        if self.writable is not None and self.writable.exists():
+            layers.append((self.roots[0].path, self.writable.load()))
+
+        # Lowest precedence first, so higher roots overwrite
+        for root, (layer_categories, layer_snippets) in layers:
+            categories.extend(c for c in layer_categories if c not in categories)
+            for category, entries in layer_snippets.items():
+                if category not in categories:
+                    categories.append(category)
+                merged = snippets.setdefault(category, {})
+                for name, snippet in entries.items():
+                    merged[name] = snippet
+                    self.origins[(category, name)] = root
+        self._changes = []
+        return categories, snippets
+
+    def origin(self, category: str, name: str) -> Optional[str]:
+        """Root the visible version of a snippet comes from."""
+        return self.origins.get((category, name))
+
+    def poll(self) -> List[dict]:
+        if any(self._root_signature(root) != signature for root, signature in self._signatures.items()):
+            # A shared root changed on disk: re-merge (unchanged roots come from the cache)
+            self._changes = []
+            return [{"op": "reload"}]
+
+        changes = []
+        for change in self._changes + (self.writable.poll() if self.writable else []):
+            category, name = change.get("category"), change.get("name")
+            if change["op"] == "delete":
+                lower = self._lower(category, name)
+                if lower is not None:
+                    # Removing an override reveals the shared version
+                    change = {"op": "upsert", "category": category, "name": name, "snippet": lower}
+                    self.origins[(category, name)] = self._origin_below(category, name)
+                else:
+                    self.origins.pop((category, name), None)
+            elif change["op"] == "upsert" and self.writable is not None:
+                self.origins[(category, name)] = self.roots[0].path
+            elif change["op"] == "delete_category" and any(
+                    category in load_root(root)[1] for root in self.read_only_roots):
+                self._changes = []
+                return [{"op": "reload"}]
+            if change not in changes:
+                # Journaled stores also report the deletes queued here
+                changes.append(change)
+        self._changes = []
+        return changes
+
+    def _origin_below(self, category: str, name: str) -> Optional[str]:
+        for root in self.read_only_roots:
+            if name in load_root(root)[1].get(category, {}):
+                return root
+        return None
+
+    def save_all(self, categories, snippets) -> None:
+        """Write the categories and every snippet that differs from the read-only roots."""
+        own = {}
+        for category, entries in snippets.items():
+            for name, snippet in entries.items():
+                if self._lower(category, name) != snippet:
+                    own.setdefault(category, {})[name] = snippet
+        self._writable_store().save_all(categories, own)
+
+    def upsert_snippet(self, category, name, snippet) -> None:
+        self._writable_store().upsert_snippet(category, name, snippet)
+        self.origins[(category, name)] = self.roots[0].path
+
+    def delete_snippet(self, category, name) -> bool:
+        """Delete the writable root's version; False if the snippet only comes from read-only roots."""
+        store = self._writable_store()
+        if self.origins.get((category, name)) != self.roots[0].path:
+            return False
+        deleted = store.delete_snippet(category, name)
+        self._changes.append({"op": "delete", "category": category, "name": name})
+        return deleted
+
+    def add_category(self, category) -> None:
+        self._writable_store().add_category(category)
+
+    def delete_category(self, category) -> None:
+        self._writable_store().delete_category(category)
+        self._changes.append({"op": "delete_category", "category": category})
+
+    def close(self) -> None:
+        if self.writable is not None:
+            self.writable.close()
@@ -8,65 +8,171 @@ Author: BYVFX Tools
 """
 
 import hou
-import json
 import os
+import sqlite3
 from typing import Dict, List, Optional, Tuple
 from PySide2 import QtWidgets, QtCore, QtGui
 
+from byvfx.utils.vex_snippet_index import SnippetIndex
+from byvfx.utils.vex_snippet_layers import LayeredSnippetStore, snippet_roots
+from byvfx.utils.vex_snippet_store import (
+    JsonSnippetStore, SnippetStore, apply_change, open_snippet_store, snippet_backend
+)
+
 # Constants
 # Prefer storing under $BYVFX/scripts; fallback to Houdini user prefs if BYVFX is unavailable
 BYVFX_ROOT = hou.expandString("$BYVFX") or hou.getenv("BYVFX")
 if not BYVFX_ROOT or BYVFX_ROOT == "$BYVFX":
     BYVFX_ROOT = hou.getenv("HOUDINI_USER_PREF_DIR")
 
+VEX_SNIPPETS_DB = os.path.join(BYVFX_ROOT, "scripts", "vex_snippets.db")
 VEX_SNIPPETS_FILE = os.path.join(BYVFX_ROOT, "scripts", "vex_snippets.json")
 OLD_SNIPPETS_FILE = os.path.join(hou.getenv("HOUDINI_USER_PREF_DIR"), "scripts", "vex_snippets.json")
 
+SEARCH_DEBOUNCE_MS = 150
+# Best matches listed while searching
+SEARCH_RESULT_LIMIT = 2000
+
+
+def default_snippet_store() -> SnippetStore:
+    """Open the configured backend at its default location, or the layered roots of BYVFX_VEX_SNIPPETS_PATH."""
+    default_root = os.path.dirname(VEX_SNIPPETS_FILE)
+    roots = snippet_roots(default_root)
+    if len(roots) > 1 or roots[0].path != os.path.normpath(default_root):
+        return LayeredSnippetStore(roots)
+    backend = snippet_backend()
+    return open_snippet_store(VEX_SNIPPETS_DB if backend == "sqlite" else VEX_SNIPPETS_FILE, backend)
+
+
 class VEXSnippetManager:
     """Core class for managing VEX snippets data."""
     
-    def __init__(self):
+    def __init__(self, store: Optional[SnippetStore] = None):
         self.snippets_data = {}
         self.categories = []
+        self.store = store or default_snippet_store()
+        self._index = None
+        # Bumped on every change to snippets_data, so an index built from an
+        # older copy of the library is not installed
+        self._version = 0
+        # Why the last load failed; nothing is written to the store while set
+        self.load_error: Optional[str] = None
         self.load_snippets()
     
     def load_snippets(self) -> None:
-        """Load snippets from JSON file."""
+        """
+        Load snippets from the store.
+
+        If the store cannot be read (locked, corrupt or unreadable), the
+        error is kept in ``load_error`` and the library is shown empty; the
+        store is left untouched, and the next sync tries to load it again.
+        """
+        self.load_error = None
+        self._reset_index()
         try:
-            # Migrate from old location if needed
-            if not os.path.exists(VEX_SNIPPETS_FILE) and os.path.exists(OLD_SNIPPETS_FILE):
-                with open(OLD_SNIPPETS_FILE, 'r') as file:
-                    data = json.load(file)
-                    self.snippets_data = data.get("snippets", {})
-                    self.categories = data.get("categories", self._get_default_categories())
-                    # Save to new location
-                    self.save_snippets()
-                    return
-
-            if os.path.exists(VEX_SNIPPETS_FILE):
-                with open(VEX_SNIPPETS_FILE, 'r') as file:
-                    data = json.load(file)
-                    self.snippets_data = data.get("snippets", {})
-                    self.categories = data.get("categories", self._get_default_categories())
-            else:
+            # Migrate JSON libraries (current or old location) into a new store
+            if not self.store.exists():
+                for legacy_file in (VEX_SNIPPETS_FILE, OLD_SNIPPETS_FILE):
+                    if legacy_file != self.store.path and os.path.exists(legacy_file):
+                        # Read through JsonSnippetStore so unfolded journal edits come along
+                        self.categories, self.snippets_data = JsonSnippetStore(legacy_file).load()
+                        if not self.categories:
+                            self.categories = self._get_default_categories()
+                        self.save_snippets()
+                        print(f"Migrated VEX snippets from {legacy_file}")
+                        return
                 self._create_default_data()
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+                return
+
+            self.categories, self.snippets_data = self.store.load()
+            if not self.categories:
+                self.categories = self._get_default_categories()
+        except (OSError, ValueError, sqlite3.Error) as e:
+            # Never fall back to defaults here: saving them would replace the library
             print(f"Error loading VEX snippets: {e}")
-            self._create_default_data()
+            self.load_error = str(e)
+            self.categories, self.snippets_data = [], {}
+    
+    def _writable(self) -> bool:
+        """False (with a message) while the library failed to load."""
+        if self.load_error is None:
+            return True
+        print(f"VEX snippet library did not load, not writing to it: {self.load_error}")
+        return False
+    
+    @property
+    def index(self) -> SnippetIndex:
+        """
+        Search index, built here if nothing installed one. The UI builds it
+        on a worker instead (``index_source``/``install_index``).
+        """
+        if self._index is None:
+            self._index = SnippetIndex(self.snippets_data)
+        return self._index
+    
+    @property
+    def index_built(self) -> bool:
+        return self._index is not None
+    
+    def index_source(self) -> Tuple[int, Dict[str, Dict[str, dict]]]:
+        """
+        Library version and a copy of the snippets to build a SnippetIndex
+        from on another thread; edits here do not touch the copy.
+        """
+        return self._version, {category: dict(entries) for category, entries in self.snippets_data.items()}
+    
+    def install_index(self, version: int, index: SnippetIndex) -> bool:
+        """Use an index built from ``index_source``; False if the library changed since."""
+        if version != self._version:
+            return False
+        self._index = index
+        return True
+    
+    def _reset_index(self) -> None:
+        """Drop the index after snippets_data was replaced."""
+        self._index = None
+        self._version += 1
+    
+    def _update_index(self, change: dict) -> None:
+        """Apply an ``apply_change`` record to the index, if it is built."""
+        self._version += 1
+        if self._index is None:
+            return
+        if change["op"] == "upsert":
+            self._index.add(change["category"], change["name"], change["snippet"])
+        elif change["op"] == "delete":
+            self._index.remove(change["category"], change["name"])
+        elif change["op"] == "delete_category":
+            self._index.remove_category(change["category"])
+    
+    def sync(self) -> None:
+        """Replay edits other sessions made to a shared library since the last sync."""
+        if self.load_error is not None:
+            self.load_snippets()
+            return
+        
+        try:
+            changes = self.store.poll()
+        except (OSError, ValueError) as e:
+            print(f"Error reading VEX snippet changes: {e}")
+            return
+        
+        if any(change["op"] == "reload" for change in changes):
+            # The library was compacted or replaced; the store has the current state
+            self.load_snippets()
+            return
+        
+        for change in changes:
+            apply_change(self.categories, self.snippets_data, change)
+            self._update_index(change)
     
     def save_snippets(self) -> None:
-        """Save snippets to JSON file."""
+        """Write the whole in-memory library to the store."""
+        if not self._writable():
+            return
+        self._reset_index()
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(VEX_SNIPPETS_FILE), exist_ok=True)
-            
-            data = {
-                "categories": self.categories,
-                "snippets": self.snippets_data
-            }
-            
-            with open(VEX_SNIPPETS_FILE, 'w') as file:
-                json.dump(data, file, indent=4)
+            self.store.save_all(self.categories, self.snippets_data)
         except Exception as e:
             print(f"Error saving VEX snippets: {e}")
     
@@ -130,36 +236,68 @@ class VEXSnippetManager:
     
     def add_snippet(self, category: str, name: str, code: str, 
                    description: str = "", tags: List[str] = None) -> bool:
-        """Add a new snippet."""
+        """Add a new snippet, or replace one with the same category and name."""
         if tags is None:
             tags = []
         
+        self.sync()
+        if not self._writable():
+            return False
+        snippet = {
+            "code": code,
+            "description": description,
+            "tags": tags
+        }
+        try:
+            self.store.upsert_snippet(category, name, snippet)
+        except Exception as e:
+            print(f"Error saving VEX snippet: {e}")
+            return False
+        
         if category not in self.categories:
             self.categories.append(category)
         
         if category not in self.snippets_data:
             self.snippets_data[category] = {}
         
-        self.snippets_data[category][name] = {
-            "code": code,
-            "description": description,
-            "tags": tags
-        }
-        
-        self.save_snippets()
+        self.snippets_data[category][name] = snippet
+        self._update_index({"op": "upsert", "category": category, "name": name, "snippet": snippet})
+        self.sync()
+        return True
+    
+    def add_category(self, category: str) -> bool:
+        """Add an empty category; False if it already exists."""
+        self.sync()
+        if not self._writable() or category in self.categories:
+            return False
+        try:
+            self.store.add_category(category)
+        except Exception as e:
+            print(f"Error adding category: {e}")
+            return False
+        self.categories.append(category)
+        self.snippets_data.setdefault(category, {})
+        self.sync()
         return True
     
     def delete_snippet(self, category: str, name: str) -> bool:
         """Delete a snippet."""
+        self.sync()
+        if not self._writable():
+            return False
         try:
             if category in self.snippets_data and name in self.snippets_data[category]:
+                if not self.store.delete_snippet(category, name):
+                    # e.g. a snippet from a read-only show or department root
+                    return False
                 del self.snippets_data[category][name]
+                self._update_index({"op": "delete", "category": category, "name": name})
                 
                 # Remove empty categories
                 if not self.snippets_data[category]:
                     del self.snippets_data[category]
                 
-                self.save_snippets()
+                self.sync()
                 return True
         except Exception as e:
             print(f"Error deleting snippet: {e}")
@@ -167,58 +305,205 @@ class VEXSnippetManager:
     
     def get_snippet(self, category: str, name: str) -> Optional[Dict]:
         """Get a specific snippet."""
+        self.sync()
         if category in self.snippets_data and name in self.snippets_data[category]:
             return self.snippets_data[category][name]
         return None
     
-    def search_snippets(self, query: str) -> List[Tuple[str, str, Dict]]:
-        """Search snippets by name, description, or tags."""
-        results = []
-        query_lower = query.lower()
-        
-        for category, snippets in self.snippets_data.items():
-            for name, data in snippets.items():
-                # Search in name
-                if query_lower in name.lower():
-                    results.append((category, name, data))
-                    continue
-                
-                # Search in description
-                if query_lower in data.get("description", "").lower():
-                    results.append((category, name, data))
-                    continue
-                
-                # Search in tags
-                tags = data.get("tags", [])
-                if any(query_lower in tag.lower() for tag in tags):
-                    results.append((category, name, data))
-        
-        return results
+    def search_snippets(self, query: str, limit: Optional[int] = None,
+                        build_index: bool = True) -> Optional[List[Tuple[str, str, Dict]]]:
+        """
+        Search snippets by name, description, tags and code identifiers.
+
+        Terms match word prefixes and must all match; separate alternatives
+        with ``OR``. Name hits rank above tag, description and code hits.
+
+        Until the in-memory index is built, stores with their own index
+        (SQLite's FTS5 table) answer instead, so headless callers never
+        pay for building it. If neither can answer, the index is built
+        here, or None is returned when ``build_index`` is False.
+        """
+        self.sync()
+        keys = None
+        if self._index is None and self.load_error is None:
+            try:
+                keys = self.store.search(query, limit)
+            except sqlite3.Error as e:
+                print(f"Error searching VEX snippets: {e}")
+        if keys is None:
+            if self._index is None and not build_index:
+                return None
+            keys = self.index.search(query, limit)
+        # Skip rows written by another session since the last sync
+        return [(category, name, self.snippets_data[category][name])
+                for category, name in keys if name in self.snippets_data.get(category, {})]
     
     def delete_category(self, category: str) -> bool:
         """Delete an entire category and all its snippets."""
+        self.sync()
+        if not self._writable():
+            return False
         try:
+            self.store.delete_category(category)
+            
             if category in self.snippets_data:
                 del self.snippets_data[category]
+            self._update_index({"op": "delete_category", "category": category})
             
             if category in self.categories:
                 self.categories.remove(category)
             
-            self.save_snippets()
+            self.sync()
             return True
         except Exception as e:
             print(f"Error deleting category: {e}")
         return False
 
 
+class SnippetIndexSignals(QtCore.QObject):
+    """Signals of a SnippetIndexTask"""
+    finished = QtCore.Signal(int, object)  # library version, SnippetIndex
+
+
+class SnippetIndexTask(QtCore.QRunnable):
+    """Build the search index from ``VEXSnippetManager.index_source`` on a QThreadPool worker"""
+
+    def __init__(self, version: int, snippets_data: Dict[str, Dict[str, dict]]):
+        super(SnippetIndexTask, self).__init__()
+        self.version = version
+        self.snippets_data = snippets_data
+        self.cancelled = False
+        self.signals = SnippetIndexSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        index = SnippetIndex(self.snippets_data)
+        if self.cancelled:
+            return
+        index.warm()
+        if not self.cancelled:
+            self.signals.finished.emit(self.version, index)
+
+
+class SnippetTreeModel(QtCore.QAbstractItemModel):
+    """
+    Category/snippet tree over a VEXSnippetManager.
+
+    The model only holds category and snippet names. Search filtering is
+    done by the manager's index rather than a QSortFilterProxyModel, whose
+    filterAcceptsRow would be a Python call per snippet: ``set_filter``
+    swaps in the ranked matches grouped by category. Snippet code is not
+    touched until the UI asks the manager for the selected snippet.
+
+    Items carry the same UserRole tuples as the old tree widget items:
+    ``("category", category)`` and ``("snippet", category, name)``.
+    """
+
+    def __init__(self, manager: VEXSnippetManager, parent=None):
+        super(SnippetTreeModel, self).__init__(parent)
+        self.manager = manager
+        self.categories: List[str] = []
+        self.names: List[List[str]] = []
+        self.filter_text = ""
+
+    def set_filter(self, text: str = "") -> Optional[int]:
+        """
+        Show the snippets matching ``text`` (all when empty); returns the
+        snippet count, or None (showing nothing) while the index is built.
+        """
+        self.filter_text = text.strip()
+        categories, names = [], {}
+        results = []
+        if self.filter_text:
+            # Ranked results, grouped by category in order of each category's best hit
+            results = self.manager.search_snippets(self.filter_text, SEARCH_RESULT_LIMIT, build_index=False)
+            for category, name, _ in results or []:
+                if category not in names:
+                    categories.append(category)
+                    names[category] = []
+                names[category].append(name)
+        else:
+            # Every category, including empty ones
+            categories = list(self.manager.categories)
+            categories += [c for c in self.manager.snippets_data if c not in categories]
+            names = {c: sorted(self.manager.snippets_data.get(c, {})) for c in categories}
+
+        self.beginResetModel()
+        self.categories = categories
+        self.names = [names[category] for category in categories]
+        self.endResetModel()
+        if results is None:
+            return None
+        return sum(len(entries) for entries in self.names)
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        # internalId 0 marks a category; n marks a snippet of category row n - 1
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, parent.row() + 1)
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return len(self.categories)
+        if parent.internalId() == 0:
+            return len(self.names[parent.row()])
+        return 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return "VEX Snippets"
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        category_row = index.internalId() - 1
+        if category_row < 0:
+            category = self.categories[index.row()]
+            if role == QtCore.Qt.DisplayRole:
+                return f"{category} (Search Results)" if self.filter_text else category
+            if role == QtCore.Qt.UserRole:
+                return ("category", category)
+            return None
+        name = self.names[category_row][index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return name
+        if role == QtCore.Qt.UserRole:
+            return ("snippet", self.categories[category_row], name)
+        if role == QtCore.Qt.ToolTipRole:
+            return self.manager.store.origin(self.categories[category_row], name)
+        return None
+
+
 class VEXSnippetManagerUI(QtWidgets.QDialog):
     """UI for the VEX Snippet Manager."""
     
     def __init__(self, parent=None):
         super(VEXSnippetManagerUI, self).__init__(parent)
         self.manager = VEXSnippetManager()
+        # The search index is built here rather than on the first search,
+        # which would block the UI for seconds on a large library
+        self.thread_pool = QtCore.QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self._index_task = None
         self.setup_ui()
         self.populate_tree()
+        if self.manager.load_error is not None:
+            self.status_label.setText("Snippet library could not be loaded (read-only until it can)")
+            hou.ui.displayMessage(f"Could not load the VEX snippet library; it was left unchanged.\n\n"
+                                  f"{self.manager.load_error}", severity=hou.severityType.Error)
         
     def setup_ui(self) -> None:
         """Setup the user interface."""
@@ -234,10 +519,16 @@ class VEXSnippetManagerUI(QtWidgets.QDialog):
         search_layout.addWidget(QtWidgets.QLabel("Search:"))
         
         self.search_line = QtWidgets.QLineEdit()
-        self.search_line.setPlaceholderText("Search snippets...")
-        self.search_line.textChanged.connect(self.on_search)
+        self.search_line.setPlaceholderText("Search snippets (word prefixes, OR for alternatives)...")
         search_layout.addWidget(self.search_line)
         
+        # Filter once typing pauses rather than on every keystroke
+        self.search_timer = QtCore.QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.on_search)
+        self.search_line.textChanged.connect(self.search_timer.start)
+        
         self.search_clear_btn = QtWidgets.QPushButton("Clear")
         self.search_clear_btn.clicked.connect(self.clear_search)
         search_layout.addWidget(self.search_clear_btn)
@@ -250,10 +541,12 @@ class VEXSnippetManagerUI(QtWidgets.QDialog):
         # Left panel - snippet tree
         left_panel = QtWidgets.QVBoxLayout()
         
-        # Tree widget
-        self.tree = QtWidgets.QTreeWidget()
-        self.tree.setHeaderLabel("VEX Snippets")
-        self.tree.itemClicked.connect(self.on_snippet_selected)
+        # Tree view
+        self.tree_model = SnippetTreeModel(self.manager, self)
+        self.tree = QtWidgets.QTreeView()
+        self.tree.setModel(self.tree_model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.selectionModel().currentChanged.connect(self.on_snippet_selected)
         self.tree.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.show_context_menu)
         left_panel.addWidget(self.tree)
@@ -341,27 +634,50 @@ class VEXSnippetManagerUI(QtWidgets.QDialog):
         self.status_label = QtWidgets.QLabel("Ready")
         layout.addWidget(self.status_label)
     
+    def build_index(self) -> None:
+        """Build the manager's search index on the thread pool, unless built or building."""
+        if self.manager.index_built or self.manager.load_error is not None:
+            return
+        version, snippets_data = self.manager.index_source()
+        if self._index_task is not None:
+            if self._index_task.version == version:
+                return
+            self._index_task.cancel()
+        self._index_task = SnippetIndexTask(version, snippets_data)
+        self._index_task.signals.finished.connect(self.on_index_built)
+        self.thread_pool.start(self._index_task)
+    
+    def on_index_built(self, version: int, index: SnippetIndex) -> None:
+        """Install a finished index, or start again if the library changed while it was built."""
+        if self._index_task is None or self._index_task.version != version:
+            return # Superseded
+        self._index_task = None
+        if not self.manager.install_index(version, index):
+            self.build_index()
+            return
+        if self.tree_model.filter_text:
+            self.populate_tree()
+    
     def populate_tree(self) -> None:
-        """Populate the tree widget with snippets."""
-        self.tree.clear()
-        
-        for category in self.manager.categories:
-            # Create category item regardless of whether it has snippets
-            category_item = QtWidgets.QTreeWidgetItem(self.tree, [category])
-            category_item.setData(0, QtCore.Qt.UserRole, ("category", category))
-            
-            # Add snippets if the category exists in snippets_data
-            if category in self.manager.snippets_data:
-                snippets = self.manager.snippets_data[category]
-                for snippet_name in sorted(snippets.keys()):
-                    snippet_item = QtWidgets.QTreeWidgetItem(category_item, [snippet_name])
-                    snippet_item.setData(0, QtCore.Qt.UserRole, ("snippet", category, snippet_name))
-        
+        """Refresh the tree from the manager, keeping the current search."""
+        self.manager.sync()
+        # A reload drops the index
+        self.build_index()
+        self.search_timer.stop()
+        count = self.tree_model.set_filter(self.search_line.text())
         self.tree.expandAll()
+        if count is None:
+            self.status_label.setText("Indexing snippets...")
+        elif self.tree_model.filter_text and not count:
+            self.status_label.setText("No results found")
+        elif self.tree_model.filter_text:
+            self.status_label.setText(f"{count} matching snippets")
+        else:
+            self.status_label.setText("Ready")
     
-    def on_snippet_selected(self, item: QtWidgets.QTreeWidgetItem, column: int) -> None:
-        """Handle snippet selection."""
-        data = item.data(0, QtCore.Qt.UserRole)
+    def on_snippet_selected(self, current: QtCore.QModelIndex, previous: QtCore.QModelIndex) -> None:
+        """Handle snippet selection; the snippet's code is fetched only now."""
+        data = current.data(QtCore.Qt.UserRole) if current.isValid() else None
         
         if data and data[0] == "snippet":
             _, category, name = data
@@ -413,34 +729,9 @@ class VEXSnippetManagerUI(QtWidgets.QDialog):
             self.status_label.setText("Code copied to clipboard!")
             QtCore.QTimer.singleShot(2000, lambda: self.status_label.setText("Ready"))
     
-    def on_search(self, text: str) -> None:
-        """Handle search input."""
-        if not text.strip():
-            self.populate_tree()
-            return
-        
-        self.tree.clear()
-        results = self.manager.search_snippets(text)
-        
-        if results:
-            # Group results by category
-            categories = {}
-            for category, name, data in results:
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append((name, data))
-            
-            for category, snippets in categories.items():
-                category_item = QtWidgets.QTreeWidgetItem(self.tree, [f"{category} (Search Results)"])
-                category_item.setData(0, QtCore.Qt.UserRole, ("category", category))
-                
-                for name, data in snippets:
-                    snippet_item = QtWidgets.QTreeWidgetItem(category_item, [name])
-                    snippet_item.setData(0, QtCore.Qt.UserRole, ("snippet", category, name))
-            
-            self.tree.expandAll()
-        else:
-            QtWidgets.QTreeWidgetItem(self.tree, ["No results found"])
+    def on_search(self) -> None:
+        """Apply the search text once typing has paused."""
+        self.populate_tree()
     
     def clear_search(self) -> None:
         """Clear the search and repopulate tree."""
@@ -473,12 +764,7 @@ class VEXSnippetManagerUI(QtWidgets.QDialog):
         )
         
         if ok and text.strip():
-            if text not in self.manager.categories:
-                self.manager.categories.append(text)
-                # Initialize empty category in snippets_data
-                if text not in self.manager.snippets_data:
-                    self.manager.snippets_data[text] = {}
-                self.manager.save_snippets()
+            if self.manager.add_category(text):
                 self.populate_tree()  # Refresh the tree to show new category
                 self.status_label.setText(f"Category '{text}' added!")
                 QtCore.QTimer.singleShot(2000, lambda: self.status_label.setText("Ready"))
@@ -590,11 +876,11 @@ class VEXSnippetManagerUI(QtWidgets.QDialog):
     
     def show_context_menu(self, position: QtCore.QPoint) -> None:
         """Show context menu for tree items."""
-        item = self.tree.itemAt(position)
-        if not item:
+        index = self.tree.indexAt(position)
+        if not index.isValid():
             return
         
-        data = item.data(0, QtCore.Qt.UserRole)
+        data = index.data(QtCore.Qt.UserRole)
         if not data:
             return
         
@@ -613,7 +899,7 @@ class VEXSnippetManagerUI(QtWidgets.QDialog):
             copy_action = menu.addAction("Copy Code")
             copy_action.triggered.connect(self.copy_to_clipboard)
         
-        menu.exec_(self.tree.mapToGlobal(position))
+        menu.exec_(self.tree.viewport().mapToGlobal(position))
     
     def delete_snippet(self, category: str, name: str) -> None:
         """Delete a snippet with confirmation."""
@@ -630,6 +916,13 @@ class VEXSnippetManagerUI(QtWidgets.QDialog):
                 self.clear_selection()
                 self.status_label.setText("Snippet deleted successfully!")
                 QtCore.QTimer.singleShot(2000, lambda: self.status_label.setText("Ready"))
+    
+    def closeEvent(self, event):
+        """Drop an index build in flight so it does not land on a closed dialog."""
+        if self._index_task is not None:
+            self._index_task.cancel()
+            self._index_task = None
+        super(VEXSnippetManagerUI, self).closeEvent(event)
 
 
 class VEXSnippetDialog(QtWidgets.QDialog):
@@ -0,0 +1,723 @@
+"""
+Storage backends for the VEX Snippet Manager.
+
+``VEXSnippetManager`` talks to a ``SnippetStore`` instead of a JSON file:
+
+* ``SqliteSnippetStore`` (default) keeps one row per snippet, so adding,
+  editing or deleting a snippet is a single upsert/delete rather than a
+  rewrite of the whole library. An FTS5 index over name, description,
+  tags and code answers searches without loading every snippet.
+* ``JsonSnippetStore`` keeps the original ``vex_snippets.json`` format as
+  a snapshot plus an append-only journal of edits, so several sessions
+  can share one library without overwriting each other. Useful for
+  hand-edited or version-controlled libraries.
+
+The backend is picked by ``VEX_SNIPPETS_BACKEND`` in
+``byvfx.config.defaults`` (env ``BYVFX_VEX_SNIPPETS_BACKEND``). No Qt or
+hou imports. Query syntax is shared with ``vex_snippet_index``, which
+searches libraries that are already loaded.
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from byvfx.config import defaults
+from byvfx.utils.vex_snippet_index import FIELD_WEIGHTS, SnippetKey, parse_query
+
+# (categories in display order, {category: {name: snippet dict}})
+SnippetData = Tuple[List[str], Dict[str, Dict[str, dict]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snippets (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    code TEXT NOT NULL,
+    description TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    UNIQUE (category, name)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    category TEXT,
+    name TEXT
+);
+CREATE TRIGGER IF NOT EXISTS snippets_changes_insert AFTER INSERT ON snippets BEGIN
+    INSERT INTO changes (op, category, name) VALUES ('upsert', new.category, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS snippets_changes_update AFTER UPDATE ON snippets BEGIN
+    INSERT INTO changes (op, category, name)
+    SELECT 'delete', old.category, old.name
+    WHERE old.category IS NOT new.category OR old.name IS NOT new.name;
+    INSERT INTO changes (op, category, name) VALUES ('upsert', new.category, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS snippets_changes_delete AFTER DELETE ON snippets BEGIN
+    INSERT INTO changes (op, category, name) VALUES ('delete', old.category, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS categories_changes_insert AFTER INSERT ON categories BEGIN
+    INSERT INTO changes (op, category) VALUES ('add_category', new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS categories_changes_delete AFTER DELETE ON categories BEGIN
+    INSERT INTO changes (op, category) VALUES ('delete_category', old.name);
+END;
+"""
+
+# Word tokens like the in-memory index; the 1 and 2 character prefix
+# indexes keep the first keystrokes of a search from scanning the vocabulary
+_FTS_OPTIONS = "tokenize='unicode61', prefix='1 2'"
+
+# External-content FTS table kept in sync with ``snippets`` by triggers
+_FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS snippets_fts USING fts5(
+    name, description, tags, code,
+    content='snippets', content_rowid='id', {_FTS_OPTIONS}
+);
+CREATE TRIGGER IF NOT EXISTS snippets_ai AFTER INSERT ON snippets BEGIN
+    INSERT INTO snippets_fts(rowid, name, description, tags, code)
+    VALUES (new.id, new.name, new.description, new.tags, new.code);
+END;
+CREATE TRIGGER IF NOT EXISTS snippets_ad AFTER DELETE ON snippets BEGIN
+    INSERT INTO snippets_fts(snippets_fts, rowid, name, description, tags, code)
+    VALUES ('delete', old.id, old.name, old.description, old.tags, old.code);
+END;
+CREATE TRIGGER IF NOT EXISTS snippets_au AFTER UPDATE ON snippets BEGIN
+    INSERT INTO snippets_fts(snippets_fts, rowid, name, description, tags, code)
+    VALUES ('delete', old.id, old.name, old.description, old.tags, old.code);
+    INSERT INTO snippets_fts(rowid, name, description, tags, code)
+    VALUES (new.id, new.name, new.description, new.tags, new.code);
+END;
+"""
+
+# Libraries from older versions may have an FTS table with other options
+# (the trigram tokenizer); it is dropped and rebuilt from ``snippets``
+_DROP_FTS = """
+DROP TRIGGER IF EXISTS snippets_ai;
+DROP TRIGGER IF EXISTS snippets_ad;
+DROP TRIGGER IF EXISTS snippets_au;
+DROP TABLE IF EXISTS snippets_fts;
+"""
+
+# Rows kept in the ``changes`` table; a session that falls further behind
+# reloads the whole library instead of replaying
+KEEP_CHANGES = 1000
+
+# PRAGMA user_version of a library that has been created or migrated. It
+# survives deleting every snippet and category, so an emptied library is
+# not mistaken for a new one and migrated again
+INITIALIZED_VERSION = 1
+
+# Tags are stored one per line (the dialog splits them on commas), so the
+# column holds plain words rather than JSON punctuation
+TAG_SEPARATOR = "\n"
+
+# bm25 column weights in FTS column order, matching the in-memory ranking
+_FTS_WEIGHTS = ", ".join(str(FIELD_WEIGHTS[field]) for field in ("name", "description", "tags", "code"))
+
+
+def _snippet(code: str, description: str, tags: str) -> dict:
+    return {"code": code, "description": description, "tags": tags.split(TAG_SEPARATOR) if tags else []}
+
+
+class SnippetStore:
+    """
+    Interface of a snippet storage backend.
+
+    Every method that changes the library must persist the change before
+    returning.
+    """
+
+    path = None
+
+    def exists(self) -> bool:
+        """False if the library was never created (used to trigger migration); an emptied library exists."""
+        raise NotImplementedError
+
+    def load(self) -> SnippetData:
+        raise NotImplementedError
+
+    def save_all(self, categories: List[str], snippets: Dict[str, Dict[str, dict]]) -> None:
+        """Replace the whole library."""
+        raise NotImplementedError
+
+    def upsert_snippet(self, category: str, name: str, snippet: dict) -> None:
+        """Insert or replace one snippet, adding its category if needed."""
+        raise NotImplementedError
+
+    def delete_snippet(self, category: str, name: str) -> bool:
+        raise NotImplementedError
+
+    def add_category(self, category: str) -> None:
+        raise NotImplementedError
+
+    def delete_category(self, category: str) -> None:
+        """Delete a category and every snippet in it."""
+        raise NotImplementedError
+
+    def search(self, query: str, limit: Optional[int] = None) -> Optional[List[SnippetKey]]:
+        """
+        Ranked ``(category, name)`` matches for a ``vex_snippet_index`` query,
+        or None if the store has no index and the caller should search the
+        loaded snippets itself.
+        """
+        return None
+
+    def origin(self, category: str, name: str) -> Optional[str]:
+        """Where a snippet is stored, for stores that combine several libraries."""
+        return None
+
+    def poll(self) -> List[dict]:
+        """
+        Changes to replay since the last ``load``/``poll``, oldest first.
+
+        Records are ``apply_change`` dicts, or ``{"op": "reload"}`` when the
+        caller should reload everything. Stores that are always current
+        return an empty list.
+        """
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+class FileLock:
+    """
+    Advisory lock held on ``<path>.lock`` for the duration of a ``with`` block.
+
+    Shared locks allow concurrent readers on POSIX; on Windows every lock
+    is exclusive. Like SQLite's busy timeout, a lock held elsewhere is
+    retried for up to ``timeout`` seconds, then ``TimeoutError`` is raised.
+
+    Args:
+        path (str): File being protected
+        shared (bool): Take a shared (read) lock
+        timeout (float): Seconds to wait for another process's lock
+    """
+
+    RETRY_INTERVAL = 0.05
+
+    def __init__(self, path: str, shared: bool = False, timeout: float = 10.0):
+        self.lock_path = path + ".lock"
+        self.shared = shared
+        self.timeout = timeout
+        self.file = None
+
+    def _try_lock(self) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), (fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+        self.file = open(self.lock_path, "a+b")
+        try:
+            deadline = time.monotonic() + self.timeout
+            while not self._try_lock():
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out after {self.timeout}s waiting for {self.lock_path}")
+                time.sleep(self.RETRY_INTERVAL)
+        except BaseException:
+            self.file.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.file.close()
+            self.file = None
+
+
+def apply_change(categories: List[str], snippets: Dict[str, Dict[str, dict]], change: dict) -> None:
+    """Apply one journal record to an in-memory library."""
+    op = change.get("op")
+    category = change.get("category")
+    if op == "upsert":
+        if category not in categories:
+            categories.append(category)
+        snippets.setdefault(category, {})[change["name"]] = change["snippet"]
+    elif op == "delete":
+        entries = snippets.get(category, {})
+        entries.pop(change["name"], None)
+        if category in snippets and not entries:
+            del snippets[category]
+    elif op == "add_category":
+        if category not in categories:
+            categories.append(category)
+    elif op == "delete_category":
+        snippets.pop(category, None)
+        if category in categories:
+            categories.remove(category)
+    else:
+        raise ValueError(f"Unknown snippet journal record: {op}")
+
+
+class JsonSnippetStore(SnippetStore):
+    """
+    JSON library shared by several sessions through an append-only journal.
+
+    ``vex_snippets.json`` holds a compacted snapshot in the original format.
+    Every edit is appended as one JSON line to ``vex_snippets.json.journal``
+    under an exclusive ``FileLock``, so sessions no longer overwrite each
+    other's changes. ``poll`` replays only the journal lines written since
+    the last call (by this or any other session). Once the journal grows
+    past ``compact_records`` lines it is folded into a new snapshot, written
+    to a temp file and renamed over the old one, then truncated.
+
+    A crash mid-append leaves at most a partial last line, which readers
+    ignore and the next writer cuts off; a crash between the rename and
+    the truncate only replays edits the snapshot already contains.
+
+    Args:
+        path (str): ``vex_snippets.json`` path
+        compact_records (int): Journal lines that trigger compaction
+        read_only (bool): Never lock or write (libraries in read-only roots)
+        timeout (float): Seconds to wait for another session's lock
+    """
+
+    COMPACT_RECORDS = 500
+
+    def __init__(self, path: str, compact_records: int = COMPACT_RECORDS, read_only: bool = False,
+                 timeout: float = 10.0):
+        self.path = path
+        self.timeout = timeout
+        self.journal_path = path + ".journal"
+        self.compact_records = compact_records
+        self.read_only = read_only
+        self.categories: List[str] = []
+        self.snippets: Dict[str, Dict[str, dict]] = {}
+        self._snapshot_id = None
+        self._offset = 0
+        self._records = 0
+        self._changes: List[dict] = []
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path) or os.path.exists(self.journal_path)
+
+    # ─── Reading ────────────────────────────────────────────────────
+
+    def _stat_snapshot(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            return 0
+
+    def _read_snapshot(self) -> None:
+        self._snapshot_id = self._stat_snapshot()
+        self._offset = 0
+        self._records = 0
+        if self._snapshot_id is None:
+            self.categories, self.snippets = [], {}
+            return
+        with open(self.path, 'r') as file:
+            data = json.load(file)
+        self.categories = list(data.get("categories", []))
+        self.snippets = {category: dict(entries) for category, entries in data.get("snippets", {}).items()}
+
+    def _read_journal(self) -> List[dict]:
+        """Apply complete journal lines past our offset; a partial last line is left for later."""
+        if self._journal_size() <= self._offset:
+            return []
+        with open(self.journal_path, 'rb') as file:
+            file.seek(self._offset)
+            data = file.read()
+        end = data.rfind(b"\n") + 1
+        changes = []
+        for line in data[:end].splitlines():
+            try:
+                change = json.loads(line)
+                apply_change(self.categories, self.snippets, change)
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Skipping bad VEX snippet journal record: {e}")
+                continue
+            changes.append(change)
+        self._offset += end
+        self._records += data.count(b"\n", 0, end)
+        return changes
+
+    def _refresh(self) -> None:
+        """Catch up with the files; call with the lock held."""
+        if self._stat_snapshot() != self._snapshot_id or self._journal_size() < self._offset:
+            # Compacted (or replaced) by another session: start over
+            self._read_snapshot()
+            self._read_journal()
+            self._changes = [{"op": "reload"}]
+        else:
+            self._changes.extend(self._read_journal())
+
+    def _lock(self, shared: bool = False):
+        if self.read_only:
+            if not shared:
+                raise PermissionError(f"Snippet library is read-only: {self.path}")
+            # No lock file in a read-only root; a torn or replayed journal line is harmless
+            return contextlib.nullcontext()
+        return FileLock(self.path, shared=shared, timeout=self.timeout)
+
+    def load(self) -> SnippetData:
+        with self._lock(shared=True):
+            self._read_snapshot()
+            self._read_journal()
+        self._changes = []
+        return list(self.categories), {category: dict(entries) for category, entries in self.snippets.items()}
+
+    def poll(self) -> List[dict]:
+        if (not self._changes and self._stat_snapshot() == self._snapshot_id
+                and self._journal_size() == self._offset):
+            return []
+        with self._lock(shared=True):
+            self._refresh()
+        changes, self._changes = self._changes, []
+        return changes
+
+    # ─── Writing ────────────────────────────────────────────────────
+
+    def _append(self, change: dict) -> None:
+        line = json.dumps(change).encode("utf-8") + b"\n"
+        with self._lock():
+            self._refresh()
+            with open(self.journal_path, 'ab') as file:
+                # Cut off a partial line left by a writer that crashed
+                if file.tell() > self._offset:
+                    file.truncate(self._offset)
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+            self._offset += len(line)
+            self._records += 1
+            apply_change(self.categories, self.snippets, change)
+            self._changes.append(change)
+            if self._records >= self.compact_records:
+                self._compact()
+
+    def _compact(self) -> None:
+        """Write the current library as the new snapshot; call with the lock held."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump({"categories": self.categories, "snippets": self.snippets}, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r+b') as file:
+                file.truncate(0)
+        self._snapshot_id = self._stat_snapshot()
+        self._offset = 0
+        self._records = 0
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot now."""
+        with self._lock():
+            self._refresh()
+            self._compact()
+
+    def save_all(self, categories, snippets) -> None:
+        with self._lock():
+            self.categories = list(categories)
+            self.snippets = {category: dict(entries) for category, entries in snippets.items()}
+            self._compact()
+            self._changes = []
+
+    def upsert_snippet(self, category, name, snippet) -> None:
+        self._append({"op": "upsert", "category": category, "name": name, "snippet": snippet})
+
+    def delete_snippet(self, category, name) -> bool:
+        self._append({"op": "delete", "category": category, "name": name})
+        return True
+
+    def add_category(self, category) -> None:
+        self._append({"op": "add_category", "category": category})
+
+    def delete_category(self, category) -> None:
+        self._append({"op": "delete_category", "category": category})
+
+
+class SqliteSnippetStore(SnippetStore):
+    """
+    Row-per-snippet SQLite library shared by several sessions.
+
+    Triggers on ``snippets`` and ``categories`` log every edit to a
+    ``changes`` table, by this or any other connection. ``poll`` checks
+    ``PRAGMA data_version`` (which only moves when another connection
+    commits) and then replays the change rows past the last one it saw.
+    ``save_all`` logs a single reload instead of a row per snippet, and
+    only the newest ``KEEP_CHANGES`` rows are kept.
+
+    An FTS5 table, also kept current by triggers, answers ``search``
+    without loading the library (None if this SQLite has no FTS5).
+
+    Args:
+        path (str): Database file (created if missing)
+        timeout (float): Seconds to wait for another process's write lock
+        read_only (bool): Open an existing database read-only
+
+    Example:
+        >>> store = SqliteSnippetStore("vex_snippets.db")
+        >>> store.upsert_snippet("Noise Functions", "Curl", {"code": "v@v = curlnoise(@P);"})
+        >>> store.search("curl")
+        [('Noise Functions', 'Curl')]
+    """
+
+    def __init__(self, path: str, timeout: float = 10.0, read_only: bool = False):
+        self.path = path
+        self.read_only = read_only
+        self._last_seq = None
+        self._data_version = None
+        if read_only:
+            uri = "file:" + urllib.request.pathname2url(os.path.abspath(path)) + "?mode=ro"
+            self.connection = sqlite3.connect(uri, timeout=timeout, uri=True)
+            self.has_fts = self._fts_schema() is not None
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=timeout)
+        self.connection.executescript(_SCHEMA)
+        self.has_fts = self._create_fts()
+        # Libraries from before user_version was set are initialized if they have rows
+        if not self._initialized() and self._has_rows():
+            with self.connection:
+                self._mark_initialized()
+
+    def _fts_schema(self) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'snippets_fts'").fetchone()
+        return row[0] if row else None
+
+    def _create_fts(self) -> bool:
+        schema = self._fts_schema()
+        if schema is not None and _FTS_OPTIONS in schema:
+            return True
+        try:
+            with self.connection:
+                self.connection.executescript("BEGIN;" + _DROP_FTS + _FTS_SCHEMA)
+                self.connection.execute("INSERT INTO snippets_fts(snippets_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            # No FTS5 in this SQLite build: the manager searches in memory
+            print(f"VEX snippet full-text index unavailable: {e}")
+            return False
+        return True
+
+    def _has_rows(self) -> bool:
+        return self.connection.execute(
+            "SELECT EXISTS (SELECT 1 FROM categories) OR EXISTS (SELECT 1 FROM snippets)").fetchone()[0] == 1
+
+    def _initialized(self) -> bool:
+        return self.connection.execute("PRAGMA user_version").fetchone()[0] >= INITIALIZED_VERSION
+
+    def _mark_initialized(self) -> None:
+        """Record that the library was created; call inside the writing transaction."""
+        self.connection.execute(f"PRAGMA user_version = {INITIALIZED_VERSION}")
+
+    def exists(self) -> bool:
+        return self._initialized() or self._has_rows()
+
+    def _changes_seq(self) -> Optional[int]:
+        """Newest change row, 0 if none; None if the library predates change tracking."""
+        try:
+            return self.connection.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+        except sqlite3.OperationalError:
+            return None # Read-only library without a changes table
+
+    def _get_snippet(self, category: str, name: str) -> Optional[dict]:
+        row = self.connection.execute(
+            "SELECT code, description, tags FROM snippets WHERE category = ? AND name = ?",
+            (category, name)).fetchone()
+        return _snippet(*row) if row else None
+
+    def load(self) -> SnippetData:
+        # Read the position first: a change committed while loading is
+        # replayed by the next poll rather than missed
+        self._data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        self._last_seq = self._changes_seq()
+        categories = [row[0] for row in self.connection.execute(
+            "SELECT name FROM categories ORDER BY position")]
+        snippets = {}
+        for category, name, code, description, tags in self.connection.execute(
+                "SELECT category, name, code, description, tags FROM snippets ORDER BY category, name"):
+            snippets.setdefault(category, {})[name] = _snippet(code, description, tags)
+        return categories, snippets
+
+    def _add_category(self, category: str) -> None:
+        self.connection.execute(
+            "INSERT OR IGNORE INTO categories (name, position) "
+            "SELECT ?, COALESCE(MAX(position) + 1, 0) FROM categories", (category,))
+
+    def poll(self) -> List[dict]:
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if self._last_seq is None:
+            # Not loaded through this store (e.g. only written to): follow changes from here
+            self._data_version = data_version
+            self._last_seq = self._changes_seq()
+            return []
+        if data_version == self._data_version:
+            return [] # No commits by other connections
+        self._data_version = data_version
+
+        last_seq = self._last_seq
+        first_seq = self.connection.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+        rows = self.connection.execute(
+            "SELECT seq, op, category, name FROM changes WHERE seq > ? ORDER BY seq", (last_seq,)).fetchall()
+        if not rows:
+            return []
+        self._last_seq = rows[-1][0]
+        if first_seq > last_seq + 1 or any(row[1] == "reload" for row in rows):
+            # Pruned past our position, or the library was replaced
+            return [{"op": "reload"}]
+
+        changes = []
+        for _, op, category, name in rows:
+            if op != "upsert":
+                changes.append({"op": op, "category": category, "name": name} if name is not None
+                               else {"op": op, "category": category})
+                continue
+            # Upserts are replayed with the current row; one deleted since
+            # is followed by its delete
+            snippet = self._get_snippet(category, name)
+            if snippet is not None:
+                changes.append({"op": "upsert", "category": category, "name": name, "snippet": snippet})
+        return changes
+
+    def _upsert(self, category: str, name: str, snippet: dict) -> None:
+        self.connection.execute(
+            "INSERT INTO snippets (category, name, code, description, tags) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (category, name) DO UPDATE SET "
+            "code = excluded.code, description = excluded.description, tags = excluded.tags",
+            (category, name, snippet.get("code", ""), snippet.get("description", ""),
+             TAG_SEPARATOR.join(snippet.get("tags") or [])))
+
+    def _end_write(self, replaced: bool = False) -> None:
+        """
+        Prune old change rows and move past the ones just written; call
+        inside the writing transaction, which keeps other writers out.
+
+        Our own rows are only skipped if no other connection committed since
+        the last load/poll (their rows would be skipped with them), or if the
+        whole library was just replaced.
+        """
+        self.connection.execute(
+            "DELETE FROM changes WHERE seq <= (SELECT MAX(seq) FROM changes) - ?", (KEEP_CHANGES,))
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if replaced or (self._last_seq is not None and data_version == self._data_version):
+            self._data_version = data_version
+            self._last_seq = self._changes_seq()
+
+    def save_all(self, categories, snippets) -> None:
+        with self.connection:
+            self._mark_initialized()
+            # One reload record instead of a delete and an upsert per snippet
+            first_seq = self._changes_seq() + 1
+            self.connection.execute("DELETE FROM snippets")
+            self.connection.execute("DELETE FROM categories")
+            for category in list(categories) + [c for c in snippets if c not in categories]:
+                self._add_category(category)
+            for category, entries in snippets.items():
+                for name, snippet in entries.items():
+                    self._upsert(category, name, snippet)
+            self.connection.execute("DELETE FROM changes WHERE seq >= ?", (first_seq,))
+            self.connection.execute("INSERT INTO changes (op) VALUES ('reload')")
+            self._end_write(replaced=True)
+
+    def upsert_snippet(self, category, name, snippet) -> None:
+        with self.connection:
+            self._mark_initialized()
+            self._add_category(category)
+            self._upsert(category, name, snippet)
+            self._end_write()
+
+    def delete_snippet(self, category, name) -> bool:
+        with self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM snippets WHERE category = ? AND name = ?", (category, name))
+            self._end_write()
+        return cursor.rowcount > 0
+
+    def add_category(self, category) -> None:
+        with self.connection:
+            self._mark_initialized()
+            self._add_category(category)
+            self._end_write()
+
+    def delete_category(self, category) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM snippets WHERE category = ?", (category,))
+            self.connection.execute("DELETE FROM categories WHERE name = ?", (category,))
+            self._end_write()
+
+    def search(self, query, limit=None) -> Optional[List[SnippetKey]]:
+        """Word-prefix search ranked by bm25 with the index's field weights."""
+        if not self.has_fts:
+            return None
+        groups = parse_query(query)
+        if not groups:
+            return []
+        # Terms are [a-z0-9_]+; quoting lets the tokenizer split snake_case
+        # terms into a phrase, as the index splits them into parts
+        fts_query = " OR ".join(
+            "(" + " AND ".join(f'"{term}"*' for term in terms) + ")" for terms in groups)
+        return self.connection.execute(
+            "SELECT s.category, s.name FROM snippets_fts JOIN snippets s ON s.id = snippets_fts.rowid "
+            f"WHERE snippets_fts MATCH ? ORDER BY bm25(snippets_fts, {_FTS_WEIGHTS}), s.category, s.name "
+            "LIMIT ?", (fts_query, -1 if limit is None else limit)).fetchall()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+SNIPPET_STORES = {
+    "sqlite": SqliteSnippetStore,
+    "json": JsonSnippetStore,
+}
+
+
+def snippet_backend() -> str:
+    """Configured backend name: ``sqlite`` or ``json``."""
+    backend = os.environ.get("BYVFX_VEX_SNIPPETS_BACKEND", defaults.VEX_SNIPPETS_BACKEND).strip().lower()
+    if backend not in SNIPPET_STORES:
+        print(f"Unknown VEX snippet backend '{backend}', using sqlite")
+        return "sqlite"
+    return backend
+
+
+def open_snippet_store(path: str, backend: Optional[str] = None) -> SnippetStore:
+    """
+    Open a snippet library.
+
+    Args:
+        path (str): Library file
+        backend (str): ``sqlite`` or ``json``; default from the settings
+    """
+    return SNIPPET_STORES[backend or snippet_backend()](path)
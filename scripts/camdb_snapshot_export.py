@@ -0,0 +1,23 @@
+import argparse
+import time
+from byvfx.utils.camdb_snapshot import export_snapshot
+
+# Export the full CamDB camera and sensor catalog into one snapshot file.
+# Point BYVFX_CAMDB_SNAPSHOT at the output so every CamDB panel loads it at
+# startup instead of calling the API. Runs from plain Python or hython,
+# e.g. as a nightly job.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a CamDB snapshot for the studio.")
+    parser.add_argument("output", help="Snapshot file, e.g. /studio/pipeline/camdb/camdb_snapshot.json.gz")
+    parser.add_argument("--no-sensors", action="store_true", help="Cameras only")
+    parser.add_argument("--connections", type=int, default=4, help="Parallel connections for sensors")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    snapshot = export_snapshot(args.output, include_sensors=not args.no_sensors, connections=args.connections)
+
+    print("Snapshot version: ", snapshot.version)
+    print("Cameras: ", len(snapshot.cameras))
+    print("Cameras with sensors: ", len(snapshot.sensors))
+    print("Time taken: ", time.time() - start_time, "seconds")
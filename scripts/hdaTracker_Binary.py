@@ -1,25 +1,45 @@
+import argparse
 import csv
 import re
+import time
+from byvfx.tools.hda_tracker.mmap_scanner import HDA_NAME_PATTERN, scan_files
 
-# Your HIP file path
+# Default HIP file path, used when no files are given on the command line
 HIP_FILE_PATH = r"E:\_houdiniFiles\hdaTrackerTest.hip"
 
-with open(HIP_FILE_PATH, "r", errors="replace") as f:
-    content = f.read()
+parser = argparse.ArgumentParser(description="Regex-scan .hip files for HDA names without loading them.")
+parser.add_argument("files", nargs="*", default=[HIP_FILE_PATH], help=".hip files to scan")
+parser.add_argument("-o", "--output", default="hda_names.csv", help="CSV file to write")
+parser.add_argument("--pattern", help="Custom regex; group 1 is reported if present")
+parser.add_argument("--include-binary", action="store_true",
+                    help="Also scan binary payload entries (embedded geometry)")
+args = parser.parse_args()
 
-# Regular expression pattern to detect HDA names within { ... } brackets.
-pattern = re.compile(r'{\s*name\s+([A-Za-z0-9_]+::\d+\.\d+)', re.IGNORECASE | re.DOTALL)
+pattern = re.compile(args.pattern.encode(), re.IGNORECASE | re.DOTALL) if args.pattern else HDA_NAME_PATTERN
 
-hda_names = pattern.findall(content)
+total_names = 0
+total_bytes = 0
+start_time = time.perf_counter()
 
-print("Total HDA Names Detected:", len(hda_names))
-
-# Now, let's write these to a CSV
-output_csv_file = "hda_names.csv"
-with open(output_csv_file, 'w', newline='', encoding="utf-8") as csvfile:
+# Write matches to the CSV as each file finishes
+with open(args.output, 'w', newline='', encoding="utf-8") as csvfile:
     csv_writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL, escapechar='\\')
     # Write the header row
-    csv_writer.writerow(["HDA Names"])
-    # Write each HDA name to a new row
-    for hda_name in hda_names:
-        csv_writer.writerow([hda_name])
\ No newline at end of file
+    csv_writer.writerow(["HIP File", "HDA Names"])
+
+    for result in scan_files(args.files, pattern, skip_binary=not args.include_binary):
+        for hda_name in result.matches:
+            csv_writer.writerow([result.path, hda_name])
+
+        mb = result.bytes_total / (1024 * 1024)
+        rate = mb / result.elapsed if result.elapsed else 0.0
+        print(f"{result.path}: {len(result.matches)} HDA names, "
+              f"{mb:.1f} MB ({result.bytes_scanned / (1024 * 1024):.1f} MB scanned) at {rate:.1f} MB/s")
+        total_names += len(result.matches)
+        total_bytes += result.bytes_total
+
+elapsed = time.perf_counter() - start_time
+total_mb = total_bytes / (1024 * 1024)
+print("Total HDA Names Detected:", total_names)
+print(f"Files: {len(args.files)}, {total_mb:.1f} MB in {elapsed:.2f}s "
+      f"({total_mb / elapsed if elapsed else 0.0:.1f} MB/s)")
@@ -0,0 +1,40 @@
+import argparse
+import os
+from byvfx.tools.hda_tracker.benchmark import (
+    MANIFEST_FILE, MODES, available_modes, format_results, generate_corpus, run_benchmark
+)
+
+# Compare the HDA tracker modes on a synthetic corpus. Runs headless from plain
+# Python; the hython mode is only used when hython can be found.
+# Each mode runs in a spawned child process, hence the __main__ guard.
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the HDA tracker modes on synthetic .hip files.")
+    parser.add_argument("corpus", help="Corpus directory (generated if it has no manifest)")
+    parser.add_argument("--files", type=int, default=200, help="Scene files to generate")
+    parser.add_argument("--nodes", type=int, default=500, help="Nodes per scene")
+    parser.add_argument("--hda-density", type=float, default=0.2, help="Fraction of HDA nodes")
+    parser.add_argument("--depth", type=int, default=6, help="Maximum network depth")
+    parser.add_argument("--payload-mb", type=float, default=0.0, help="Embedded binary payload per scene")
+    parser.add_argument("--regenerate", action="store_true", help="Regenerate the corpus")
+    parser.add_argument("--modes", nargs="*", choices=sorted(MODES), help="Modes to run (default: all available)")
+    parser.add_argument("--timeout", type=float, help="Seconds before a mode is killed and reported as failed")
+    args = parser.parse_args()
+
+    if args.regenerate or not os.path.exists(os.path.join(args.corpus, MANIFEST_FILE)):
+        print("Generating corpus in:", args.corpus)
+        generate_corpus(
+            args.corpus,
+            file_count=args.files,
+            node_count=args.nodes,
+            hda_density=args.hda_density,
+            max_depth=args.depth,
+            payload_bytes=int(args.payload_mb * 1024 * 1024),
+        )
+
+    print("Modes: ", ", ".join(args.modes or available_modes()))
+    results = run_benchmark(args.corpus, args.modes, args.timeout)
+    print(format_results(results))
+    for result in results:
+        if result.error:
+            print(f"\n{result.mode} failed:\n{result.error}")
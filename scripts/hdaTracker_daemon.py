@@ -0,0 +1,21 @@
+from byvfx.tools.hda_tracker.watcher import HdaIndexDaemon
+
+# Watch mode: keep the HDA index current while artists save scenes.
+# Linux only (inotify). Query it with
+#   byvfx.tools.hda_tracker.watcher.query_daemon(socket_file, "files_using", hda="...")
+# or open the SQLite index directly.
+
+# Specify the root directory to watch for .hip files
+root_directory = r"/mnt/projects/BYVFX/BunnyEater"
+
+# Persistent index file, shared with hdaTracker_index.py
+index_file = "hda_index.sqlite"
+
+# Unix socket for queries; set to None to disable
+socket_file = "/tmp/hda_index.sock"
+
+# Seconds a scene must stay untouched before it is re-indexed
+debounce_seconds = 2.0
+
+
+HdaIndexDaemon(root_directory, index_file, socket_file, debounce=debounce_seconds).serve_forever()
@@ -0,0 +1,37 @@
+import time
+from byvfx.tools.hda_tracker.dependency_graph import build_graph, DEFAULT_GRAPH_FILE
+from byvfx.tools.hda_tracker.index import HdaIndex
+
+# Build the HDA -> scenes -> nested HDAs graph from an existing index
+# (see hdaTracker_index.py) and list everything an HDA update would touch.
+
+start_time = time.time()
+
+# Index written by hdaTracker_index.py
+index_file = "hda_index.sqlite"
+
+# Extra HDA libraries or otls folders to read nested definitions from,
+# on top of the libraries each scene recorded when it was saved
+library_paths = [
+    r"D:/__projects/BYVFX/BunnyEater/otls",
+]
+
+# HDA about to be published, e.g. "sidefx::labs::foo::2.0"
+query_hda = ""
+
+with HdaIndex(index_file) as index:
+    graph = build_graph(index.usage_pairs(), library_paths)
+graph.save(DEFAULT_GRAPH_FILE)
+
+print("Time taken: ", time.time() - start_time, "seconds")
+print("Graph nodes: ", len(graph.nodes))
+print("Graph written to:", DEFAULT_GRAPH_FILE)
+
+if query_hda:
+    hdas, scenes = graph.affected_by(query_hda)
+    print(f"HDAs containing {query_hda}: ", len(hdas))
+    for hda in sorted(hdas):
+        print("  ", hda)
+    print(f"Scenes affected by {query_hda}: ", len(scenes))
+    for hip_path in sorted(scenes):
+        print("  ", hip_path)
@@ -0,0 +1,31 @@
+import time
+from byvfx.tools.hda_tracker.crawler import crawl_hip_files
+from byvfx.tools.hda_tracker.index import HdaIndex
+
+# Incremental audit: only scenes that changed since the last run are parsed,
+# and deleted scenes are dropped from the index.
+
+start_time = time.time()
+
+# Specify the root directory to search for .hip files
+root_directory = r"D:/__projects/BYVFX/BunnyEater"
+
+# Persistent index file, reused between runs
+index_file = "hda_index.sqlite"
+
+# Optional HDA to look up once the index is current, e.g. "sidefx::labs::foo::2.0"
+query_hda = ""
+
+
+with HdaIndex(index_file) as index:
+    stats = index.update(crawl_hip_files(root_directory), prune_root=root_directory)
+
+    print("Time taken: ", time.time() - start_time, "seconds")
+    print("HIP files re-parsed: ", stats.scanned)
+    print("HIP files unchanged: ", stats.unchanged)
+    print("HIP files removed: ", stats.removed)
+    print("HIP files failed: ", stats.failed)
+
+    if query_hda:
+        for hip_path in index.files_using(query_hda):
+            print(hip_path)
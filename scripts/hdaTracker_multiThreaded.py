@@ -1,68 +1,78 @@
 import os
-import csv
-import hou
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from byvfx.tools.hda_tracker.crawler import crawl_hip_files
+from byvfx.tools.hda_tracker.hip_reader import HipFormatError, read_hd_asset_rows
+from byvfx.tools.hda_tracker.sinks import open_sink
+
+# Scenes are parsed from disk instead of loaded into the (single, global) hou
+# session, so the worker threads no longer fight over hou.hipFile.
 
 start_time = time.time()
 
-def gather_hd_assets_in_hip_file(hip_path):
-    """Gather HDA assets in a given Houdini scene file."""
-    hda_data = []
+# Specify the root directory to search for .hip files
+root_directory = r"D:/__projects/BYVFX/BunnyEater"
 
-    # Load the Houdini scene file
-    hou.hipFile.load(hip_path, suppress_save_prompt=True, ignore_load_warnings=True)
+# Number of threads; at most this many times four scans are queued, so the
+# crawler is read only as fast as files finish
+worker_count = os.cpu_count()
+max_in_flight = worker_count * 4
 
-    def gather_hdas(node, depth=0):
-        if node.type().definition() is not None:
-            hda_name = node.type().definition().nodeTypeName()
-            hda_data.append((hip_path, hda_name, depth))
-        
-        # Continue traversing for child nodes
-        try:
-            for child in node.children():
-                gather_hdas(child, depth+1)
-        except hou.PermissionError:
-            print(f"PermissionError: Skipped node - {node.path()}")
+# Output file (.csv, .jsonl or .sqlite); rows are written as each file finishes
+output_file = "hdas.csv"
 
-    gather_hdas(hou.node('/'))
-    return hda_data
+# Set to True to continue an interrupted run instead of starting over
+resume_previous_run = False
 
+hip_files_processed = 0
+hip_files_skipped = 0
+failed_files = []
 
-# Specify the root directory to search for .hip files
-root_directory = r"D:/__projects/BYVFX/BunnyEater"
-
-# Collect all the .hip files
-hip_files = []
 
-for dirpath, dirnames, filenames in os.walk(root_directory):
-    for filename in filenames:
-        if filename.endswith('.hip'):
-            file_path = os.path.join(dirpath, filename)
-            hip_files.append(file_path)
+def gather(hip_path):
+    try:
+        return hip_path, read_hd_asset_rows(hip_path), None
+    except (OSError, HipFormatError) as e:
+        return hip_path, [], e
 
-# Process the .hip files in parallel using multithreading
-final_hda_data = []
 
-with ThreadPoolExecutor() as executor:
-    results = executor.map(gather_hd_assets_in_hip_file, hip_files)
-    for result in results:
-        final_hda_data.extend(result)
+def write_finished(sink, futures):
+    """Write the rows of finished scans; returns how many files succeeded."""
+    written = 0
+    for future in futures:
+        hip_path, rows, error = future.result()
+        if error is not None:
+            # Failed files are not marked done, so a resumed run retries them
+            print("Error gathering HDA data for:", hip_path, str(error))
+            failed_files.append(hip_path)
+            continue
+        sink.write_rows(hip_path, rows)
+        written += 1
+    return written
 
-# Write HDA data to CSV
-output_csv_file = "hdas.csv"
 
 try:
-    with open(output_csv_file, 'w', newline='') as csvfile:
-        csv_writer = csv.writer(csvfile)
-        # Write the header row
-        csv_writer.writerow(["HIP File", "HDA", "Depth"])
-        # Write each HDA entry to a new row
-        for entry in final_hda_data:
-            csv_writer.writerow(entry)
+    with open_sink(output_file, header=["HIP File", "HDA", "Depth"], resume=resume_previous_run) as sink:
+        completed = sink.completed_files()
+
+        # Process the .hip files in parallel using multithreading, streaming
+        # them from the crawler through a bounded window of running scans
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            in_flight = set()
+            for hip_path in crawl_hip_files(root_directory):
+                if hip_path in completed:
+                    hip_files_skipped += 1
+                    continue
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    hip_files_processed += write_finished(sink, done)
+                in_flight.add(executor.submit(gather, hip_path))
+            hip_files_processed += write_finished(sink, wait(in_flight).done)
 except Exception as e:
-    print("Error writing to CSV file:", str(e))
+    print("Error writing to output file:", str(e))
 else:
     print("Time taken: ", time.time() - start_time, "seconds")
-    print(f"{len(final_hda_data)} HDA entries written to:", output_csv_file)
-    print("HIP files processed: ", len(hip_files))
+    print(f"{sink.rows_written} HDA entries written to:", output_file)
+    print("HIP files processed: ", hip_files_processed)
+    print("HIP files already done: ", hip_files_skipped)
+    print("HIP files failed: ", len(failed_files))
@@ -0,0 +1,63 @@
+import os
+import time
+from byvfx.tools.hda_tracker.crawler import crawl_hip_files
+from byvfx.tools.hda_tracker.process_pool import HythonPool
+from byvfx.tools.hda_tracker.sinks import open_sink
+
+# Each scene is loaded in its own headless hython process, so results match a
+# full hou traversal (including locked HDA contents) and run truly in parallel.
+
+start_time = time.time()
+
+# Specify the root directory to search for .hip files
+root_directory = r"D:/__projects/BYVFX/BunnyEater"
+
+# Number of hython processes and per-file timeout in seconds
+worker_count = os.cpu_count()
+file_timeout = 600
+
+# Output file (.csv, .jsonl or .sqlite); rows are written as each file finishes
+output_file = "hdas.csv"
+
+# Set to True to continue an interrupted run instead of starting over
+resume_previous_run = False
+
+hip_files_processed = 0
+hip_files_skipped = 0
+failed_files = []
+
+
+def pending_hip_files(completed):
+    """Crawled .hip files not done by a previous run, counting the ones skipped."""
+    global hip_files_skipped
+    for path in crawl_hip_files(root_directory):
+        if path in completed:
+            hip_files_skipped += 1
+        else:
+            yield path
+
+try:
+    header = ["HIP File", "HDA", "Version", "Depth", "Node Path"]
+    with open_sink(output_file, header=header, resume=resume_previous_run) as sink:
+        completed = sink.completed_files()
+
+        # Stream .hip files from the crawler straight into the worker pool
+        hip_files = pending_hip_files(completed)
+
+        pool = HythonPool(workers=worker_count, timeout=file_timeout)
+        for result in pool.scan(hip_files):
+            if result.error:
+                # Failed files are not marked done, so a resumed run retries them
+                print("Error gathering HDA data for:", result.hip_path, result.error)
+                failed_files.append(result.hip_path)
+                continue
+            sink.write_rows(result.hip_path, result.rows)
+            hip_files_processed += 1
+except Exception as e:
+    print("Error writing to output file:", str(e))
+else:
+    print("Time taken: ", time.time() - start_time, "seconds")
+    print(f"{sink.rows_written} HDA entries written to:", output_file)
+    print("HIP files processed: ", hip_files_processed)
+    print("HIP files already done: ", hip_files_skipped)
+    print("HIP files failed: ", len(failed_files))
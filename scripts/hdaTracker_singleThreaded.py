@@ -1,66 +1,51 @@
-import os
-import csv
-import hou
 import time
+from byvfx.tools.hda_tracker.crawler import crawl_hip_files
+from byvfx.tools.hda_tracker.hip_reader import HipFormatError, read_hd_asset_rows
+from byvfx.tools.hda_tracker.sinks import open_sink
 
-start_time = time.time()
-
-def gather_hd_assets_in_hip_file(hip_path):
-    """Gather HDA assets in a given Houdini scene file."""
-    hda_data = []
-    try:
-        # Load the Houdini scene file
-        hou.hipFile.load(hip_path, suppress_save_prompt=True, ignore_load_warnings=True)
-
-        def gather_hdas(node, depth=0):
-            if node.type().definition() is not None:
-                hda_name = node.type().definition().nodeTypeName()
-                hda_data.append((hip_path, hda_name, depth))
-            
-            # Continue traversing for child nodes
-            try:
-                for child in node.children():
-                    gather_hdas(child, depth+1)
-            except hou.PermissionError:
-                print(f"PermissionError: Skipped node - {node.path()}")
+# Scenes are read straight from the .hip archive (no hou.hipFile.load), so this
+# script also runs from plain Python with $BYVFX/python3.11libs on PYTHONPATH.
 
-        gather_hdas(hou.node('/'))
-    except Exception as e:
-        print("Error gathering HDA data for:", hip_path, str(e))
-
-    return hda_data
+start_time = time.time()
 
 # Specify the root directory to search for .hip files
 root_directory = r"D:/__projects/BYVFX/BunnyEater"
 
-# Gather HDA data for all .hip files
+# Output file (.csv, .jsonl or .sqlite); rows are written as each file finishes
+output_file = "hdas.csv"
 
-all_hda_data = []
-hip_files_processed = 0
+# Set to True to continue an interrupted run instead of starting over
+resume_previous_run = False
 
-for dirpath, dirnames, filenames in os.walk(root_directory):
-    for filename in filenames:
-        if filename.endswith('.hip'):
-            file_path = os.path.join(dirpath, filename)
-            all_hda_data.extend(gather_hd_assets_in_hip_file(file_path))
-            hip_files_processed += 1
+# Gather HDA data for all .hip files
+hip_files_processed = 0
+hip_files_skipped = 0
+failed_files = []
 
-# Write HDA data to CSV
-output_csv_file = "hdas.csv"
 try:
-    with open(output_csv_file, 'w', newline='') as csvfile:
-        csv_writer = csv.writer(csvfile)
-        
-        # Write the header row
-        csv_writer.writerow(["HIP File", "HDA", "Depth"])
-        
-        # Write each HDA entry (hip_file, hda_name, depth) to a new row
-        for entry in all_hda_data:
-            csv_writer.writerow(entry)
+    with open_sink(output_file, header=["HIP File", "HDA", "Depth"], resume=resume_previous_run) as sink:
+        completed = sink.completed_files()
+
+        for file_path in crawl_hip_files(root_directory):
+            if file_path in completed:
+                hip_files_skipped += 1
+                continue
+            try:
+                rows = read_hd_asset_rows(file_path)
+            except (OSError, HipFormatError) as e:
+                # Failed files are not marked done, so a resumed run retries them
+                print("Error gathering HDA data for:", file_path, str(e))
+                failed_files.append(file_path)
+                continue
+            # Write each HDA entry (hip_file, hda_name, depth) to a new row
+            sink.write_rows(file_path, rows)
+            hip_files_processed += 1
 except Exception as e:
-    print("Error writing to CSV file:", str(e))
+    print("Error writing to output file:", str(e))
 else:
     print("Time taken: ", time.time() - start_time, "seconds")
-    print(f"{len(all_hda_data)} HDA entries written to:", output_csv_file)
-    print("HDAs added to the CSV: ", len(all_hda_data))
+    print(f"{sink.rows_written} HDA entries written to:", output_file)
+    print("HDAs added to the output: ", sink.rows_written)
     print("HIP files processed: ", hip_files_processed)
+    print("HIP files already done: ", hip_files_skipped)
+    print("HIP files failed: ", len(failed_files))
@@ -0,0 +1,115 @@
+"""
+Shared fixtures for the headless byvfx tests.
+
+``camdb_server`` is a local stand-in for the CamDB API on
+``127.0.0.1:0``. Each route answers from a script of responses, so tests
+can inject error statuses, dropped connections and slow replies, and
+every request is recorded for assertions.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "python3.11libs"))
+
+# Scripted fault: close the connection without sending a response
+DROP = "drop"
+
+
+def reply(data=None, status: int = 200, etag: str = None, delay: float = 0.0, headers: dict = None,
+          body: bytes = None) -> dict:
+    """One scripted response; ``data`` is sent as JSON unless a raw ``body`` is given."""
+    return {"data": data, "status": status, "etag": etag, "delay": delay, "headers": headers or {}, "body": body}
+
+
+class StubServer:
+    """
+    Scripted HTTP server for CamDB tests.
+
+    ``routes`` maps a path (with query string) to a list of responses
+    (``reply(...)`` or ``DROP``) that are used in order; the last one
+    repeats. A reply with an ``etag`` answers ``304`` when the request
+    sends a matching ``If-None-Match``.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        # Client ports seen, i.e. TCP connections opened
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def _next_response(self, path: str):
+        with self._lock:
+            script = self.routes.get(path)
+            if not script:
+                return reply({"detail": "Not found."}, status=404)
+            return script.pop(0) if len(script) > 1 else script[0]
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    server.connections.add(self.client_address[1])
+                response = server._next_response(self.path)
+                if response == DROP:
+                    self.close_connection = True
+                    return
+                time.sleep(response["delay"])
+
+                etag = response["etag"]
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                body = response["body"]
+                if body is None:
+                    body = json.dumps(response["data"]).encode()
+                self.send_response(response["status"])
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                for name, value in response["headers"].items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def hits(self, path: str) -> int:
+        """Number of requests received for a path."""
+        with self._lock:
+            return sum(1 for requested, _ in self.requests if requested == path)
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def camdb_server():
+    server = StubServer()
+    yield server
+    server.close()
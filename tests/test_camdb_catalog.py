@@ -0,0 +1,130 @@
+"""CameraCatalog filters and the FuzzyIndex behind ranked search."""
+
+import random
+
+import pytest
+
+from byvfx.utils.camdb_catalog import CameraCatalog
+from byvfx.utils.camdb_fuzzy import FuzzyIndex, bounded_edit_distance, tokenize
+
+CAMERAS = [
+    {"make": "ARRI", "name": "ALEXA 35", "cam_type": "Cinema"},
+    {"make": "ARRI", "name": "ALEXA Mini LF", "cam_type": "Cinema"},
+    {"make": "ARRI", "name": "ALEXA 65", "cam_type": "Cinema"},
+    {"make": "RED", "name": "V-RAPTOR 8K VV", "cam_type": "Cinema"},
+    {"make": "Sony", "name": "VENICE 2", "cam_type": "Cinema"},
+    {"make": "Sony", "name": "FX3", "cam_type": "Mirrorless"},
+    {"make": "Canon", "name": "EOS R5", "cam_type": "Mirrorless"},
+]
+
+
+@pytest.fixture
+def catalog():
+    return CameraCatalog(CAMERAS)
+
+
+def names(catalog, ids):
+    return [catalog.cameras[row]["name"] for row in ids]
+
+
+def synthetic_cameras(count, seed=2):
+    """``count`` made-up cameras sharing series words and numbers, then the ALEXA 35 as the last row."""
+    rng = random.Random(seed)
+    makes = ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(rng.randint(3, 9)))
+             for _ in range(300)]
+    series = ["".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(1, 4)))
+              for _ in range(3000)]
+    cameras = []
+    for _ in range(count):
+        suffix = f"{rng.choice(['', 'Mk II', 'Pro', 'S'])} {rng.randint(1, 999)}{rng.choice(['', 'K', 'D'])}"
+        cameras.append({"make": rng.choice(makes), "name": f"{rng.choice(series).upper()} {suffix}",
+                        "cam_type": "Cinema"})
+    cameras.append({"make": "ARRI", "name": "ALEXA 35", "cam_type": "Cinema"})
+    return cameras
+
+
+# ─── Filters ────────────────────────────────────────────────────────
+
+
+def test_filter_combines_make_type_and_text(catalog):
+    assert names(catalog, sorted(catalog.filter(make="ARRI", text="alexa"))) == ["ALEXA 35", "ALEXA Mini LF", "ALEXA 65"]
+    assert names(catalog, catalog.filter(make="Sony", cam_type="Mirrorless")) == ["FX3"]
+    assert names(catalog, sorted(catalog.filter(cam_type="Cinema", text="ve"))) == ["VENICE 2"]
+    assert catalog.filter() is catalog.all_ids
+    assert catalog.filter(make="Nikon") == frozenset()
+
+
+def test_search_narrows_while_typing(catalog):
+    assert names(catalog, sorted(catalog.search("alexa m"))) == ["ALEXA Mini LF"]
+    assert names(catalog, sorted(catalog.search("alexa mini"))) == ["ALEXA Mini LF"]
+    # n-grams all present but not contiguous
+    assert catalog.search("alexa lf") == frozenset()
+    assert catalog.search("  ") is catalog.all_ids
+
+
+# ─── Ranked search ──────────────────────────────────────────────────
+
+
+def test_ranked_tolerates_spacing_case_and_make(catalog):
+    for query in ("alexa 35", "ALEXA35", "Alexa-35", "arri alexa35", "35"):
+        assert names(catalog, catalog.ranked(text=query))[0] == "ALEXA 35", query
+
+
+def test_ranked_tolerates_typos(catalog):
+    assert names(catalog, catalog.ranked(text="alxa 35"))[0] == "ALEXA 35"
+    assert names(catalog, catalog.ranked(text="venise"))[0] == "VENICE 2"
+    # Numbers are not typos of each other
+    assert "ALEXA 65" not in names(catalog, catalog.ranked(text="35"))
+
+
+def test_ranked_respects_filters_and_lists_all_without_text(catalog):
+    assert names(catalog, catalog.ranked(make="Sony", text="alexa")) == []
+    assert names(catalog, catalog.ranked(make="ARRI", text="mini")) == ["ALEXA Mini LF"]
+    assert catalog.ranked(cam_type="Mirrorless") == [5, 6]
+    assert catalog.ranked(text="zzzz") == []
+
+
+def test_token_hits_are_shortlisted_in_a_large_catalog():
+    # Thousands of names share the bigram "35" and tie on n-gram counts;
+    # the whole-token hit must still make the shortlist
+    catalog = CameraCatalog(synthetic_cameras(20000))
+    alexa = len(catalog) - 1
+    assert alexa in catalog.ranked(text="35")
+    for query in ("alexa 35", "alexa35", "arri 35", "alxa 35"):
+        assert catalog.ranked(text=query)[0] == alexa, query
+    matches = catalog.ranked(text="mk ii")
+    assert len(matches) == 50
+    assert all("Mk II" in catalog.cameras[row]["name"] for row in matches)
+
+
+def test_search_results_are_ordered_and_limited():
+    index = FuzzyIndex(synthetic_cameras(2000, seed=5))
+    results = index.search("pro 12", limit=10)
+    assert len(results) == 10
+    assert results == sorted(results, key=lambda item: (-item[0], item[1]))
+    assert index.search("", limit=10) == []
+
+
+def test_tokenize_splits_letters_and_digits():
+    assert tokenize("ALEXA Mini-LF 4.5K") == ["alexa", "mini", "lf", "4", "5", "k"]
+    assert tokenize("FX3") == ["fx", "3"]
+
+
+def reference_edit_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def test_bounded_edit_distance_matches_the_full_table():
+    rng = random.Random(7)
+    for _ in range(5000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 9)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 9)))
+        limit = rng.randint(0, 3)
+        distance = reference_edit_distance(a, b)
+        assert bounded_edit_distance(a, b, limit) == (distance if distance <= limit else None)
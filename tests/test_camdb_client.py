@@ -0,0 +1,170 @@
+"""CamDBClient against a local stub server: pagination, offline/stale fallback and error mapping."""
+
+import urllib.error
+
+import pytest
+
+from conftest import DROP, reply
+from byvfx.utils.camdb_cache import CacheMissError, CamDBCache
+from byvfx.utils.camdb_client import CamDBClient
+from byvfx.utils.camdb_transport import CamDBTransport, TransportError
+
+CAMERAS = [{"id": i, "make": "ARRI", "name": f"Alexa {i}", "type": "Cinema"} for i in range(5)]
+
+
+def make_client(server, cache_dir, ttl=0.0, offline=False, retries=0):
+    transport = CamDBTransport(server.url, connect_timeout=1.0, read_timeout=2.0, retries=retries,
+                               backoff_base=0.01, backoff_max=0.01)
+    cache = CamDBCache(cache_dir=str(cache_dir), base_url=server.url, ttl=ttl, offline=offline, transport=transport)
+    return CamDBClient(cache)
+
+
+def page(results, next_url=None):
+    return {"count": len(CAMERAS), "next": next_url, "previous": None, "results": results}
+
+
+# ─── Pagination ─────────────────────────────────────────────────────
+
+
+def test_follows_absolute_and_relative_next_links(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(page(CAMERAS[:2], camdb_server.url + "/cameras/?page=2"))]
+    camdb_server.routes["/cameras/?page=2"] = [reply(page(CAMERAS[2:4], "/cameras/?page=3"))]
+    camdb_server.routes["/cameras/?page=3"] = [reply(page(CAMERAS[4:]))]
+
+    client = make_client(camdb_server, tmp_path)
+    assert client.cameras() == CAMERAS
+    assert [camera["id"] for camera in client.find_cameras(make="ARRI", text="alexa 3")] == [3]
+
+
+def test_unpaginated_list_is_returned_as_is(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(CAMERAS)]
+    assert make_client(camdb_server, tmp_path).cameras() == CAMERAS
+
+
+def test_paged_result_reports_stalest_source(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(page(CAMERAS[:2], "/cameras/?page=2"), etag='"p1"')]
+    camdb_server.routes["/cameras/?page=2"] = [reply(page(CAMERAS[2:]), etag='"p2"'), reply(status=503)]
+    client = make_client(camdb_server, tmp_path)
+    assert client.fetch_all("/cameras/").source == "network"
+
+    response = client.fetch_all("/cameras/")
+    assert response.data == CAMERAS
+    assert response.source == "stale"
+
+
+def test_sensor_formats_are_normalized(camdb_server, tmp_path):
+    sensors = [{"id": 1, "width": 36.7, "height": 25.54}]
+    camdb_server.routes["/cameras/1/sensors/"] = [reply({"sensors": sensors})]
+    camdb_server.routes["/cameras/2/sensors/"] = [reply(page(sensors))]
+    camdb_server.routes["/cameras/3/sensors/"] = [reply(sensors[0])]
+
+    client = make_client(camdb_server, tmp_path)
+    assert client.sensors(1) == sensors
+    assert client.sensors(2) == sensors
+    assert client.sensors(3) == sensors
+
+
+# ─── Offline and stale fallback ─────────────────────────────────────
+
+
+def test_fresh_entry_is_served_without_a_request(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(CAMERAS)]
+    client = make_client(camdb_server, tmp_path, ttl=3600)
+    client.fetch("/cameras/")
+    assert client.fetch("/cameras/").source == "cache"
+    assert camdb_server.hits("/cameras/") == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(CAMERAS, etag='"v1"')]
+    client = make_client(camdb_server, tmp_path)
+    client.fetch("/cameras/")
+
+    response = client.fetch("/cameras/")
+    assert response.source == "revalidated"
+    assert response.data == CAMERAS
+    assert camdb_server.requests[-1][1].get("If-None-Match") == '"v1"'
+
+
+def test_offline_mode_uses_cache_only(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(CAMERAS)]
+    make_client(camdb_server, tmp_path).cameras()
+
+    offline = make_client(camdb_server, tmp_path, offline=True)
+    assert offline.fetch("/cameras/").source == "cache"
+    assert offline.cameras() == CAMERAS
+    with pytest.raises(CacheMissError):
+        offline.sensors(1)
+    assert camdb_server.hits("/cameras/") == 1
+
+
+def test_server_error_falls_back_to_stale_entry(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(CAMERAS), reply(status=503)]
+    client = make_client(camdb_server, tmp_path)
+    client.fetch("/cameras/")
+
+    response = client.fetch("/cameras/")
+    assert response.source == "stale"
+    assert response.data == CAMERAS
+
+
+def test_unreachable_server_falls_back_to_stale_entry(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(CAMERAS)]
+    make_client(camdb_server, tmp_path).fetch("/cameras/")
+    camdb_server.close()
+
+    response = make_client(camdb_server, tmp_path).fetch("/cameras/")
+    assert response.source == "stale"
+    assert response.data == CAMERAS
+
+
+# ─── Error mapping ──────────────────────────────────────────────────
+
+
+def test_client_error_is_raised_even_with_a_cached_entry(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(CAMERAS), reply({"detail": "Gone."}, status=404)]
+    client = make_client(camdb_server, tmp_path)
+    client.fetch("/cameras/")
+
+    with pytest.raises(urllib.error.HTTPError) as raised:
+        client.fetch("/cameras/")
+    assert raised.value.code == 404
+
+
+def test_server_error_without_cache_is_an_http_error(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(status=500)]
+    with pytest.raises(urllib.error.HTTPError) as raised:
+        make_client(camdb_server, tmp_path).fetch("/cameras/")
+    assert raised.value.code == 500
+
+
+def test_dropped_connection_without_cache_is_a_transport_error(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [DROP]
+    with pytest.raises(TransportError):
+        make_client(camdb_server, tmp_path).fetch("/cameras/")
+
+
+def test_invalid_json_without_cache_is_a_value_error(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/"] = [reply(body=b"<html>Bad gateway</html>")]
+    with pytest.raises(ValueError):
+        make_client(camdb_server, tmp_path).fetch("/cameras/")
+
+
+def test_pagination_loop_is_stopped(camdb_server, tmp_path, monkeypatch):
+    monkeypatch.setattr("byvfx.utils.camdb_client.MAX_PAGES", 3)
+    camdb_server.routes["/cameras/"] = [reply(page(CAMERAS[:1], "/cameras/"))]
+    with pytest.raises(RuntimeError):
+        make_client(camdb_server, tmp_path).cameras()
+
+
+def test_exactly_max_pages_is_not_a_loop(camdb_server, tmp_path, monkeypatch):
+    monkeypatch.setattr("byvfx.utils.camdb_client.MAX_PAGES", 3)
+    camdb_server.routes["/cameras/"] = [reply(page(CAMERAS[:2], "/cameras/?page=2"))]
+    camdb_server.routes["/cameras/?page=2"] = [reply(page(CAMERAS[2:4], "/cameras/?page=3"))]
+    camdb_server.routes["/cameras/?page=3"] = [reply(page(CAMERAS[4:]))]
+    assert make_client(camdb_server, tmp_path).cameras() == CAMERAS
+
+    camdb_server.routes["/cameras/?page=3"] = [reply(page(CAMERAS[4:], "/cameras/?page=4"))]
+    with pytest.raises(RuntimeError):
+        make_client(camdb_server, tmp_path).cameras()
+    assert camdb_server.hits("/cameras/?page=4") == 0
@@ -0,0 +1,63 @@
+"""export_snapshot against a local stub server: fresh data only, or no snapshot."""
+
+import urllib.error
+
+import pytest
+
+from conftest import reply
+from test_camdb_client import CAMERAS, make_client
+from byvfx.utils.camdb_snapshot import export_snapshot, load_snapshot
+
+SENSORS = [{"id": 1, "mode_name": "Open Gate", "res_width": 4448, "res_height": 3096}]
+
+
+def serve_catalog(server, *sensor_script):
+    server.routes["/cameras/"] = [reply(CAMERAS)]
+    for camera in CAMERAS:
+        server.routes[f"/cameras/{camera['id']}/sensors/"] = list(sensor_script or [reply(SENSORS)])
+
+
+def test_export_round_trips(camdb_server, tmp_path):
+    serve_catalog(camdb_server)
+    path = str(tmp_path / "camdb_snapshot.json.gz")
+    written = export_snapshot(path, make_client(camdb_server, tmp_path / "cache"))
+
+    loaded = load_snapshot(path)
+    assert loaded.version == written.version
+    assert loaded.cameras == CAMERAS
+    assert loaded.sensors == {camera["id"]: SENSORS for camera in CAMERAS}
+
+
+def test_export_requests_entries_that_are_fresh_in_the_cache(camdb_server, tmp_path):
+    serve_catalog(camdb_server)
+    client = make_client(camdb_server, tmp_path / "cache", ttl=3600)
+    client.cameras()
+    client.prefetch_sensors([camera["id"] for camera in CAMERAS])
+    hits = len(camdb_server.requests)
+
+    export_snapshot(str(tmp_path / "camdb_snapshot.json.gz"), client)
+    assert len(camdb_server.requests) == hits + 1 + len(CAMERAS)
+
+
+def test_export_fails_instead_of_using_stale_sensors(camdb_server, tmp_path):
+    serve_catalog(camdb_server, reply(SENSORS), reply(status=503))
+    client = make_client(camdb_server, tmp_path / "cache")
+    client.prefetch_sensors([camera["id"] for camera in CAMERAS])
+
+    path = tmp_path / "camdb_snapshot.json.gz"
+    with pytest.raises(RuntimeError):
+        export_snapshot(str(path), client)
+    assert not path.exists()
+
+
+def test_export_fails_instead_of_using_a_stale_camera_list(camdb_server, tmp_path):
+    serve_catalog(camdb_server)
+    camdb_server.routes["/cameras/"] = [reply(CAMERAS), reply(status=503)]
+    client = make_client(camdb_server, tmp_path / "cache")
+    client.cameras()
+
+    with pytest.raises(urllib.error.HTTPError):
+        export_snapshot(str(tmp_path / "camdb_snapshot.json.gz"), client)
+    with pytest.raises(RuntimeError):
+        export_snapshot(str(tmp_path / "camdb_snapshot.json.gz"),
+                        make_client(camdb_server, tmp_path / "cache", offline=True))
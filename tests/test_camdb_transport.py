@@ -0,0 +1,228 @@
+"""CamDBTransport and SensorPrefetcher against a fault-injecting stub server."""
+
+import time
+
+import pytest
+
+from conftest import DROP, reply
+from byvfx.utils.camdb_cache import CamDBCache
+from byvfx.utils.camdb_prefetch import SensorPrefetcher
+from byvfx.utils.camdb_transport import (
+    CamDBTransport, CircuitBreaker, CircuitOpenError, TransportError, TransportHTTPError
+)
+
+SENSORS = [{"id": 1, "mode_name": "Open Gate", "res_width": 4448, "res_height": 3096}]
+
+
+def make_transport(server, retries=2, failure_threshold=5, reset_timeout=30.0):
+    breaker = CircuitBreaker(failure_threshold, reset_timeout)
+    return CamDBTransport(server.url, connect_timeout=1.0, read_timeout=2.0, retries=retries,
+                          backoff_base=0.01, backoff_max=0.05, breaker=breaker)
+
+
+def make_cache(server, cache_dir, transport=None, ttl=0.0):
+    return CamDBCache(cache_dir=str(cache_dir), base_url=server.url, ttl=ttl, offline=False,
+                      transport=transport or make_transport(server))
+
+
+# ─── Retries ────────────────────────────────────────────────────────
+
+
+def test_transient_errors_are_retried(camdb_server):
+    camdb_server.routes["/cameras/"] = [DROP, reply(status=503), reply(SENSORS)]
+    transport = make_transport(camdb_server)
+
+    assert transport.get("/cameras/").status == 200
+    stats = transport.stats.snapshot()
+    assert stats["attempts"] == 3
+    assert stats["retries"] == 2
+    assert stats["failures"] == 0
+    assert transport.breaker.state == "closed"
+
+
+def test_retry_after_is_honoured(camdb_server):
+    camdb_server.routes["/cameras/"] = [reply(status=429, headers={"Retry-After": "0.05"}), reply(SENSORS)]
+    transport = make_transport(camdb_server)
+
+    start = time.monotonic()
+    assert transport.get("/cameras/").status == 200
+    assert time.monotonic() - start >= 0.05
+
+
+def test_client_errors_are_not_retried(camdb_server):
+    camdb_server.routes["/cameras/9/sensors/"] = [reply(status=404)]
+    transport = make_transport(camdb_server)
+
+    with pytest.raises(TransportHTTPError) as raised:
+        transport.get("/cameras/9/sensors/")
+    assert raised.value.code == 404
+    assert camdb_server.hits("/cameras/9/sensors/") == 1
+    assert transport.breaker.state == "closed"
+
+
+def test_exhausted_retries_raise_transport_error(camdb_server):
+    camdb_server.routes["/cameras/"] = [DROP]
+    transport = make_transport(camdb_server, retries=1)
+
+    with pytest.raises(TransportError):
+        transport.get("/cameras/")
+    assert camdb_server.hits("/cameras/") == 2
+
+
+def test_slow_response_times_out(camdb_server):
+    camdb_server.routes["/cameras/"] = [reply(SENSORS, delay=0.5)]
+    transport = CamDBTransport(camdb_server.url, connect_timeout=1.0, read_timeout=0.1, retries=0)
+
+    with pytest.raises(TransportError):
+        transport.get("/cameras/")
+    assert transport.stats.snapshot()["timeouts"] == 1
+
+
+# ─── Circuit breaker ────────────────────────────────────────────────
+
+
+def test_breaker_opens_after_failed_requests_and_short_circuits(camdb_server):
+    camdb_server.routes["/cameras/"] = [reply(status=503)]
+    transport = make_transport(camdb_server, retries=1, failure_threshold=3)
+
+    for _ in range(3):
+        with pytest.raises(TransportHTTPError):
+            transport.get("/cameras/")
+    assert transport.breaker.state == "open"
+    hits = camdb_server.hits("/cameras/")
+    assert hits == 6
+
+    with pytest.raises(CircuitOpenError):
+        transport.get("/cameras/")
+    assert camdb_server.hits("/cameras/") == hits
+    assert transport.stats.snapshot()["short_circuits"] == 1
+
+
+def test_half_open_breaker_lets_one_trial_through(camdb_server):
+    camdb_server.routes["/cameras/"] = [reply(status=503), reply(status=503), reply(SENSORS)]
+    transport = make_transport(camdb_server, retries=0, failure_threshold=2, reset_timeout=0.1)
+    for _ in range(2):
+        with pytest.raises(TransportHTTPError):
+            transport.get("/cameras/")
+    assert transport.breaker.state == "open"
+
+    time.sleep(0.15)
+    assert transport.breaker.state == "half_open"
+    assert transport.breaker.allow()
+    assert not transport.breaker.allow()
+    transport.breaker.record_success()
+    assert transport.get("/cameras/").status == 200
+    assert transport.breaker.state == "closed"
+
+
+# ─── Cache on top of the transport ──────────────────────────────────
+
+
+def test_unchanged_entry_is_revalidated_with_304(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/1/sensors/"] = [reply(SENSORS, etag='"s1"')]
+    cache = make_cache(camdb_server, tmp_path)
+
+    assert cache.request("/cameras/1/sensors/").source == "network"
+    response = cache.request("/cameras/1/sensors/")
+    assert response.source == "revalidated"
+    assert response.data == SENSORS
+    assert transport_statuses(cache) == {200: 1, 304: 1}
+
+
+def test_open_breaker_serves_stale_entry_without_a_request(camdb_server, tmp_path):
+    camdb_server.routes["/cameras/1/sensors/"] = [reply(SENSORS), reply(status=503)]
+    cache = make_cache(camdb_server, tmp_path, make_transport(camdb_server, retries=0, failure_threshold=1))
+    cache.request("/cameras/1/sensors/")
+
+    assert cache.request("/cameras/1/sensors/").source == "stale"
+    assert cache.transport.breaker.state == "open"
+    hits = camdb_server.hits("/cameras/1/sensors/")
+    response = cache.request("/cameras/1/sensors/")
+    assert (response.source, response.data) == ("stale", SENSORS)
+    assert camdb_server.hits("/cameras/1/sensors/") == hits
+
+
+def transport_statuses(cache):
+    return cache.transport.stats.snapshot()["status_counts"]
+
+
+# ─── Sensor prefetch ────────────────────────────────────────────────
+
+
+def sensor_routes(server, camera_ids, *script):
+    for camera_id in camera_ids:
+        server.routes[f"/cameras/{camera_id}/sensors/"] = list(script)
+
+
+def test_prefetch_reuses_keep_alive_connections(camdb_server, tmp_path):
+    camera_ids = list(range(40))
+    sensor_routes(camdb_server, camera_ids, reply(SENSORS))
+    prefetcher = SensorPrefetcher(make_cache(camdb_server, tmp_path), connections=4)
+
+    sensors, errors = prefetcher.prefetch(camera_ids)
+    assert not errors
+    assert all(sensors[camera_id] == SENSORS for camera_id in camera_ids)
+    assert len(camdb_server.connections) <= 4
+
+
+def test_prefetch_blips_are_retried_without_opening_the_breaker(camdb_server, tmp_path):
+    camera_ids = list(range(8))
+    sensor_routes(camdb_server, camera_ids, reply(status=503), reply(SENSORS))
+    cache = make_cache(camdb_server, tmp_path, make_transport(camdb_server, retries=2, failure_threshold=5))
+
+    sensors, errors = SensorPrefetcher(cache, connections=8).prefetch(camera_ids)
+    assert not errors
+    assert len(sensors) == len(camera_ids)
+    assert cache.transport.breaker.state == "closed"
+
+
+def test_prefetch_stops_requesting_once_the_breaker_opens(camdb_server, tmp_path):
+    camera_ids = list(range(30))
+    sensor_routes(camdb_server, camera_ids, reply(status=503))
+    cache = make_cache(camdb_server, tmp_path, make_transport(camdb_server, retries=0, failure_threshold=3))
+
+    sensors, errors = SensorPrefetcher(cache, connections=1).prefetch(camera_ids)
+    assert not sensors
+    assert set(errors) == set(camera_ids)
+    assert cache.transport.breaker.state == "open"
+    assert len(camdb_server.requests) == 3
+
+
+def test_prefetch_sends_one_trial_request_when_half_open(camdb_server, tmp_path):
+    camera_ids = list(range(12))
+    sensor_routes(camdb_server, camera_ids, reply(SENSORS, delay=0.2))
+    transport = make_transport(camdb_server, retries=0, failure_threshold=1, reset_timeout=0.05)
+    transport.breaker.record_failure()
+    time.sleep(0.1)
+    assert transport.breaker.state == "half_open"
+
+    sensors, errors = SensorPrefetcher(make_cache(camdb_server, tmp_path, transport), connections=6).prefetch(camera_ids)
+    assert len(camdb_server.requests) == 1
+    assert len(sensors) == 1
+    assert all(isinstance(message, str) for message in errors.values())
+    assert transport.breaker.state == "closed"
+
+
+def test_prefetch_revalidates_and_falls_back_to_stale(camdb_server, tmp_path):
+    sensor_routes(camdb_server, [1], reply(SENSORS, etag='"s1"'))
+    sensor_routes(camdb_server, [2], reply(SENSORS), reply(status=500))
+    cache = make_cache(camdb_server, tmp_path, make_transport(camdb_server, retries=0))
+    SensorPrefetcher(cache).prefetch([1, 2])
+
+    sensors, errors = SensorPrefetcher(cache).prefetch([1, 2])
+    assert not errors
+    assert sensors == {1: SENSORS, 2: SENSORS}
+    revalidations = [headers.get("If-None-Match") for path, headers in camdb_server.requests
+                     if path == "/cameras/1/sensors/"]
+    assert revalidations == [None, '"s1"']
+    assert transport_statuses(cache).get(304) == 1
+
+
+def test_prefetch_skips_fresh_entries(camdb_server, tmp_path):
+    sensor_routes(camdb_server, [1, 2], reply(SENSORS))
+    cache = make_cache(camdb_server, tmp_path, ttl=3600)
+    SensorPrefetcher(cache).prefetch([1, 2])
+
+    sensors, errors = SensorPrefetcher(cache).prefetch([1, 2])
+    assert sensors == {1: SENSORS, 2: SENSORS}
+    assert len(camdb_server.requests) == 2
@@ -0,0 +1,60 @@
+"""HdaIndex keeps going when scene files cannot be read."""
+
+import os
+
+import pytest
+
+from byvfx.tools.hda_tracker import index as index_module
+from byvfx.tools.hda_tracker.index import HdaIndex
+
+
+@pytest.fixture
+def hda_index(tmp_path):
+    index = HdaIndex(str(tmp_path / "hda_index.sqlite"), parser=lambda path: [])
+    yield index
+    index.close()
+
+
+def write_scenes(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"shot{i}.hip"
+        path.write_bytes(b"scene %d" % i)
+        paths.append(str(path))
+    return paths
+
+
+def test_unreadable_file_is_recorded_and_retried(tmp_path, hda_index, monkeypatch):
+    paths = write_scenes(tmp_path, 3)
+    real_hash = index_module.hash_file
+
+    def hash_file(path):
+        if path == paths[1]:
+            raise PermissionError(13, "Permission denied", path)
+        return real_hash(path)
+
+    monkeypatch.setattr(index_module, "hash_file", hash_file)
+    stats = hda_index.update(paths)
+    assert (stats.scanned, stats.failed) == (3, 1)
+    error = hda_index.connection.execute("SELECT error FROM files WHERE path = ?", (paths[1],)).fetchone()[0]
+    assert "Permission denied" in error
+
+    monkeypatch.setattr(index_module, "hash_file", real_hash)
+    stats = hda_index.update(paths)
+    assert (stats.scanned, stats.unchanged, stats.failed) == (1, 2, 0)
+
+
+def test_file_deleted_before_hashing_is_removed(tmp_path, hda_index, monkeypatch):
+    paths = write_scenes(tmp_path, 2)
+    hda_index.update(paths, force=True)
+    real_hash = index_module.hash_file
+
+    def hash_file(path):
+        if path == paths[0]:
+            os.remove(path)
+        return real_hash(path)
+
+    monkeypatch.setattr(index_module, "hash_file", hash_file)
+    stats = hda_index.update(paths, force=True)
+    assert (stats.scanned, stats.failed) == (1, 0)
+    assert [row[0] for row in hda_index.connection.execute("SELECT path FROM files")] == [paths[1]]
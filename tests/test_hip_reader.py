@@ -0,0 +1,83 @@
+"""Static .hip reader: which node types count as HDAs, from the scene's asset libraries."""
+
+import gzip
+
+import pytest
+
+from byvfx.tools.hda_tracker.benchmark import _write_entry
+from byvfx.tools.hda_tracker.hip_reader import (
+    CPIO_TRAILER, HipFormatError, gather_hd_assets_in_hip_file, iter_hda_usages, read_hd_asset_rows,
+    read_library_types, scene_hda_types
+)
+from byvfx.tools.hda_tracker.sinks import open_sink
+
+DIALOG_SCRIPT = b"# Dialog script for %s automatically generated\n{\n    name\t%s\n}\n"
+
+
+def dialog_script(type_name):
+    return DIALOG_SCRIPT % (type_name.encode(), type_name.encode())
+
+
+def write_hip(path, libraries, node_types):
+    with open(path, "wb") as f:
+        _write_entry(f, ".OPlibraries", "".join(f"OPlib {library}\n" for library in libraries).encode())
+        for i, type_name in enumerate(node_types):
+            _write_entry(f, f"obj/node{i}.init", f"type = {type_name}\n".encode())
+        _write_entry(f, CPIO_TRAILER, b"")
+
+
+def test_plain_library_types(tmp_path):
+    library = tmp_path / "plain.hda"
+    library.write_bytes(b"INDX\n" + b"".join(b"INDX\n" + dialog_script(t) for t in ("studio::a::1.0", "rig")))
+    assert read_library_types(str(library)) == {"studio::a::1.0", "rig"}
+
+
+def test_gzipped_sections_are_inflated(tmp_path):
+    library = tmp_path / "compressed.hda"
+    padding = bytes(range(256)) * 400  # Pushes the second header across inflate chunks
+    library.write_bytes(b"INDX\n" + b"".join(
+        b"INDX\n" + gzip.compress(padding + dialog_script(t)) for t in ("studio::a::1.0", "studio::b::2.0")))
+    assert read_library_types(str(library)) == {"studio::a::1.0", "studio::b::2.0"}
+
+
+def test_library_without_definitions_is_incomplete(tmp_path):
+    library = tmp_path / "unknown.hda"
+    library.write_bytes(b"INDX\n" + gzip.compress(b"no dialog script here")[:20])
+    assert scene_hda_types([str(library)]) == (set(), False)
+
+
+def test_missing_library_falls_back_to_the_namespace_guess(tmp_path):
+    library = tmp_path / "studio.hda"
+    library.write_bytes(b"INDX\n" + gzip.compress(dialog_script("rig")))
+    hip = tmp_path / "shot.hip"
+
+    write_hip(hip, [str(library)], ["rig", "box", "studio::other::1.0"])
+    assert [usage.hda for usage in iter_hda_usages(str(hip))] == ["rig"]
+
+    write_hip(hip, [str(library), str(tmp_path / "gone.hda")], ["rig", "box", "studio::other::1.0"])
+    assert [usage.hda for usage in iter_hda_usages(str(hip))] == ["rig", "studio::other::1.0"]
+
+
+def test_unreadable_scene_raises_and_is_not_marked_done(tmp_path):
+    library = tmp_path / "studio.hda"
+    library.write_bytes(b"INDX\n" + dialog_script("rig"))
+    good, empty, broken = tmp_path / "good.hip", tmp_path / "empty.hip", tmp_path / "broken.hip"
+    write_hip(good, [str(library)], ["rig"])
+    write_hip(empty, [str(library)], ["box"])
+    broken.write_bytes(b"not a scene")
+
+    assert [row[:2] for row in read_hd_asset_rows(str(good))] == [(str(good), "rig")]
+    assert read_hd_asset_rows(str(empty)) == []
+    with pytest.raises(HipFormatError):
+        read_hd_asset_rows(str(broken))
+    assert gather_hd_assets_in_hip_file(str(broken)) == []
+
+    output = str(tmp_path / "hdas.jsonl")
+    with open_sink(output) as sink:
+        for hip_path in map(str, (good, empty, broken)):
+            try:
+                sink.write_rows(hip_path, read_hd_asset_rows(hip_path))
+            except HipFormatError:
+                continue
+    with open_sink(output, resume=True) as sink:
+        assert sink.completed_files() == {str(good), str(empty)}
@@ -0,0 +1,136 @@
+"""SnippetIndex: prefix expansion, AND/OR, ranking and incremental updates."""
+
+import random
+
+import pytest
+
+from byvfx.utils.vex_snippet_index import PREFIX_FACTOR, SnippetIndex, parse_query, snippet_tokens
+
+
+def snippet(code="", description="", tags=()):
+    return {"code": code, "description": description, "tags": list(tags)}
+
+
+LIBRARY = {
+    "Noise": {
+        "Curl Flow": snippet("v@v = curlnoise(@P);", "divergence free", ["noise"]),
+        "Flow Noise": snippet("v@v = flownoise(@P);", "", ["curl"]),
+        "Turbulence": snippet("f@d = onoise(@P);", "curly wisps"),
+    },
+    "Attributes": {
+        "Fit Range": snippet("f@out = fit(f@in, old_min, old_max, 0, 1);"),
+        "Color Curve": snippet("v@Cd = chramp('curve', @curveu);"),
+    },
+}
+
+
+@pytest.fixture
+def index():
+    return SnippetIndex(LIBRARY)
+
+
+def test_terms_are_word_prefixes(index):
+    assert index.search("curl") == [("Noise", "Curl Flow"), ("Noise", "Flow Noise"), ("Noise", "Turbulence")]
+    assert index.search("cu") == [("Attributes", "Color Curve"), ("Noise", "Curl Flow"),
+                                  ("Noise", "Flow Noise"), ("Noise", "Turbulence")]
+    # snake_case identifiers match whole and by part
+    assert index.search("old_min") == index.search("min") == [("Attributes", "Fit Range")]
+    assert index.search("") == index.search("zz") == []
+
+
+def test_one_letter_prefix_expands_the_whole_vocabulary():
+    library = {"Many": {f"Word {i}": snippet(f"c{i:04d}x") for i in range(500)}}
+    library["Noise"] = {"Curl Noise": snippet("curlnoise")}
+    index = SnippetIndex(library)
+    assert index.search("c", limit=1) == [("Noise", "Curl Noise")]
+    assert len(index.search("c")) == 501
+
+
+def test_and_or(index):
+    assert index.search("flow noise") == [("Noise", "Flow Noise"), ("Noise", "Curl Flow")]
+    assert index.search("curl fit") == []
+    assert index.search("fit OR flow") == [("Attributes", "Fit Range"), ("Noise", "Curl Flow"),
+                                           ("Noise", "Flow Noise")]
+    assert index.search("fit | flow") == index.search("fit OR flow")
+    assert parse_query("curl OR flow noise") == [["curl"], ["flow", "noise"]]
+
+
+def test_ranking_by_field_and_exact_tokens_then_tie_order(index):
+    # name, then tag, then description prefix ("curly"); ties by category and name
+    assert index.search("curl") == [("Noise", "Curl Flow"), ("Noise", "Flow Noise"), ("Noise", "Turbulence")]
+    # exact name token above a name prefix hit
+    assert index.search("color cur")[0] == ("Attributes", "Color Curve")
+    assert index.search("noise", limit=2) == [("Noise", "Flow Noise"), ("Noise", "Curl Flow")]
+
+
+def test_limit_cuts_inside_a_layer_in_tie_order():
+    library = {category: {f"Curl {i}": snippet() for i in range(30)} for category in ("B", "A")}
+    index = SnippetIndex(library)
+    expected = sorted((category, f"Curl {i}") for category in ("A", "B") for i in range(30))
+    assert index.search("c", limit=5) == expected[:5]
+    assert index.search("curl OR c", limit=40) == expected[:40]
+
+
+def test_add_and_remove_update_cached_prefixes(index):
+    assert index.search("c", limit=1) == [("Attributes", "Color Curve")]
+    index.add("Attributes", "Clamp", snippet("f@x = clamp(f@x, 0, 1);"))
+    assert index.search("c", limit=1) == [("Attributes", "Clamp")]
+    assert index.search("clamp") == [("Attributes", "Clamp")]
+
+    index.add("Attributes", "Clamp", snippet("f@x = abs(f@x);"))
+    assert index.search("abs") == [("Attributes", "Clamp")]
+    index.remove("Attributes", "Clamp")
+    index.remove_category("Noise")
+    assert index.search("c") == [("Attributes", "Color Curve")]
+    assert index.search("clamp OR curl") == []
+    assert "clamp" not in index.vocabulary
+    assert len(index) == 2
+
+
+def reference_search(library, query):
+    """Score every snippet directly, as the index documents it."""
+    scores = {}
+    for category, snippets in library.items():
+        for name, entry in snippets.items():
+            tokens = snippet_tokens(name, entry)
+            for terms in parse_query(query):
+                total = 0.0
+                for term in terms:
+                    best = max([score for token, score in tokens.items() if token == term] +
+                               [score * PREFIX_FACTOR for token, score in tokens.items()
+                                if token != term and token.startswith(term)] + [0.0])
+                    if not best:
+                        break
+                    total += best
+                else:
+                    key = (category, name)
+                    scores[key] = max(scores.get(key, 0.0), round(total, 6))
+    return sorted(scores, key=lambda key: (-scores[key], key))
+
+
+def test_matches_a_full_scan_through_edits():
+    rng = random.Random(3)
+    words = ["".join(rng.choice("abcd") for _ in range(rng.randint(1, 4))) for _ in range(120)]
+
+    def random_snippet():
+        return snippet(" ".join(rng.choices(words, k=5)), " ".join(rng.choices(words, k=2)), rng.choices(words, k=1))
+
+    library = {f"C{c}": {f"{rng.choice(words)} {i}": random_snippet() for i in range(60)} for c in range(4)}
+    index = SnippetIndex(library)
+    index.warm()
+    queries = ["a", "ab", "abc", "a b", "a OR b", "ab OR b c", "a b c", "dd OR d_a"]
+    for step in range(60):
+        category = rng.choice(list(library))
+        if step % 2 and library[category]:
+            name = rng.choice(sorted(library[category]))
+            del library[category][name]
+            index.remove(category, name)
+        else:
+            name = f"{rng.choice(words)} x{step}"
+            library[category][name] = random_snippet()
+            index.add(category, name, library[category][name])
+        if step % 15 == 0:
+            for query in queries:
+                expected = reference_search(library, query)
+                assert index.search(query) == expected
+                assert index.search(query, limit=7) == expected[:7]
@@ -0,0 +1,94 @@
+"""JsonSnippetStore shared between sessions: journal replay, compaction, torn lines and the file lock."""
+
+import json
+import time
+
+import pytest
+
+from byvfx.utils.vex_snippet_store import FileLock, JsonSnippetStore, apply_change
+
+
+def snippet(code, tags=()):
+    return {"code": code, "description": "", "tags": list(tags)}
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "vex_snippets.json")
+    JsonSnippetStore(path).save_all(["Noise"], {"Noise": {"Curl": snippet("curlnoise")}})
+    return path
+
+
+def journal_lines(path):
+    with open(path + ".journal", "rb") as file:
+        return file.read().splitlines()
+
+
+def test_other_sessions_edits_are_replayed(path):
+    writer, reader = JsonSnippetStore(path), JsonSnippetStore(path)
+    writer.load()
+    categories, snippets = reader.load()
+
+    writer.upsert_snippet("Noise", "Flow", snippet("flownoise", ["flow", "noise"]))
+    writer.upsert_snippet("Noise", "Curl", snippet("curlnoise(@P)"))
+    writer.add_category("Empty")
+    writer.upsert_snippet("Temp", "Scratch", snippet("x"))
+    writer.delete_category("Temp")
+    writer.delete_snippet("Noise", "Flow")
+
+    changes = reader.poll()
+    assert [change["op"] for change in changes] == [
+        "upsert", "upsert", "add_category", "upsert", "delete_category", "delete"]
+    for change in changes:
+        apply_change(categories, snippets, change)
+    assert (categories, snippets) == JsonSnippetStore(path).load()
+    assert reader.poll() == []
+
+
+def test_compaction_asks_other_sessions_to_reload(path):
+    writer, reader = JsonSnippetStore(path, compact_records=3), JsonSnippetStore(path)
+    writer.load()
+    reader.load()
+
+    for i in range(3):
+        writer.upsert_snippet("Noise", f"Flow {i}", snippet(f"flownoise({i})"))
+    assert journal_lines(path) == []
+    with open(path) as file:
+        assert sorted(json.load(file)["snippets"]["Noise"]) == ["Curl", "Flow 0", "Flow 1", "Flow 2"]
+
+    assert reader.poll() == [{"op": "reload"}]
+    assert reader.load() == JsonSnippetStore(path).load()
+
+    # Edits after the compaction replay normally again
+    writer.delete_snippet("Noise", "Curl")
+    assert reader.poll() == [{"op": "delete", "category": "Noise", "name": "Curl"}]
+
+
+def test_torn_last_line_is_ignored_then_cut_off(path):
+    writer, reader = JsonSnippetStore(path), JsonSnippetStore(path)
+    writer.upsert_snippet("Noise", "Flow", snippet("flownoise"))
+    reader.load()
+    # A writer that crashed mid-append
+    with open(path + ".journal", "ab") as file:
+        file.write(b'{"op": "upsert", "category": "Noi')
+
+    assert reader.poll() == []
+    assert "Flow" in JsonSnippetStore(path).load()[1]["Noise"]
+
+    writer.delete_snippet("Noise", "Curl")
+    assert [json.loads(line)["op"] for line in journal_lines(path)] == ["upsert", "delete"]
+    assert reader.poll() == [{"op": "delete", "category": "Noise", "name": "Curl"}]
+
+
+def test_held_lock_times_out(path):
+    store = JsonSnippetStore(path, timeout=0.1)
+    with FileLock(path):
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            store.upsert_snippet("Noise", "Flow", snippet("flownoise"))
+        assert time.monotonic() - start >= 0.1
+        with pytest.raises(TimeoutError):
+            with FileLock(path, shared=True, timeout=0.0):
+                pass
+    store.upsert_snippet("Noise", "Flow", snippet("flownoise"))
+    assert "Flow" in JsonSnippetStore(path).load()[1]["Noise"]
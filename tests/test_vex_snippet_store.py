@@ -0,0 +1,148 @@
+"""SqliteSnippetStore shared between sessions: change replay, reloads, the migration marker and search."""
+
+import pytest
+
+from byvfx.utils import vex_snippet_store
+from byvfx.utils.vex_snippet_store import SqliteSnippetStore, apply_change
+
+
+def snippet(code, tags=()):
+    return {"code": code, "description": "", "tags": list(tags)}
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    path = str(tmp_path / "vex_snippets.db")
+    first, second = SqliteSnippetStore(path), SqliteSnippetStore(path)
+    first.save_all(["Noise"], {"Noise": {"Curl": snippet("curlnoise")}})
+    yield first, second
+    first.close()
+    second.close()
+
+
+def test_other_sessions_edits_are_replayed(sessions):
+    writer, reader = sessions
+    categories, snippets = reader.load()
+
+    writer.upsert_snippet("Noise", "Flow", snippet("flownoise", ["flow", "noise"]))
+    writer.upsert_snippet("Noise", "Curl", snippet("curlnoise(@P)"))
+    writer.add_category("Empty")
+    writer.upsert_snippet("Temp", "Scratch", snippet("x"))
+    writer.delete_category("Temp")
+    writer.delete_snippet("Noise", "Flow")
+
+    changes = reader.poll()
+    assert {"op": "add_category", "category": "Empty"} in changes
+    assert {"op": "delete_category", "category": "Temp"} in changes
+    for change in changes:
+        apply_change(categories, snippets, change)
+    assert (categories, snippets) == reader.load()
+    assert reader.poll() == []
+
+
+def test_own_edits_are_not_replayed(sessions):
+    writer, reader = sessions
+    writer.load()
+    writer.upsert_snippet("Noise", "Flow", snippet("flownoise"))
+    assert writer.poll() == []
+
+    reader.upsert_snippet("Noise", "Other", snippet("other"))
+    writer.upsert_snippet("Noise", "Mine", snippet("mine"))
+    assert [change["name"] for change in writer.poll()] == ["Other", "Mine"]
+
+
+def test_replacing_the_library_asks_for_a_reload(sessions):
+    writer, reader = sessions
+    reader.load()
+    writer.save_all(["Other"], {"Other": {"A": snippet("a")}})
+    assert reader.poll() == [{"op": "reload"}]
+    assert writer.poll() == []
+
+
+def test_falling_behind_pruned_changes_asks_for_a_reload(sessions, monkeypatch):
+    monkeypatch.setattr(vex_snippet_store, "KEEP_CHANGES", 5)
+    writer, reader = sessions
+    reader.load()
+    for i in range(20):
+        writer.upsert_snippet("Noise", f"Snippet {i}", snippet(str(i)))
+    assert writer.connection.execute("SELECT COUNT(*) FROM changes").fetchone()[0] == 5
+    assert reader.poll() == [{"op": "reload"}]
+
+    reader.load()
+    writer.upsert_snippet("Noise", "Snippet 0", snippet("changed"))
+    assert reader.poll() == [{"op": "upsert", "category": "Noise", "name": "Snippet 0",
+                              "snippet": snippet("changed")}]
+
+
+def test_emptied_library_still_exists(tmp_path):
+    path = str(tmp_path / "vex_snippets.db")
+    store = SqliteSnippetStore(path)
+    assert not store.exists()
+    store.add_category("Noise")
+    store.delete_category("Noise")
+    store.close()
+
+    reopened = SqliteSnippetStore(path)
+    assert reopened.exists()
+    assert reopened.load() == ([], {})
+    reopened.close()
+
+
+# ─── Full-text search ───────────────────────────────────────────────
+
+
+def search_store(tmp_path):
+    store = SqliteSnippetStore(str(tmp_path / "vex_snippets.db"))
+    store.save_all(["Noise", "Attributes"], {
+        "Noise": {
+            "Curl Flow": snippet("v@v = curlnoise(@P);", ["noise"]),
+            "Flow Noise": snippet("v@v = flownoise(@P);", ["curl"]),
+        },
+        "Attributes": {
+            "Fit Range": snippet("f@out = fit(f@in, old_min, old_max, 0, 1);"),
+        },
+    })
+    return store
+
+
+def test_search_ranks_name_hits_first(tmp_path):
+    store = search_store(tmp_path)
+    assert store.search("curl") == [("Noise", "Curl Flow"), ("Noise", "Flow Noise")]
+    assert store.search("c", limit=1) == [("Noise", "Curl Flow")]
+    assert store.search("") == []
+    store.close()
+
+
+def test_search_and_or_and_snake_case_terms(tmp_path):
+    store = search_store(tmp_path)
+    assert store.search("flow noise") == [("Noise", "Flow Noise"), ("Noise", "Curl Flow")]
+    assert store.search("curl fit") == []
+    assert set(store.search("fit OR curl")) == {
+        ("Attributes", "Fit Range"), ("Noise", "Curl Flow"), ("Noise", "Flow Noise")}
+    assert store.search("old_min") == [("Attributes", "Fit Range")]
+    store.close()
+
+
+def test_search_follows_edits(tmp_path):
+    store = search_store(tmp_path)
+    store.upsert_snippet("Noise", "Curl Flow", snippet("v@v = 0;"))
+    store.delete_snippet("Noise", "Flow Noise")
+    assert store.search("curlnoise") == []
+    assert store.search("curl") == [("Noise", "Curl Flow")]
+    store.close()
+
+
+def test_index_with_other_options_is_rebuilt(tmp_path):
+    path = str(tmp_path / "vex_snippets.db")
+    search_store(tmp_path).close()
+    store = SqliteSnippetStore(path)
+    with store.connection:
+        store.connection.executescript(vex_snippet_store._DROP_FTS)
+        store.connection.execute(
+            "CREATE VIRTUAL TABLE snippets_fts USING fts5(name, description, tags, code, "
+            "content='snippets', content_rowid='id', tokenize='trigram')")
+    store.close()
+
+    reopened = SqliteSnippetStore(path)
+    assert reopened.search("fit") == [("Attributes", "Fit Range")]
+    reopened.close()